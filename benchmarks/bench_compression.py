@@ -0,0 +1,65 @@
+"""
+Measure compression CPU time against bytes saved on representative api payloads.
+
+Brotli and zstd are measured only when their libraries are installed.
+"""
+from benchmarks.harness import measure, setup_django
+
+setup_django()
+
+from utils.compression import get_codecs  # noqa: E402
+from utils.json_encoders import get_encoder  # noqa: E402
+
+LEVELS = {"gzip": (1, 2, 6, 9), "br": (1, 4, 6), "zstd": (1, 3, 9)}
+
+
+def build_payloads() -> dict[str, bytes]:
+    """Build bodies of user lists, validation errors and a single error."""
+    encoder = get_encoder()
+    users = [{"id": index, "username": f"user{index}", "firstName": "John"} for index in range(1000)]
+    errors = [
+        {
+            "location": "body",
+            "field": "user_schema",
+            "field_full": f"items.{index}.username",
+            "message": "Input should be a valid string",
+        }
+        for index in range(500)
+    ]
+
+    return {
+        "404 error": encoder.dumps(
+            {"status": 404, "error": {"code": "USER_NOT_FOUND", "details": {"message": "NOT FOUND"}}}
+        ),
+        "page of 50 users": encoder.dumps({"items": users[:50], "nextCursor": "x" * 80, "count": None}),
+        "list of 1000 users": encoder.dumps(users),
+        "422 with 500 errors": encoder.dumps(
+            {"status": 422, "error": {"code": "VALIDATION_ERROR", "details": errors}}
+        ),
+    }
+
+
+def main() -> None:
+    """Print compression time, ratio and throughput per codec and level."""
+    codecs = get_codecs(("zstd", "br", "gzip"))
+    print(f"codecs: {', '.join(codecs)}")
+    print(f"\n{'payload':<24}{'codec':<12}{'bytes':>10}{'saved':>10}{'min, us':>12}{'us/KB saved':>14}")
+
+    for name, payload in build_payloads().items():
+        print(f"{name:<24}{'identity':<12}{len(payload):>10}{0:>10}{0:>12.2f}{0:>14.2f}")
+
+        for encoding, codec in codecs.items():
+            for level in LEVELS[encoding]:
+                compressed = codec.compress(payload, level)
+                saved = len(payload) - len(compressed)
+                number = max(20, 200_000 // len(payload))
+                result = measure(lambda: codec.compress(payload, level), number=number)
+                per_kb = result["min"] * 1e6 / (saved / 1024) if saved > 0 else float("inf")
+                print(
+                    f"{'':<24}{f'{encoding}:{level}':<12}{len(compressed):>10}{saved:>10}"
+                    f"{result['min'] * 1e6:>12.2f}{per_kb:>14.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
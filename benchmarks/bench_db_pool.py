@@ -0,0 +1,81 @@
+"""
+Compare request latency with database connection pool on and off.
+
+Without the pool every request opens a new SQLite connection and sets it up
+(functions, pragmas), with the pool connections are reused by the worker threads.
+
+Example:
+    python -m benchmarks.bench_db_pool --workers 1 4 --requests 2000
+"""
+import argparse
+import logging
+import time
+
+from benchmarks.harness import create_database
+from benchmarks.load_test import Request, run_wsgi, summarize
+
+
+def build_requests(count: int, users: int) -> list[Request]:
+    """Build reads that always query the database: pages of users and uncached user ids."""
+    requests = []
+    for index in range(count):
+        client = f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}"
+        if index % 2:
+            requests.append(Request("get", "GET", f"/api/users/{index % users + 1}/", b"", client, 200, None))
+        else:
+            requests.append(Request("page", "GET", "/api/users/", b"", client, 200, None))
+    return requests
+
+
+def set_pool(enabled: bool) -> None:
+    """Enable or disable pool of all databases, connections are reopened with new options and caches are cleared."""
+    from django.conf import settings
+    from django.core.cache import caches
+    from django.db import connections
+
+    from utils import db_pool
+
+    connections.close_all()
+    for pool in db_pool.pools.values():
+        pool.close_all()
+    db_pool.forget_pools()
+    for backend in caches.all():
+        backend.clear()
+
+    for alias in settings.DATABASES:
+        options = connections[alias].settings_dict["OPTIONS"]
+        if enabled:
+            options["pool"] = settings.DATABASE_POOL or True
+        else:
+            options.pop("pool", None)
+
+
+def main() -> None:
+    """Print latency percentiles and throughput with and without pool for every worker count."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--requests", type=int, default=2000, help="Number of requests per run.")
+    args = parser.parse_args()
+
+    # every user id is requested once, so responses are not served from cache
+    create_database(users=args.requests)
+    logging.disable(logging.CRITICAL)
+
+    print(f"\n{'pool':<6}{'workers':>8}{'req/s':>10}{'p50, ms':>10}{'p95, ms':>10}{'p99, ms':>10}{'failures':>10}")
+    for workers in args.workers:
+        for enabled in (False, True):
+            set_pool(enabled)
+            # warm up imports and caches, and the pool when it is enabled
+            run_wsgi(build_requests(min(200, args.requests), args.requests)[::2], workers)
+
+            requests = build_requests(args.requests, args.requests)
+            start = time.perf_counter()
+            summary = summarize(run_wsgi(requests, workers), time.perf_counter() - start)
+            print(
+                f"{'on' if enabled else 'off':<6}{workers:>8}{summary['throughput']:>10.0f}{summary['p50']:>10.2f}"
+                f"{summary['p95']:>10.2f}{summary['p99']:>10.2f}{summary['failures']:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Measure creation of DjangoSchema classes and repeated async_schema calls.
+"""
+from humps.main import camelize
+
+from benchmarks.harness import measure, print_results, setup_django
+
+setup_django()
+
+from utils.django_schema import DjangoSchema, camelize_alias  # noqa: E402
+
+CLASSES_COUNT = 200
+FIELDS = [f"field_name_{index}" for index in range(30)]
+
+
+def create_classes(alias_generator) -> None:
+    """Create CLASSES_COUNT schema classes with the same field names."""
+    for index in range(CLASSES_COUNT):
+        annotations = {name: str for name in FIELDS}
+        namespace = {
+            "__module__": __name__,
+            "__annotations__": annotations,
+            "model_config": {"alias_generator": alias_generator},
+        }
+        type(f"Schema{index}", (DjangoSchema,), namespace)
+
+
+class ItemSchema(DjangoSchema):
+    item_name: str
+
+
+class ListSchema(DjangoSchema):
+    item_list: list[ItemSchema]
+    main_item: ItemSchema | None = None
+
+
+def main() -> None:
+    """Compare camelize aliases and schema generation with and without caches."""
+    print_results(
+        f"Create {CLASSES_COUNT} schema classes with {len(FIELDS)} fields",
+        {
+            "camelize": measure(lambda: create_classes(camelize), number=1, repeat=3),
+            "cached alias": measure(lambda: create_classes(camelize_alias), number=1, repeat=3),
+        },
+    )
+    print_results(
+        "Nested schema json",
+        {
+            "model_json_schema": measure(ListSchema.model_json_schema, number=1000),
+            "async_schema": measure(ListSchema.async_schema, number=1000),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Measure startup cost of generate_examples on a synthetic 1,000-route controller.
+"""
+import time
+import tracemalloc
+
+from benchmarks.harness import setup_django
+
+setup_django()
+
+from django.http import HttpRequest  # noqa: E402
+from ninja_extra import ControllerBase, api_controller  # noqa: E402
+
+from config.route import route  # noqa: E402
+from users.api_errors import NotFoundException, UserDisableException, UserInactiveException  # noqa: E402
+from users.schemas import UserResponseBaseSchema  # noqa: E402
+from utils.examples_generator import ExamplesGenerator  # noqa: E402
+
+ROUTES_COUNT = 1000
+
+
+def uncached_examples(*args, auth: bool = False) -> dict:
+    """Build examples without memoization, same as before caching was added."""
+    ExamplesGenerator.cache_clear()
+    return {"responses": ExamplesGenerator.build_responses(*args, auth=auth)}
+
+
+def build_controller(examples_generator) -> type:
+    """Build controller with ROUTES_COUNT routes sharing the same set of errors."""
+    attrs: dict = {}
+
+    for index in range(ROUTES_COUNT):
+        def view(self, request: HttpRequest, user_id: int):
+            ...
+
+        view.__name__ = f"get_user_{index}"
+        attrs[view.__name__] = route.get(
+            f"/{index}/{{user_id}}/",
+            response_schema=UserResponseBaseSchema,
+            openapi_extra=examples_generator(
+                NotFoundException,
+                UserDisableException,
+                UserInactiveException,
+                auth=True,
+            ),
+        )(view)
+
+    return api_controller("/bench", tags=["Bench"])(type("BenchController", (ControllerBase,), attrs))
+
+
+def run(name: str, examples_generator) -> None:
+    """
+    Print time of building the examples alone and the whole controller, plus memory retained by examples.
+    """
+    ExamplesGenerator.cache_clear()
+    start = time.perf_counter()
+    for _ in range(ROUTES_COUNT):
+        examples_generator(NotFoundException, UserDisableException, UserInactiveException, auth=True)
+    examples_elapsed = time.perf_counter() - start
+
+    ExamplesGenerator.cache_clear()
+    tracemalloc.start()
+    examples = [
+        examples_generator(NotFoundException, UserDisableException, UserInactiveException, auth=True)
+        for _ in range(ROUTES_COUNT)
+    ]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del examples
+
+    ExamplesGenerator.cache_clear()
+    start = time.perf_counter()
+    build_controller(examples_generator)
+    controller_elapsed = time.perf_counter() - start
+
+    print(
+        f"{name:<12}{examples_elapsed * 1e3:>14.2f}{retained / 1024:>18.1f}{controller_elapsed * 1e3:>18.2f}"
+    )
+
+
+def main() -> None:
+    """Compare memoized and uncached examples generation."""
+    print(f"\nController with {ROUTES_COUNT} routes")
+    print(f"{'case':<12}{'examples, ms':>14}{'examples, KiB':>18}{'controller, ms':>18}")
+    run("uncached", uncached_examples)
+    run("memoized", ExamplesGenerator.generate_examples)
+
+
+if __name__ == "__main__":
+    main()
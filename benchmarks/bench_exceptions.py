@@ -0,0 +1,67 @@
+"""
+Measure raise and handle cost of api exceptions on a 404-heavy workload.
+"""
+from benchmarks.harness import measure, print_results, setup_django
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from ninja.errors import HttpError  # noqa: E402
+
+from config.api import api  # noqa: E402
+from users.api_errors import NotFoundException  # noqa: E402
+from users.models import User  # noqa: E402
+
+request = RequestFactory().get("/api/users/1/")
+
+
+class PreviousNotFoundException(NotFoundException):
+    """NotFoundException initialized as before the fast path, with all attributes set on the instance."""
+
+    def __init__(self, message: str | None = None, field: str | None = None) -> None:
+        self.message = message if message else self.message
+        self.field = field if field else self.field
+        HttpError.__init__(self, status_code=self.status_code, message=self.message)
+
+
+def raise_not_found(exception: type[NotFoundException] = NotFoundException) -> None:
+    """Raise 404 the same way as get_user_by_id does and handle it with api handlers."""
+    try:
+        try:
+            raise User.DoesNotExist("User matching query does not exist.")
+        except User.DoesNotExist:
+            raise exception
+    except Exception as exc:
+        api.on_exception(request, exc)
+
+
+def raise_previous_not_found() -> None:
+    """Raise and handle 404 initialized the previous way."""
+    raise_not_found(PreviousNotFoundException)
+
+
+def raise_not_found_with_message() -> None:
+    """Raise 404 with custom message, which is serialized on every call."""
+    try:
+        raise NotFoundException("User was removed")
+    except Exception as exc:
+        api.on_exception(request, exc)
+
+
+def main() -> None:
+    """Compare exceptions with default and custom messages and the previous path, with and without DEBUG."""
+    results = {}
+
+    for debug in (True, False):
+        settings.DEBUG = debug
+        case = f"debug={debug}"
+        results[f"404, {case}"] = measure(raise_not_found, number=20000)
+        results[f"404 previous path, {case}"] = measure(raise_previous_not_found, number=20000)
+        results[f"404 with message, {case}"] = measure(raise_not_found_with_message, number=20000)
+
+    print_results("Raise and handle NotFoundException", results)
+
+
+if __name__ == "__main__":
+    main()
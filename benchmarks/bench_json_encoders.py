@@ -0,0 +1,66 @@
+"""
+Compare JSON encoder backends on error and schema payloads.
+"""
+from benchmarks.harness import measure, print_results, setup_django
+
+setup_django()
+
+from ninja_extra import status  # noqa: E402
+
+from users.api_errors import NotFoundException  # noqa: E402
+from users.schemas import UserResponseBaseSchema  # noqa: E402
+from utils.base_exceptions import UnauthorizedException  # noqa: E402
+from utils.error_responses import build_error_data  # noqa: E402
+from utils.json_encoders import ENCODER_BACKENDS  # noqa: E402
+
+
+def build_payloads() -> dict:
+    """Build realistic payloads for each response type with number of calls per measure."""
+    validation_error = {
+        "status": status.HTTP_422_UNPROCESSABLE_ENTITY,
+        "error": {
+            "code": "VALIDATION_ERROR",
+            "details": [
+                {
+                    "location": "query",
+                    "field": "body",
+                    "field_full": f"user_schema.items.{index}.firstName",
+                    "message": "Field required",
+                }
+                for index in range(50)
+            ],
+        },
+    }
+    users = [
+        UserResponseBaseSchema(id=index, username=f"user{index}", first_name="John").model_dump(by_alias=True)
+        for index in range(1000)
+    ]
+
+    return {
+        "404 error": (build_error_data(NotFoundException()), 5000),
+        "403 error (lazy message)": (build_error_data(UnauthorizedException()), 5000),
+        "422 error, 50 details": (validation_error, 1000),
+        "user schema": (users[0], 5000),
+        "user schema list, 1000 rows": (users, 100),
+    }
+
+
+def main() -> None:
+    """Run benchmark for each installed backend."""
+    payloads = build_payloads()
+
+    for name, (encoder_class, module) in ENCODER_BACKENDS.items():
+        if module is None:
+            print(f"\n{name}: not installed, skipped")
+            continue
+
+        encoder = encoder_class()
+        results = {
+            payload_name: measure(lambda: encoder.dumps(payload), number=number)
+            for payload_name, (payload, number) in payloads.items()
+        }
+        print_results(f"{name} encoder", results)
+
+
+if __name__ == "__main__":
+    main()
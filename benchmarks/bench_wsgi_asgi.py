@@ -0,0 +1,161 @@
+"""
+Compare throughput and latency of users endpoints under WSGI and ASGI.
+
+Requests are sent in-process to `config.wsgi.application` from a thread pool
+and to `config.asgi.application` from concurrent asyncio tasks.
+"""
+import asyncio
+import io
+import logging
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.harness import create_database, percentile
+
+USERS = 1000
+REQUESTS = 2000
+CONCURRENCY = 16
+
+create_database(users=USERS)
+logging.disable(logging.CRITICAL)
+
+from config.asgi import application as asgi_application  # noqa: E402
+from config.wsgi import application as wsgi_application  # noqa: E402
+
+
+def build_requests(prefix: str) -> list[tuple[str, str, int]]:
+    """Build request mix of existing users and 404s, with expected status codes."""
+    rng = random.Random(42)
+    requests = []
+
+    for index in range(REQUESTS):
+        if index % 5 == 0:
+            requests.append(("GET", f"{prefix}/{USERS * 10}/", 404))
+        else:
+            requests.append(("GET", f"{prefix}/{rng.randint(1, USERS)}/", 200))
+
+    return requests
+
+
+def wsgi_request(method: str, path: str) -> int:
+    """Send request to WSGI application and return status code."""
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "localhost",
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(b""),
+        "wsgi.errors": sys.stderr,
+    }
+    statuses: list[str] = []
+
+    def start_response(status: str, headers: list, exc_info=None) -> None:
+        statuses.append(status)
+
+    response = wsgi_application(environ, start_response)
+    b"".join(response)
+    response.close()
+    return int(statuses[0][:3])
+
+
+async def asgi_request(method: str, path: str) -> int:
+    """Send request to ASGI application and return status code."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+    request_sent = False
+    response_done = asyncio.Event()
+    statuses: list[int] = []
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+        elif message["type"] == "http.response.body" and not message.get("more_body"):
+            response_done.set()
+
+    await asgi_application(scope, receive, send)
+    return statuses[0]
+
+
+def run_wsgi(requests: list[tuple[str, str, int]]) -> tuple[float, list[float], int]:
+    """Run requests with thread pool, return elapsed time, latencies and errors count."""
+    def timed(request: tuple[str, str, int]) -> tuple[float, bool]:
+        method, path, expected = request
+        start = time.perf_counter()
+        status_code = wsgi_request(method, path)
+        return time.perf_counter() - start, status_code == expected
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        results = list(executor.map(timed, requests))
+    elapsed = time.perf_counter() - start
+
+    return elapsed, [latency for latency, _ in results], sum(not ok for _, ok in results)
+
+
+def run_asgi(requests: list[tuple[str, str, int]]) -> tuple[float, list[float], int]:
+    """Run requests with concurrent tasks, return elapsed time, latencies and errors count."""
+    async def main() -> list[tuple[float, bool]]:
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def timed(request: tuple[str, str, int]) -> tuple[float, bool]:
+            method, path, expected = request
+            async with semaphore:
+                start = time.perf_counter()
+                status_code = await asgi_request(method, path)
+                return time.perf_counter() - start, status_code == expected
+
+        return await asyncio.gather(*(timed(request) for request in requests))
+
+    start = time.perf_counter()
+    results = asyncio.run(main())
+    elapsed = time.perf_counter() - start
+
+    return elapsed, [latency for latency, _ in results], sum(not ok for _, ok in results)
+
+
+def main() -> None:
+    """Run all server and route combinations."""
+    print(f"\n{REQUESTS} requests, concurrency {CONCURRENCY}, 20% of 404s")
+    print(f"{'case':<28}{'req/s':>10}{'p50, ms':>10}{'p99, ms':>10}{'errors':>8}")
+
+    for server, runner in (("wsgi", run_wsgi), ("asgi", run_asgi)):
+        for routes, prefix in (("sync", "/api/users"), ("async", "/api/async/users")):
+            requests = build_requests(prefix)
+            # warm up url resolver, connections and caches
+            runner(requests[:CONCURRENCY])
+
+            elapsed, latencies, errors = runner(requests)
+            print(
+                f"{server + ', ' + routes + ' routes':<28}{len(requests) / elapsed:>10.0f}"
+                f"{percentile(latencies, 50) * 1e3:>10.2f}{percentile(latencies, 99) * 1e3:>10.2f}{errors:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
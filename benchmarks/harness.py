@@ -0,0 +1,89 @@
+"""
+Shared helpers for benchmark scripts.
+
+Benchmarks are run from the project root, e.g. `python -m benchmarks.bench_json_encoders`.
+"""
+import math
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+
+def setup_django(database: str | None = None) -> None:
+    """
+    Configure django settings and populate apps registry.
+
+    If database is set, all databases, e.g. a configured replica, are replaced with SQLite file at this path
+    and DEBUG is disabled, so queries are not collected in memory.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+    import django
+    from django.conf import settings
+
+    if database:
+        settings.DEBUG = False
+        settings.ALLOWED_HOSTS = ["localhost", "127.0.0.1"]
+        for alias in settings.DATABASES:
+            settings.DATABASES[alias]["NAME"] = database
+            settings.DATABASES[alias].setdefault("OPTIONS", {})["timeout"] = 30
+
+    django.setup()
+
+
+def create_database(users: int = 1000) -> str:
+    """Create temporary SQLite database with migrations applied and seeded users."""
+    database = os.path.join(tempfile.mkdtemp(prefix="bench-"), "db.sqlite3")
+    setup_django(database)
+
+    from django.core.management import call_command
+
+    from users.models import User
+
+    call_command("migrate", verbosity=0)
+    User.objects.bulk_create(
+        [User(username=f"user{index}", first_name="John") for index in range(users)],
+        batch_size=1000,
+    )
+    return database
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Return percentile of values using nearest-rank method."""
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def measure(func: Callable[[], object], *, number: int = 1000, repeat: int = 5) -> dict:
+    """
+    Measure function call time.
+
+    Returns timings per single call in seconds.
+    """
+    timings: list[float] = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def print_results(title: str, results: dict[str, dict]) -> None:
+    """Print benchmark results table with timings in microseconds."""
+    print(f"\n{title}")
+    print(f"{'case':<48}{'min, us':>12}{'median, us':>14}")
+
+    for name, result in results.items():
+        print(f"{name:<48}{result['min'] * 1e6:>12.2f}{result['median'] * 1e6:>14.2f}")
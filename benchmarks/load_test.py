@@ -0,0 +1,343 @@
+"""
+Load test of users endpoints under concurrency, with error envelope checks.
+
+Request mix is replayed against `/api/users/`: existing users, missing users (404),
+unauthenticated requests (401), created users (201) and invalid bodies (422).
+Every response is checked for the expected status and the `{"status", "error"}` envelope.
+
+Servers:
+- wsgi: `config.wsgi.application` called in-process from a pool of worker threads
+- asgi: `config.asgi.application` called in-process from concurrent asyncio tasks
+- http: WSGI worker processes with stdlib servers on a localhost socket, workers scale across cores,
+  with the default local memory cache every worker has its own versions and throttle counters,
+  configure RedisCache or PyMemcacheCache in CACHES to measure shared caches
+
+Examples:
+    python -m benchmarks.load_test --server wsgi --workers 1 4 16
+    python -m benchmarks.load_test --server http --workers 1 2 4 8 --requests 5000
+"""
+import argparse
+import asyncio
+import http.client
+import io
+import json
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+from benchmarks.harness import create_database, percentile
+
+# scenario name -> weight in the request mix
+MIX = {"get": 60, "missing": 15, "unauthorized": 10, "create": 5, "invalid": 10}
+
+
+class Request(t.NamedTuple):
+    """Request of the mix with expected response."""
+
+    scenario: str
+    method: str
+    path: str
+    body: bytes
+    status: int
+    code: str | None
+
+
+def build_requests(count: int, users: int, seed: int = 42) -> list[Request]:
+    """Build deterministic request mix."""
+    rng = random.Random(seed)
+    scenarios = rng.choices(list(MIX), weights=list(MIX.values()), k=count)
+    requests = []
+
+    for index, scenario in enumerate(scenarios):
+        if scenario == "get":
+            request = ("GET", f"/api/users/{rng.randint(1, users)}/", b"", 200, None)
+        elif scenario == "missing":
+            request = ("GET", f"/api/users/{users * 10 + index}/", b"", 404, "USER_NOT_FOUND")
+        elif scenario == "unauthorized":
+            request = ("GET", "/api/users/me/", b"", 401, "NOT_AUTHENTICATED")
+        elif scenario == "create":
+            body = json.dumps({"username": f"load{seed}-{index}", "first_name": "John"}).encode()
+            request = ("POST", "/api/users/", body, 201, None)
+        else:
+            body = json.dumps({"username": index}).encode()
+            request = ("POST", "/api/users/", body, 422, "VALIDATION_ERROR")
+
+        requests.append(Request(scenario, *request))
+
+    return requests
+
+
+def check(request: Request, status: int, body: bytes) -> bool:
+    """Check response status and body shape."""
+    if status != request.status:
+        return False
+
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return False
+
+    if request.code is None:
+        return isinstance(data, dict) and ("username" in data or "items" in data)
+
+    error = data.get("error") if isinstance(data, dict) else None
+    return (
+        data.get("status") == status
+        and isinstance(error, dict)
+        and error.get("code") == request.code
+        and "details" in error
+    )
+
+
+# region: In-process servers
+
+def wsgi_call(application: t.Callable, request: Request) -> tuple[int, bytes]:
+    """Call WSGI application and return status and body."""
+    environ = {
+        "REQUEST_METHOD": request.method,
+        "PATH_INFO": request.path,
+        "QUERY_STRING": "",
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(request.body)),
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "localhost",
+        "REMOTE_ADDR": "127.0.0.1",
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(request.body),
+        "wsgi.errors": sys.stderr,
+    }
+    statuses: list[str] = []
+
+    def start_response(status: str, headers: list, exc_info=None) -> None:
+        statuses.append(status)
+
+    response = application(environ, start_response)
+    try:
+        body = b"".join(response)
+    finally:
+        response.close()
+    return int(statuses[0][:3]), body
+
+
+async def asgi_call(application: t.Callable, request: Request) -> tuple[int, bytes]:
+    """Call ASGI application and return status and body."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": request.method,
+        "scheme": "http",
+        "path": request.path,
+        "raw_path": request.path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(request.body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+    received = False
+    status = 0
+    chunks: list[bytes] = []
+
+    async def receive() -> dict:
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": request.body, "more_body": False}
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await application(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+def run_wsgi(requests: list[Request], workers: int) -> list[tuple[float, bool]]:
+    """Replay requests against WSGI application from worker threads."""
+    from config.wsgi import application
+
+    def send(request: Request) -> tuple[float, bool]:
+        start = time.perf_counter()
+        status, body = wsgi_call(application, request)
+        return time.perf_counter() - start, check(request, status, body)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(send, requests))
+
+
+def run_asgi(requests: list[Request], workers: int) -> list[tuple[float, bool]]:
+    """Replay requests against ASGI application from concurrent tasks."""
+    from config.asgi import application
+
+    async def main() -> list[tuple[float, bool]]:
+        semaphore = asyncio.Semaphore(workers)
+
+        async def send(request: Request) -> tuple[float, bool]:
+            async with semaphore:
+                start = time.perf_counter()
+                status, body = await asgi_call(application, request)
+                return time.perf_counter() - start, check(request, status, body)
+
+        return await asyncio.gather(*(send(request) for request in requests))
+
+    return asyncio.run(main())
+
+# endregion
+
+# region: Localhost server
+
+class QuietHandler(WSGIRequestHandler):
+    """Request handler without access log."""
+
+    def log_message(self, *args: t.Any) -> None:
+        """Skip access log."""
+
+
+def serve(sock: socket.socket) -> None:
+    """Serve WSGI application on the inherited listening socket until terminated."""
+    from django.db import connections
+
+    from config.wsgi import application
+
+    # connections of the parent process must not be shared
+    connections.close_all()
+
+    server = WSGIServer(sock.getsockname(), QuietHandler, bind_and_activate=False)
+    server.socket.close()
+    server.socket = sock
+    server.server_name = "localhost"
+    server.server_port = sock.getsockname()[1]
+    server.setup_environ()
+    server.set_app(application)
+    server.serve_forever()
+
+
+def http_call(port: int, request: Request) -> tuple[int, bytes]:
+    """Send request over a new localhost connection, stdlib server closes connections."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    try:
+        headers = {
+            "Host": "localhost",
+            "Content-Type": "application/json",
+        }
+        connection.request(request.method, request.path, body=request.body or None, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def run_http(requests: list[Request], workers: int, concurrency: int) -> list[tuple[float, bool]]:
+    """Replay requests against worker processes listening on one localhost socket."""
+    from django.db import connections
+
+    sock = socket.create_server(("127.0.0.1", 0), backlog=1024)
+    port = sock.getsockname()[1]
+    connections.close_all()
+
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=serve, args=(sock,), daemon=True) for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    def send(request: Request) -> tuple[float, bool]:
+        start = time.perf_counter()
+        try:
+            status, body = http_call(port, request)
+        except OSError:
+            return time.perf_counter() - start, False
+        return time.perf_counter() - start, check(request, status, body)
+
+    try:
+        # client threads must outnumber workers, otherwise workers wait for requests
+        with ThreadPoolExecutor(max_workers=max(concurrency, workers * 2)) as executor:
+            return list(executor.map(send, requests))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+        sock.close()
+
+# endregion
+
+
+def summarize(results: list[tuple[float, bool]], elapsed: float) -> dict:
+    """Return throughput, latency percentiles in milliseconds and envelope failures."""
+    latencies = [latency for latency, _ in results]
+    return {
+        "requests": len(results),
+        "failures": sum(1 for _, ok in results if not ok),
+        "throughput": len(results) / elapsed,
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "p999": percentile(latencies, 99.9) * 1000,
+    }
+
+
+def main() -> int:
+    """Run load test for every worker count and print results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", choices=("wsgi", "asgi", "http"), default="wsgi")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--requests", type=int, default=2000, help="Number of requests per worker count.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Client threads of the http server.")
+    parser.add_argument("--users", type=int, default=1000, help="Number of seeded users.")
+    parser.add_argument("--output", help="Write results to this JSON file.")
+    args = parser.parse_args()
+
+    create_database(users=args.users)
+    logging.disable(logging.CRITICAL)
+
+    results = {}
+    print(f"\n{args.server}: {args.requests} requests, mix {MIX}")
+    print(f"{'workers':>8}{'req/s':>10}{'p50, ms':>10}{'p95, ms':>10}{'p99, ms':>10}{'p999, ms':>10}{'failures':>10}")
+
+    for seed, workers in enumerate(args.workers):
+        # warm up imports, connections and caches with requests that are not measured
+        run_wsgi(build_requests(min(200, args.requests), args.users, seed=1000 + seed), workers=1)
+
+        requests = build_requests(args.requests, args.users, seed=seed)
+        start = time.perf_counter()
+        if args.server == "wsgi":
+            responses = run_wsgi(requests, workers)
+        elif args.server == "asgi":
+            responses = run_asgi(requests, workers)
+        else:
+            responses = run_http(requests, workers, args.concurrency)
+        summary = results[workers] = summarize(responses, time.perf_counter() - start)
+
+        print(
+            f"{workers:>8}{summary['throughput']:>10.0f}{summary['p50']:>10.2f}{summary['p95']:>10.2f}"
+            f"{summary['p99']:>10.2f}{summary['p999']:>10.2f}{summary['failures']:>10}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"server": args.server, "mix": MIX, "results": results}, file, indent=2)
+
+    return 1 if any(summary["failures"] for summary in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
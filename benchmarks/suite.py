@@ -0,0 +1,318 @@
+"""
+Reproducible benchmark suite with JSON output and baseline comparison.
+
+Runs against a temporary SQLite database with seeded users, e.g.:
+
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.25
+
+benchmarks/baseline.json is the committed reference, its "meta" records the commit and
+environment it was measured in. Timings depend on the machine, so for a regression check
+write results of the base checkout on the same machine first and compare later runs with them.
+Refresh the reference with `--output benchmarks/baseline.json` when cases change.
+
+Exit code is 1 when a case is slower than the baseline by more than the threshold. Cases are
+compared by the best of repeats, it is the least affected by other load on the machine.
+"""
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from itertools import count
+from typing import Callable
+
+from benchmarks.harness import create_database, measure
+
+LARGE_ROWS = 100_000
+
+# case name -> benchmark function, filled by `case` decorator
+CASES: dict[str, Callable[["Context"], dict]] = {}
+
+
+def case(name: str) -> Callable:
+    """Register benchmark case."""
+    def decorator(func: Callable[["Context"], dict]) -> Callable[["Context"], dict]:
+        CASES[name] = func
+        return func
+    return decorator
+
+
+class Context:
+    """Objects shared by benchmark cases, created after the database is seeded."""
+
+    def __init__(self, rows: int) -> None:
+        """Load api, request factory and seeded users."""
+        from django.test import Client, RequestFactory
+
+        from config.api import api
+        from users.models import User
+
+        self.api = api
+        self.rows = rows
+        self.request = RequestFactory(HTTP_HOST="localhost").get("/api/users/1/")
+        self.client = Client(HTTP_HOST="localhost")
+        self.users = list(User.objects.order_by("pk")[:rows])
+        self.user_id = self.users[0].pk
+
+
+# region: Exceptions
+
+@case("exceptions")
+def bench_exceptions(context: Context) -> dict:
+    """Raise and handle every exception of the error catalog with api handlers."""
+    from utils.error_catalog import error_catalog
+
+    results = {}
+    for entry in error_catalog:
+        exception = entry.exception
+
+        def raise_and_handle() -> None:
+            try:
+                raise exception
+            except Exception as exc:
+                context.api.on_exception(context.request, exc)
+
+        results[f"raise_and_handle[{entry.code}]"] = measure(raise_and_handle, number=5000)
+    return results
+
+
+@case("validation")
+def bench_validation(context: Context) -> dict:
+    """
+    Build 422 responses from validation errors.
+
+    Api handlers truncate details to `API_VALIDATION_MAX_ERRORS`, so sizes are measured with
+    handlers of an uncapped translator and the api ones are measured as capped cases.
+    """
+    from django.conf import settings
+    from ninja import NinjaAPI
+    from ninja.errors import ValidationError
+
+    from config.exception_handlers import register_exception_handlers
+    from utils.validation_errors import ValidationErrorTranslator
+
+    uncapped = NinjaAPI(renderer=context.api.renderer, urls_namespace="bench_uncapped")
+    register_exception_handlers(api=uncapped, validation_translator=ValidationErrorTranslator(max_errors=None))
+
+    results = {}
+    for size in (1, 50, 500):
+        errors = [
+            {"type": "missing", "loc": ("body", "items", index, "username"), "msg": "Field required"}
+            for index in range(size)
+        ]
+
+        def handle() -> None:
+            uncapped.on_exception(context.request, ValidationError(errors))
+
+        results[f"validation_422[{size} errors]"] = measure(handle, number=max(50, 5000 // size))
+
+    max_errors = settings.API_VALIDATION_MAX_ERRORS
+    if max_errors is not None:
+        errors = [
+            {"type": "missing", "loc": ("body", "items", index, "username"), "msg": "Field required"}
+            for index in range(500)
+        ]
+
+        def handle_capped() -> None:
+            context.api.on_exception(context.request, ValidationError(errors))
+
+        results[f"validation_422[500 errors, capped at {max_errors}]"] = measure(handle_capped, number=50)
+    return results
+
+# endregion
+
+# region: Schemas
+
+@case("schemas")
+def bench_schemas(context: Context) -> dict:
+    """Serialize loaded users with DjangoSchema helpers."""
+    from users.schemas import UserResponseBaseSchema
+
+    results = {}
+    for size in (1000, context.rows):
+        users = context.users[:size]
+        number = 1 if size > 10_000 else 10
+
+        results[f"from_orm[{size} rows]"] = measure(
+            lambda: [UserResponseBaseSchema.from_orm(user) for user in users], number=number, repeat=3
+        )
+        results[f"from_list[{size} rows]"] = measure(
+            lambda: UserResponseBaseSchema.from_list(users), number=number, repeat=3
+        )
+        results[f"from_batch[{size} rows]"] = measure(
+            lambda: UserResponseBaseSchema.from_batch(users), number=number, repeat=3
+        )
+    return results
+
+
+@case("examples")
+def bench_examples(context: Context) -> dict:
+    """Build examples of users controller routes, cold as at import and memoized."""
+    from users.api_errors import NotFoundException, UserDisableException, UserInactiveException
+    from utils.examples_generator import ExamplesGenerator, generate_examples
+
+    errors = (NotFoundException, UserDisableException, UserInactiveException)
+
+    def cold() -> None:
+        ExamplesGenerator.cache_clear()
+        generate_examples(*errors, auth=True)
+        generate_examples(auth=True)
+
+    def memoized() -> None:
+        generate_examples(*errors, auth=True)
+        generate_examples(auth=True)
+
+    return {
+        "generate_examples[cold]": measure(cold, number=1000),
+        "generate_examples[memoized]": measure(memoized, number=10000),
+    }
+
+# endregion
+
+# region: Round trips
+
+@case("round_trips")
+def bench_round_trips(context: Context) -> dict:
+    """
+    Send full requests through middleware, routing and api with the test client.
+
+    Caches are replaced with dummy ones, so GET routes run their views on every request
+    instead of returning cached responses, cached GET 200 is measured as a separate case.
+    """
+    from django.conf import settings
+    from django.test import override_settings
+
+    client = context.client
+    names = count()
+
+    def get_user() -> None:
+        client.get(f"/api/users/{context.user_id}/")
+
+    def get_missing_user() -> None:
+        client.get("/api/users/0/")
+
+    def list_users() -> None:
+        client.get("/api/users/?page_size=50")
+
+    def create_user() -> None:
+        client.post(
+            "/api/users/",
+            {"username": f"bench{next(names)}", "first_name": "John"},
+            content_type="application/json",
+        )
+
+    def create_invalid_user() -> None:
+        client.post(
+            "/api/users/",
+            {"username": 1},
+            content_type="application/json",
+        )
+
+    dummy = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    with override_settings(CACHES={alias: dummy for alias in settings.CACHES}):
+        results = {
+            "round_trip[GET 200]": measure(get_user, number=500),
+            "round_trip[GET 404]": measure(get_missing_user, number=500),
+            "round_trip[GET page]": measure(list_users, number=200),
+            "round_trip[POST 201]": measure(create_user, number=200),
+            "round_trip[POST 422]": measure(create_invalid_user, number=500),
+        }
+
+    results["round_trip[GET 200, cached]"] = measure(get_user, number=500)
+    return results
+
+# endregion
+
+
+def get_commit() -> str | None:
+    """Return current git commit, None outside of a git checkout."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """Print changes of the best timings against baseline and return names of regressed cases."""
+    regressions = []
+    print(f"\n{'case':<48}{'baseline, us':>14}{'current, us':>14}{'change':>10}")
+
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<48}{'-':>14}{result['min'] * 1e6:>14.2f}{'new':>10}")
+            continue
+
+        change = result["min"] / previous["min"] - 1
+        marker = ""
+        if change > threshold:
+            regressions.append(name)
+            marker = " !"
+        print(f"{name:<48}{previous['min'] * 1e6:>14.2f}{result['min'] * 1e6:>14.2f}{change:>+10.1%}{marker}")
+
+    return regressions
+
+
+def main() -> int:
+    """Run selected cases, write JSON results and compare them with baseline."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=LARGE_ROWS, help="Number of seeded users.")
+    parser.add_argument("--cases", nargs="*", choices=sorted(CASES), help="Cases to run, all by default.")
+    parser.add_argument("--output", help="Write results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare results with this JSON file.")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Allowed slowdown, 0.20 is 20%%.")
+    args = parser.parse_args()
+
+    create_database(users=args.rows)
+    logging.disable(logging.CRITICAL)
+
+    import django
+    from django.conf import settings
+
+    context = Context(rows=args.rows)
+    results: dict[str, dict] = {}
+    for name in args.cases or CASES:
+        start = time.perf_counter()
+        results.update(CASES[name](context))
+        print(f"{name}: {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "commit": get_commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "platform": platform.platform(),
+            "rows": args.rows,
+            "json_encoder": settings.API_JSON_ENCODER,
+            "validation_max_errors": settings.API_VALIDATION_MAX_ERRORS,
+        },
+        "results": results,
+    }
+
+    content = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(content + "\n")
+    else:
+        print(content)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        for key, value in baseline["meta"].items():
+            if key not in ("commit", "platform") and report["meta"].get(key) != value:
+                print(f"Baseline {key} is {value!r}, current is {report['meta'].get(key)!r}", file=sys.stderr)
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
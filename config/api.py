@@ -1,18 +1,42 @@
 """
 Django ninja extra api configuration.
 """
-from ninja_extra import NinjaExtraAPI
+from django.conf import settings
 
 from config.exception_handlers import register_exception_handlers
-from users.controller import UserTestController
+from users.controller import AsyncUserTestController, UserTestController
+from utils import db_pool
+from utils.compression import ResponseCompressor
+from utils.metrics import get_metrics_sink
+from utils.openapi_cache import CachedSchemaAPI
+from utils.renderers import FastJSONRenderer
 
 # initialize api
-api = NinjaExtraAPI(docs_url="/docs/")
+api = CachedSchemaAPI(
+    docs_url="/docs/",
+    renderer=FastJSONRenderer(
+        compression=ResponseCompressor(
+            encodings=settings.API_COMPRESSION_ENCODINGS,
+            min_size=settings.API_COMPRESSION_MIN_SIZE,
+        ) if settings.API_COMPRESSION_ENCODINGS else None,
+    ),
+    openapi_cache_dir=settings.API_OPENAPI_CACHE_DIR,
+)
+
+# api metrics sink, None when metrics are disabled
+metrics = get_metrics_sink()
+
+# route callbacks record their metrics in the api sink, e.g. over budget requests
+api.metrics = metrics
+
+# database pools record connection wait times in the api sink
+db_pool.metrics = metrics
 
 # register custom api exception handling errors
-register_exception_handlers(api=api)
+register_exception_handlers(api=api, metrics=metrics)
 
 # register api controllers
 api.register_controllers(
-    UserTestController
+    UserTestController,
+    AsyncUserTestController,
 )
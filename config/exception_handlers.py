@@ -2,73 +2,136 @@
 Django ninja extra exception handlers.
 """
 
-from django.http import HttpRequest, JsonResponse
-from django.utils.translation import gettext_lazy as _
-from ninja.errors import ValidationError
-from ninja_extra import status
+from time import perf_counter
 
-from utils.base_exceptions import DefaultHTTPException
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from ninja.errors import AuthenticationError, Throttled, ValidationError
+from ninja_extra import exceptions, status
 
+from utils.base_exceptions import (
+    DefaultHTTPException,
+    NotAuthenticatedException,
+    PoolExhaustedException,
+    RateLimitedException,
+)
+from utils.db_pool import PoolTimeout
+from utils.error_responses import ErrorResponseRegistry
+from utils.json_encoders import JSONEncoderBackend, get_encoder
+from utils.metrics import (
+    ERROR_HANDLER_SECONDS,
+    ERRORS_TOTAL,
+    VALIDATION_ERROR_BYTES,
+    VALIDATION_ERROR_SECONDS,
+    MetricsSink,
+    get_route,
+)
+from utils.validation_errors import ValidationErrorTranslator
 
-def register_exception_handlers(api):
+
+def register_exception_handlers(
+    api,
+    encoder: str | JSONEncoderBackend | None = None,
+    validation_translator: ValidationErrorTranslator | None = None,
+    metrics: MetricsSink | None = None,
+):
     """
     Register exception handlers for ninja api.
+
+    Encoder can be a backend instance or backend name, by default the api renderer
+    encoder is used if it has one, otherwise `API_JSON_ENCODER` setting.
+    Validation translator defaults to one limited by `API_VALIDATION_MAX_ERRORS` setting.
+    When metrics sink is set, handled errors are counted by code, status and route,
+    with handler time and 422 payload size histograms.
+    Ninja throttles rejections are returned as `RateLimitedException` responses
+    and failed route authentication as `NotAuthenticatedException` ones.
+    Database pool timeouts are returned as `PoolExhaustedException` 503 responses.
+    Outside of DEBUG handled exceptions drop their traceback and chained exceptions.
     """
+    if encoder is None:
+        encoder = getattr(api.renderer, "encoder", None)
+
+    if not isinstance(encoder, JSONEncoderBackend):
+        encoder = get_encoder(encoder)
+
+    error_responses = ErrorResponseRegistry(encoder=encoder)
+
+    if validation_translator is None:
+        validation_translator = ValidationErrorTranslator(
+            max_errors=getattr(settings, "API_VALIDATION_MAX_ERRORS", None)
+        )
 
     @api.exception_handler(DefaultHTTPException)
-    def http_exception_handler(request: HttpRequest, exc: DefaultHTTPException) -> JsonResponse:
+    def http_exception_handler(request: HttpRequest, exc: DefaultHTTPException) -> HttpResponse:
         """
         Handle all http exceptions.
         """
-        # prepare default details
-        details: dict = {
-            "message": exc.message
-        }
-
-        if exc.field:
-            details["field"] = exc.field
-
-        return JsonResponse(
+        start = perf_counter()
+        response = HttpResponse(
+            error_responses.get_body(exc),
             status=exc.status_code,
-            data={
-                "status": exc.status_code,
-                "error": {
-                    "code": exc.error,
-                    "details": details
-                }
-            }
+            content_type="application/json",
         )
 
+        if exc.headers:
+            for header, value in exc.headers.items():
+                response[header] = value
+
+        if metrics is not None:
+            labels = (("code", exc.error), ("status", str(exc.status_code)), ("route", get_route(request)))
+            metrics.increment(ERRORS_TOTAL, labels)
+            metrics.observe(ERROR_HANDLER_SECONDS, labels, perf_counter() - start)
+
+        if not settings.DEBUG:
+            # don't keep frames of the request and chained exceptions, e.g. DoesNotExist, alive
+            exc.__traceback__ = exc.__context__ = exc.__cause__ = None
+
+        return response
+
+    @api.exception_handler(Throttled)
+    @api.exception_handler(exceptions.Throttled)
+    def throttled_exception_handler(
+        request: HttpRequest,
+        exc: Throttled | exceptions.Throttled,
+    ) -> HttpResponse:
+        """
+        Handle rejections of ninja throttles.
+        """
+        return http_exception_handler(request, RateLimitedException(retry_after=exc.wait))
+
+    @api.exception_handler(AuthenticationError)
+    def authentication_exception_handler(request: HttpRequest, exc: AuthenticationError) -> HttpResponse:
+        """
+        Handle failed authentication of routes with auth.
+        """
+        return http_exception_handler(request, NotAuthenticatedException())
+
+    @api.exception_handler(PoolTimeout)
+    def pool_timeout_exception_handler(request: HttpRequest, exc: PoolTimeout) -> HttpResponse:
+        """
+        Handle database pool exhaustion.
+        """
+        return http_exception_handler(request, PoolExhaustedException())
+
     @api.exception_handler(ValidationError)
-    def validation_exception_handler(request: HttpRequest, exc: ValidationError) -> JsonResponse:
+    def validation_exception_handler(request: HttpRequest, exc: ValidationError) -> HttpResponse:
         """
         Handle validation errors.
         """
-        # prepare list with errors
-        error_list: list = []
-
-        # iterate by each error
-        for error in exc.errors:
-            # get field from exception
-            location: str = "query"
-            field: str = error["loc"][0]
-            field_full = ".".join(map(str, error["loc"][1:])) if len(error["loc"]) > 1 else None
-            message = _(error["msg"])
-
-            # append dict with errors to error list
-            error_list.append(
-                {
-                    "location": location,
-                    "field": field,
-                    "field_full": field_full,
-                    "message": message
-                }
-            )
-
-        return JsonResponse(
-            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            data={
+        start = perf_counter()
+        body = encoder.dumps(
+            {
                 "status": status.HTTP_422_UNPROCESSABLE_ENTITY,
-                "error": {"code": "VALIDATION_ERROR", "details": error_list},
+                "error": validation_translator.build_error(exc.errors),
             }
-        )
\ No newline at end of file
+        )
+        response = HttpResponse(body, status=status.HTTP_422_UNPROCESSABLE_ENTITY, content_type="application/json")
+
+        if metrics is not None:
+            route = get_route(request)
+            labels = (("code", "VALIDATION_ERROR"), ("status", "422"), ("route", route))
+            metrics.increment(ERRORS_TOTAL, labels)
+            metrics.observe(VALIDATION_ERROR_BYTES, (("route", route),), len(body))
+            metrics.observe(VALIDATION_ERROR_SECONDS, (("route", route),), perf_counter() - start)
+
+        return response
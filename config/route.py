@@ -2,14 +2,32 @@
 Custom Django Ninja Route class with auto by_alias and response_schema mapping.
 """
 import typing as t
+from django.conf import settings
 from ninja.constants import NOT_SET, NOT_SET_TYPE
 from ninja.throttling import BaseThrottle
+from ninja.signature import is_async
 from ninja.types import TCallable
+from ninja.utils import contribute_operation_callback
 from ninja_extra import status
 from ninja_extra.constants import GET, POST, PUT, PATCH, DELETE
 from ninja_extra.controllers import Route
+from ninja_extra.pagination import AsyncPaginatorOperation, PaginatorOperation
 from ninja_extra.permissions import BasePermission
 
+from utils.async_operation import run_inline
+from utils.base_exceptions import QueryBudgetExceededException, RateLimitedException
+from utils.compression import CompressedOperation
+from utils.conditional import ConditionalGet
+from utils.db_routing import ReadReplica
+from utils.examples_generator import ExamplesGenerator
+from utils.bulk import BulkCreator, BulkItemResult, bulk_view
+from utils.pagination import KeysetPage, KeysetPagination
+from utils.profiling import RouteProfiler
+from utils.query_budget import QueryBudget
+from utils.query_projection import get_schema_class, projected_view
+from utils.response_cache import ResponseCache
+from utils.streaming import JSON, StreamSerializer, streamed_view
+
 
 class AutoAliasRoute(Route):
     """
@@ -17,6 +35,18 @@ class AutoAliasRoute(Route):
     - by_alias=True globally for all responses (Pydantic schema aliasing)
     - simplified HTTP method decorators (get, post, etc.)
     - support for response_schema shortcut to define response by status code
+    - project=True to load only columns read by response schema for returned querysets
+    - stream=True (or "ndjson") to stream returned rows as JSON array (or NDJSON)
+    - inline=True to run async routes in the event loop without sync_to_async thread hops
+    - profile=True to log split timing of sampled requests (API_PROFILE setting enables it for all routes)
+    - bulk endpoints that create objects from a JSON array with per-item results
+    - cache=60 (or ResponseCache) to cache serialized responses of GET routes
+    - conditional=True (or ConditionalGet) to answer If-None-Match/If-Modified-Since with 304
+    - paginate=True (or KeysetPagination) to return querysets in pages with signed cursors
+    - throttle=RateThrottle("100/min") to reject requests over the rate with RATE_LIMITED error
+    - compress=False to disable or compress=level to tune compression of responses by the api renderer compressor
+    - max_queries=N and max_db_time=seconds to catch routes that run more database queries than expected
+    - replica="alias" (or False) to choose read replica of GET routes, API_READ_REPLICA setting is the default
     """
 
     def __init__(self, *args, **kwargs) -> None:
@@ -50,12 +80,36 @@ class AutoAliasRoute(Route):
             t.List[t.Union[t.Type[BasePermission], BasePermission, t.Any]]
         ] = None,
         openapi_extra: t.Optional[t.Dict[str, t.Any]] = None,
+        project: bool = False,
+        stream: t.Union[bool, str] = False,
+        chunk_size: int = 500,
+        inline: bool = False,
+        profile: t.Optional[bool] = None,
+        profile_sample_rate: t.Optional[int] = None,
+        cache: t.Union[int, ResponseCache, None] = None,
+        conditional: t.Union[bool, ConditionalGet, None] = None,
+        paginate: t.Union[bool, KeysetPagination, None] = None,
+        compress: t.Union[bool, int] = True,
+        max_queries: t.Optional[int] = None,
+        max_db_time: t.Optional[float] = None,
+        replica: t.Union[bool, str, None] = None,
     ) -> t.Callable[[TCallable], TCallable]:
         """
         Internal shared decorator logic for all HTTP methods.
 
         Handles:
         - Wrapping response or response_schema into {status_code: schema}
+        - Applying response schema projection to returned querysets
+        - Streaming returned rows through response schema in chunks of chunk_size rows
+        - Running async routes inline, the view must return fully loaded data (e.g. from aget)
+        - Profiling 1 in profile_sample_rate requests, defaults are taken from API_PROFILE* settings
+        - Caching serialized GET responses, cache is timeout in seconds or ResponseCache
+        - Conditional GET, True computes ETag from the body, ConditionalGet can check versions before the view
+        - Keyset pagination, response schema becomes KeysetPage of it and paginator errors are documented
+        - Compressing responses, including errors and streams, True uses default codec levels
+        - Documenting RATE_LIMITED responses of throttled routes
+        - Query budget, over budget requests return QUERY_BUDGET_EXCEEDED in debug mode and are logged otherwise
+        - Reading GET routes from replica with fallback to primary, StickyWritesMiddleware keeps writers on primary
         - Passing route parameters to the base Route class
         """
         if response_schema is not NOT_SET:
@@ -63,7 +117,109 @@ class AutoAliasRoute(Route):
         elif response != NOT_SET and not isinstance(response, dict):
             response = {status_code: response}
 
+        schema_class = get_schema_class(response.get(status_code)) if isinstance(response, dict) else None
+        if (project or stream or paginate) and schema_class is None:
+            raise ValueError("project, stream and paginate options require response schema for the route status code")
+
+        if throttle is not NOT_SET:
+            openapi_extra = ExamplesGenerator.extend_examples(openapi_extra, RateLimitedException)
+
+        budget = None
+        if max_queries is not None or max_db_time is not None:
+            budget = QueryBudget(max_queries=max_queries, max_db_time=max_db_time)
+            openapi_extra = ExamplesGenerator.extend_examples(openapi_extra, QueryBudgetExceededException)
+            openapi_extra["responses"][QueryBudgetExceededException.status_code].setdefault(
+                "description", f"Query budget of {budget} is exceeded, returned only in debug mode"
+            )
+
+        if paginate is True:
+            paginate = KeysetPagination()
+        if paginate:
+            if method != GET or stream:
+                raise ValueError("paginate option is supported only for not streamed GET routes")
+            paginate.schema_class = schema_class
+            response = {**response, status_code: KeysetPage[schema_class]}
+            openapi_extra = ExamplesGenerator.extend_examples(openapi_extra, *paginate.exceptions)
+
+        if isinstance(cache, int):
+            cache = ResponseCache(timeout=cache)
+        if cache is not None and (method != GET or stream):
+            raise ValueError("cache option is supported only for not streamed GET routes")
+
+        if conditional is True:
+            conditional = ConditionalGet()
+        if conditional and (method != GET or stream):
+            raise ValueError("conditional option is supported only for not streamed GET routes")
+
+        if replica is not None and replica is not False and method != GET:
+            raise ValueError("replica option is supported only for GET routes")
+        alias = replica if isinstance(replica, str) else None
+        if method == GET and (replica is None or replica is True):
+            alias = getattr(settings, "API_READ_REPLICA", None)
+        if replica is True and alias is None:
+            raise ValueError("replica=True requires API_READ_REPLICA setting")
+
+        read_replica = None
+        if alias is not None:
+            read_replica = ReadReplica(alias, cooldown=getattr(settings, "API_READ_REPLICA_COOLDOWN", 30))
+
         def decorator(view_func: TCallable) -> TCallable:
+            if project:
+                view_func = projected_view(view_func, schema_class)
+
+            if paginate:
+                operation_class = AsyncPaginatorOperation if is_async(view_func) else PaginatorOperation
+                view_func = operation_class(paginator=paginate, view_func=view_func).as_view
+
+            if read_replica is not None:
+                view_func = read_replica.wrap_view(view_func)
+
+            if stream:
+                serializer = StreamSerializer(
+                    schema_class,
+                    stream_format=JSON if stream is True else stream,
+                    chunk_size=chunk_size,
+                )
+                view_func = streamed_view(view_func, serializer)
+
+            if cache is not None:
+                view_func = cache.wrap_view(view_func)
+
+            if conditional:
+                view_func = conditional.wrap_view(view_func)
+
+            profiler = None
+            if getattr(settings, "API_PROFILE", False) if profile is None else profile:
+                profiler = RouteProfiler(
+                    sample_rate=profile_sample_rate or getattr(settings, "API_PROFILE_SAMPLE_RATE", 100),
+                    output_dir=getattr(settings, "API_PROFILE_DIR", None),
+                )
+                view_func = profiler.wrap_view(view_func)
+
+            if cache is not None:
+                contribute_operation_callback(view_func, cache)
+
+            if conditional:
+                contribute_operation_callback(view_func, conditional)
+
+            if inline:
+                contribute_operation_callback(view_func, run_inline)
+
+            if profiler is not None:
+                contribute_operation_callback(view_func, profiler)
+
+            if budget is not None:
+                contribute_operation_callback(view_func, budget)
+
+            if read_replica is not None:
+                # added after run_inline, which replaces run, and outside of budget, so it counts single attempt
+                contribute_operation_callback(view_func, read_replica)
+
+            if compress is not False:
+                # added last, so profiled time doesn't include compression
+                level = None if compress is True else compress
+                contribute_operation_callback(view_func, CompressedOperation(level))
+
             return cls._create_route_function(
                 view_func,
                 path=path,
@@ -152,6 +308,45 @@ class AutoAliasRoute(Route):
             kwargs["path"] = args[0]
         return cls._operation(DELETE, **kwargs)
 
+    @classmethod
+    def bulk(
+        cls,
+        *args,
+        item_schema: t.Any,
+        response_schema: t.Any,
+        chunk_size: int = 1000,
+        max_items: int = 1000,
+        **kwargs,
+    ):
+        """
+        Shortcut for defining bulk create POST endpoints.
+
+        The view is called for every valid item and returns unsaved model instance,
+        instances are inserted with bulk_create in chunks of chunk_size in a single transaction.
+        Requests with more than max_items items fail with 422 validation error.
+        Response is a list of per-item results with 201 and data or error status and error,
+        errors have the same {"code", "details"} shape as api error responses.
+
+        Usage:
+            @route.bulk("/bulk/", item_schema=MySchema, response_schema=MyResponseSchema)
+            def handler(self, request, item: MySchema) -> MyModel:
+                return MyModel(**item.dict())
+        """
+        if args:
+            kwargs["path"] = args[0]
+
+        creator = BulkCreator(item_schema, chunk_size=chunk_size)
+        operation = cls._operation(
+            POST,
+            response_schema=t.List[BulkItemResult[response_schema]],
+            status_code=status.HTTP_207_MULTI_STATUS,
+            **kwargs,
+        )
+
+        def decorator(view_func: TCallable) -> TCallable:
+            return operation(bulk_view(view_func, creator, max_items))
+        return decorator
+
 
 # Default import alias
 route = AutoAliasRoute
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     "users",
+    "utils",
     "ninja_extra"
 ]
 
@@ -49,6 +50,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'utils.db_routing.StickyWritesMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -75,11 +77,48 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Per-worker connection pool, see utils.db_pool.ConnectionPool for options, None to open connection per request
+DATABASE_POOL = {
+    'max_size': 10,
+    'timeout': 5,
+    'max_lifetime': 1800,
+    'max_idle': 300,
+    'health_checks': True,
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'utils.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'OPTIONS': {
+            'pool': DATABASE_POOL,
+        },
+    },
+}
+
+# Read replica of the default database is added as another alias, e.g. 'replica' with 'TEST': {'MIRROR': 'default'},
+# and set in API_READ_REPLICA setting, ReplicaRouter sends reads of GET routes to it
+
+DATABASE_ROUTERS = ['utils.db_routing.ReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# Local memory cache is enough for a single process, e.g. runserver and tests. Route versions of response caches,
+# model versions, response cache locks and throttle counters must be shared by all workers and rely on atomic
+# add and incr, use RedisCache or PyMemcacheCache for several workers, FileBasedCache isn't atomic across processes
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # per-worker copies of cached responses, they are invalidated by route versions in the default cache
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
 }
 
 
@@ -122,6 +161,67 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Number of trusted proxies that append client address to X-Forwarded-For, throttles use REMOTE_ADDR with 0
+NINJA_NUM_PROXIES = 0
+
+# Rate limit of user creation per client, e.g. "60/min", None to not limit it
+API_CREATE_USER_THROTTLE = None
+
+# API settings
+
+# JSON encoder backend for api responses: "auto", "orjson", "msgspec" or "json", "auto" prefers orjson,
+# msgspec writes datetimes with microseconds instead of milliseconds, see utils.json_encoders.MsgspecEncoder
+API_JSON_ENCODER = "auto"
+
+# Max number of errors in a single validation error response, None for no limit,
+# the number of errors left out is returned in "omitted" of the error
+API_VALIDATION_MAX_ERRORS = 100
+
+# Directory for persisted OpenAPI schema, None to build schema on every request
+API_OPENAPI_CACHE_DIR = None
+
+# Metrics sink for api errors: "prometheus", "statsd" or None
+API_METRICS_SINK = "prometheus"
+
+# URL path of the "prometheus" sink scrape endpoint, e.g. "metrics/", None to not serve it
+API_METRICS_PATH = None
+
+# Client addresses allowed to scrape metrics, REMOTE_ADDR is checked, None allows everyone
+API_METRICS_ALLOWED_IPS = ("127.0.0.1", "::1")
+
+# StatsD host and port used by the "statsd" metrics sink
+API_STATSD_ADDRESS = ("127.0.0.1", 8125)
+
+# Profile all api routes, routes can override it with profile= option
+API_PROFILE = False
+
+# Profile 1 in N requests of a profiled route
+API_PROFILE_SAMPLE_RATE = 100
+
+# Directory for cProfile stats of profiled routes, None to log split timing only
+API_PROFILE_DIR = None
+
+# Response compression encodings in preference order, brotli and zstd need their libraries installed,
+# empty to disable compression
+API_COMPRESSION_ENCODINGS = ("zstd", "br", "gzip")
+
+# Responses shorter than this number of bytes are not compressed
+API_COMPRESSION_MIN_SIZE = 1024
+
+# Return QUERY_BUDGET_EXCEEDED error for routes over their query budget instead of logging them,
+# enable it in tests, Django test runner disables DEBUG
+API_QUERY_BUDGET_RAISE = DEBUG
+
+# Database alias of read replica for GET routes, None to read from primary, routes can override it with replica= option,
+# set it only for a database that is replicated from the default one
+API_READ_REPLICA = None
+
+# Reads of a client go to primary for this number of seconds after its write, so it sees own writes
+API_READ_REPLICA_STICKY_SECONDS = 5
+
+# Reads go to primary for this number of seconds after a replica error
+API_READ_REPLICA_COOLDOWN = 30
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -14,12 +14,18 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
 
-from config.api import api
+from config.api import api, metrics
+from utils.metrics import InProcessMetrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', api.urls),
 ]
+
+# prometheus scrape endpoint for in-process metrics, served only when enabled
+if isinstance(metrics, InProcessMetrics) and settings.API_METRICS_PATH:
+    urlpatterns.append(path(settings.API_METRICS_PATH, metrics.view))
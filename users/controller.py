@@ -1,22 +1,74 @@
 """
 Test controller.
 """
+from django.conf import settings
 from django.http import HttpRequest
+from ninja.constants import NOT_SET
+from ninja.security import django_auth
 from ninja_extra import ControllerBase, api_controller, status
 
 from users.api_errors import NotFoundException, UserDisableException, UserInactiveException
 from config.route import route
 from users.schemas import UserBaseSchema, UserCreatedSchema, UserResponseBaseSchema
 from users.models import User
+from utils.conditional import ConditionalGet, ModelVersion
 from utils.examples_generator import generate_examples
+from utils.pagination import KeysetPagination
+from utils.throttling import RateThrottle
+from utils.response_cache import ResponseCache
 
 
 @api_controller("/users", tags=["Users"])
 class UserTestController(ControllerBase):
 
+    # registered before /{user_id}/, otherwise it would match "bulk" as user id
+    @route.bulk(
+        "/bulk/",
+        item_schema=UserBaseSchema,
+        response_schema=UserCreatedSchema,
+        openapi_extra=generate_examples(
+            auth=True,
+        )
+    )
+    def create_users(self, request: HttpRequest, user_schema: UserBaseSchema) -> User:
+        return User(**user_schema.dict())
+
+
+    @route.get(
+        "/",
+        response_schema=UserResponseBaseSchema,
+        project=True,
+        paginate=KeysetPagination(ordering="-date_joined"),
+        max_queries=1,
+        openapi_extra=generate_examples(
+            auth=True,
+        )
+    )
+    def list_users(self, request: HttpRequest):
+        return User.objects.all()
+
+
+    # registered before /{user_id}/ for the same reason as /bulk/
+    @route.get(
+        "/me/",
+        response_schema=UserResponseBaseSchema,
+        auth=django_auth,
+        # sessions are written outside of the api, replica may not have them yet
+        replica=False,
+        openapi_extra=generate_examples(
+            auth=True,
+        )
+    )
+    def get_current_user(self, request: HttpRequest) -> User:
+        return request.auth
+
+
     @route.get(
         "/{user_id}/",
         response_schema=UserResponseBaseSchema,
+        cache=ResponseCache(timeout=60, models=[User], cache_alias="local", version_cache_alias="default"),
+        conditional=ConditionalGet(etag=ModelVersion(User, kwarg="user_id")),
+        max_queries=1,
         openapi_extra=generate_examples(
             NotFoundException,
             UserDisableException,
@@ -26,7 +78,7 @@ class UserTestController(ControllerBase):
     )
     def get_user_by_id(self, request: HttpRequest, user_id: int) -> User:
         try:
-            return User.objects.get(id=user_id)
+            return UserResponseBaseSchema.project(User.objects).get(id=user_id)
         except User.DoesNotExist:
             raise NotFoundException
 
@@ -35,9 +87,48 @@ class UserTestController(ControllerBase):
         "/",
         status_code=status.HTTP_201_CREATED,
         response_schema=UserCreatedSchema,
+        throttle=(
+            RateThrottle(settings.API_CREATE_USER_THROTTLE, scope="create_user")
+            if settings.API_CREATE_USER_THROTTLE else NOT_SET
+        ),
         openapi_extra=generate_examples(
             auth=True,
         )
     )
     def create_user(self, request: HttpRequest, user_schema: UserBaseSchema) -> User:
-        return User.objects.create(**user_schema.dict())
\ No newline at end of file
+        return User.objects.create(**user_schema.dict())
+
+
+@api_controller("/async/users", tags=["Users"])
+class AsyncUserTestController(ControllerBase):
+
+    @route.get(
+        "/{user_id}/",
+        response_schema=UserResponseBaseSchema,
+        inline=True,
+        max_queries=1,
+        openapi_extra=generate_examples(
+            NotFoundException,
+            UserDisableException,
+            UserInactiveException,
+            auth=True
+        )
+    )
+    async def get_user_by_id(self, request: HttpRequest, user_id: int) -> User:
+        try:
+            return await UserResponseBaseSchema.project(User.objects).aget(id=user_id)
+        except User.DoesNotExist:
+            raise NotFoundException
+
+
+    @route.post(
+        "/",
+        status_code=status.HTTP_201_CREATED,
+        response_schema=UserCreatedSchema,
+        inline=True,
+        openapi_extra=generate_examples(
+            auth=True,
+        )
+    )
+    async def create_user(self, request: HttpRequest, user_schema: UserBaseSchema) -> User:
+        return await User.objects.acreate(**user_schema.dict())
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class UtilsConfig(AppConfig):
+    name = 'utils'
+
+    def ready(self) -> None:
+        """Import api_errors modules of installed apps, freeze the error catalog and register checks."""
+        from utils import checks  # noqa: F401
+        from utils.error_catalog import error_catalog
+
+        autodiscover_modules("api_errors")
+        error_catalog.freeze()
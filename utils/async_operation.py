@@ -0,0 +1,64 @@
+"""
+Async operation that runs in the event loop without thread hops.
+"""
+import typing as t
+
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from ninja.operation import Operation as NinjaOperation
+from ninja.signature import is_async
+from ninja_extra.operation import AsyncOperation
+from ninja_extra.permissions import AllowAny
+
+
+def allows_any(permissions: t.Iterable[t.Any]) -> bool:
+    """Check whether permissions are only AllowAny, which never touch database."""
+    return all(
+        permission is AllowAny or isinstance(permission, AllowAny)
+        for permission in permissions
+    )
+
+
+def run_inline(operation: AsyncOperation) -> None:
+    """
+    Replace `run` of async operation with one that doesn't use sync_to_async.
+
+    Ninja extra runs params parsing, permission checks and response serialization of async views
+    in a worker thread, which is needed only when these steps touch the database. With this
+    callback all of them run in the event loop, permission checks are still run in a thread
+    unless they are AllowAny. The view must return fully loaded data, e.g. from `aget`.
+    """
+    if not is_async(operation.view_func):
+        return
+
+    async def run(request: HttpRequest, **kw: t.Any) -> HttpResponseBase:
+        try:
+            async with operation._prep_run(
+                request,
+                temporal_response=operation.api.create_temporal_response(request),
+                api=operation.api,
+                view_signature=operation.signature,
+                **kw,
+            ) as ctx:
+                error = await operation._run_checks(request)
+                if error:
+                    return error
+
+                route_function = operation._get_route_function()
+                if route_function:
+                    api_controller = route_function.get_api_controller()
+                    permissions = route_function.route.permissions or api_controller.permission_classes
+                    if allows_any(permissions):
+                        route_function.run_permission_check(ctx)
+                    else:
+                        await route_function.async_run_check_permissions(ctx)
+
+                if not ctx.has_computed_route_parameters:
+                    ctx.compute_route_parameters()
+
+                result = await operation.view_func(request, **ctx.kwargs["view_func_kwargs"])
+                return NinjaOperation._result_to_response(operation, request, result, ctx.response)
+        except Exception as e:
+            return operation.api.on_exception(request, e)
+
+    operation.run = run
@@ -0,0 +1,59 @@
+"""
+SQLite backend with per-worker connection pool.
+
+Pool is enabled with `OPTIONS["pool"]`, True for defaults or dict of `ConnectionPool` options, e.g.:
+    "OPTIONS": {"pool": {"max_size": 10, "timeout": 5, "max_lifetime": 1800}}
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+from utils.db_pool import ConnectionPool, get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite database wrapper that takes connections from pool and returns them on close."""
+
+    connection_pool: ConnectionPool | None = None
+
+    def get_pool_options(self) -> dict | None:
+        """Return pool options, None when pooling is disabled or database is in memory."""
+        options = self.settings_dict["OPTIONS"].get("pool")
+        if not options or self.is_in_memory_db():
+            return None
+
+        if self.settings_dict["CONN_MAX_AGE"] != 0:
+            raise ImproperlyConfigured("Pooling doesn't support persistent connections, set CONN_MAX_AGE to 0")
+        return {} if options is True else options
+
+    def get_connection_params(self) -> dict:
+        """Return sqlite3.connect parameters without pool options."""
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    def get_new_connection(self, conn_params: dict):
+        """Return pooled connection, new connections are set up once when they are opened."""
+        options = self.get_pool_options()
+        if options is None:
+            self.connection_pool = None
+            return super().get_new_connection(conn_params)
+
+        self.connection_pool = get_pool(
+            self.alias,
+            str(self.settings_dict["NAME"]),
+            options,
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+        )
+        return self.connection_pool.acquire()
+
+    def _close(self) -> None:
+        """Return connection to the pool instead of closing it."""
+        if self.connection is None or self.connection_pool is None:
+            return super()._close()
+
+        with self.wrap_database_errors:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+        self.connection_pool.release(self.connection)
+        # connection is used by other wrappers from now on
+        self.connection = None
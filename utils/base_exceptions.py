@@ -2,16 +2,22 @@
 Base api exceptions.
 """
 import abc
+import math
 from ninja.errors import HttpError
 from ninja_extra import status
 from django.utils.translation import gettext_lazy as _
 
+from utils.error_catalog import error_catalog
+
 
 class BaseHTTPException(HttpError, abc.ABC):
     """
     Base class for HTTP exceptions with enforced structure and OpenAPI example.
     """
 
+    # exceptions always carry instance __dict__, empty slots keep the layout from growing
+    __slots__ = ()
+
     status_code: int = 400
 
     def __init__(self) -> None:
@@ -28,22 +34,42 @@ class DefaultHTTPException(BaseHTTPException):
     """
     Default HTTP exception class that supports declarative definition of error,
     message, and field, with optional override via constructor.
+
+    Subclasses that define `error` are registered in the error catalog, codes must be unique.
+    `headers` are added to the error response, `openapi_headers` document them.
+    Class attributes are the defaults, every raise creates a new instance that stores
+    only overridden message and field.
     """
 
+    __slots__ = ()
+
     status_code: int = 400
     error: str
     message: str
     field: str | None = None
+    headers: dict[str, str] | None = None
+    openapi_headers: dict[str, dict] | None = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Register exception class in the error catalog."""
+        super().__init_subclass__(**kwargs)
+        if "error" in cls.__dict__:
+            error_catalog.register(cls)
 
     def __init__(
         self,
         message: str | None = None,
         field: str | None = None,
     ) -> None:
-        """Initialize base exception."""
-        self.message = message if message else self.message
-        self.field = field if field else self.field
-        super().__init__()
+        """Initialize base exception, status code and default message are read from the class."""
+        if message:
+            self.message = message
+        if field:
+            self.field = field
+
+    def __str__(self) -> str:
+        """Return message, default messages are lazy translations."""
+        return str(self.message)
 
     def example(self) -> dict:
         """Return an example of the error response. This is used in the OpenAPI docs."""
@@ -81,8 +107,99 @@ class InvalidCredentialsException(DefaultHTTPException):
     message = _("Invalid credentials.")
     status_code = status.HTTP_401_UNAUTHORIZED
 
+class NotAuthenticatedException(DefaultHTTPException):
+    """Exception raised when authentication of a route with auth fails, e.g. without a session."""
+
+    error = "NOT_AUTHENTICATED"
+    message = _("Authentication is required.")
+    status_code = status.HTTP_401_UNAUTHORIZED
+
+# endregion
+
+# region: Bulk exceptions
+
+class BulkItemConflictException(DefaultHTTPException):
+    """Exception for bulk item that violates database constraints, e.g. duplicate unique value."""
+
+    error = "CONFLICT"
+    message = _("Item conflicts with existing data.")
+    status_code = status.HTTP_409_CONFLICT
+
+# endregion
+
+# region: Pagination exceptions
+
+class InvalidCursorException(DefaultHTTPException):
+    """Exception raised when the pagination cursor is malformed, tampered or belongs to other ordering."""
+
+    error = "INVALID_CURSOR"
+    message = _("Pagination cursor is not valid.")
+    status_code = status.HTTP_400_BAD_REQUEST
+    field = "cursor"
+
+class PageSizeTooLargeException(DefaultHTTPException):
+    """Exception raised when the requested page size is over the paginator limit."""
+
+    error = "PAGE_SIZE_TOO_LARGE"
+    message = _("Page size is over the limit.")
+    status_code = status.HTTP_400_BAD_REQUEST
+    field = "page_size"
+
 # endregion
 
+# region: Throttling exceptions
+
+class RateLimitedException(DefaultHTTPException):
+    """Exception raised when the client is over the route rate limit."""
 
+    error = "RATE_LIMITED"
+    message = _("Too many requests.")
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    openapi_headers = {
+        "Retry-After": {
+            "description": "Number of seconds to wait before the next request.",
+            "schema": {"type": "integer"},
+        },
+    }
+
+    def __init__(
+        self,
+        message: str | None = None,
+        field: str | None = None,
+        retry_after: float | None = None,
+    ) -> None:
+        """Initialize exception, retry_after is rounded up to whole seconds."""
+        super().__init__(message, field)
+        if retry_after is not None:
+            self.headers = {"Retry-After": str(max(math.ceil(retry_after), 1))}
 
+# endregion
 
+# region: Query budget exceptions
+
+class QueryBudgetExceededException(DefaultHTTPException):
+    """Exception returned in debug mode when the route runs more database queries than its budget allows."""
+
+    error = "QUERY_BUDGET_EXCEEDED"
+    message = _("Route exceeded its database query budget.")
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+
+# endregion
+
+# region: Database exceptions
+
+class PoolExhaustedException(DefaultHTTPException):
+    """Exception raised when no database connection is released within the pool timeout."""
+
+    error = "POOL_EXHAUSTED"
+    message = _("Service is temporarily overloaded, please retry later.")
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    headers = {"Retry-After": "1"}
+    openapi_headers = {
+        "Retry-After": {
+            "description": "Number of seconds to wait before the next request.",
+            "schema": {"type": "integer"},
+        },
+    }
+
+# endregion
@@ -0,0 +1,153 @@
+"""
+Bulk create endpoints with per-item results.
+"""
+import typing as t
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Model
+from django.http import HttpRequest
+from ninja import Body, Schema
+from ninja_extra import status
+from pydantic import SkipValidation, ValidationError
+
+from utils.base_exceptions import BulkItemConflictException, DefaultHTTPException
+from utils.error_responses import build_error_data
+from utils.signals import post_bulk_create
+from utils.validation_errors import ValidationErrorTranslator
+
+T = t.TypeVar("T")
+
+
+class BulkItemError(Schema):
+    """Error of a single bulk item, same shape as the `error` of api error responses."""
+
+    code: str
+    details: t.Any
+    # number of validation errors left out of details, see ValidationErrorTranslator
+    omitted: t.Optional[int] = None
+
+
+class BulkItemResult(Schema, t.Generic[T]):
+    """Result of a single bulk item, index is the item position in the request body."""
+
+    index: int
+    status: int
+    data: t.Optional[T] = None
+    error: t.Optional[BulkItemError] = None
+
+
+class BulkCreator:
+    """
+    Validate bulk items and insert valid ones with `bulk_create` in chunks.
+
+    All chunks are inserted in a single transaction. When a chunk violates database
+    constraints its items are inserted one by one in savepoints, so only conflicting
+    items fail with `BulkItemConflictException`. `post_bulk_create` signal is sent after
+    every chunk, so caches of the model are invalidated.
+    """
+
+    def __init__(
+        self,
+        item_schema: type[Schema],
+        chunk_size: int = 1000,
+        validation_translator: ValidationErrorTranslator | None = None,
+    ) -> None:
+        """Initialize creator."""
+        self.item_schema = item_schema
+        self.chunk_size = chunk_size
+        self.validation_translator = validation_translator or ValidationErrorTranslator(
+            max_errors=getattr(settings, "API_VALIDATION_MAX_ERRORS", None)
+        )
+
+    def error_result(self, index: int, exc: Exception) -> dict:
+        """Build failed item result from validation error or api exception."""
+        if isinstance(exc, ValidationError):
+            errors = [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)]
+            return {
+                "index": index,
+                "status": status.HTTP_422_UNPROCESSABLE_ENTITY,
+                "data": None,
+                "error": self.validation_translator.build_error(errors),
+            }
+
+        data = build_error_data(exc)
+        return {"index": index, "status": data["status"], "data": None, "error": data["error"]}
+
+    def create(self, items: list[t.Any], build: t.Callable[[Schema], Model]) -> list[dict]:
+        """
+        Create objects from raw items.
+
+        `build` receives validated item schema and returns unsaved model instance,
+        it may raise `DefaultHTTPException` to fail the item.
+        """
+        results: list[dict | None] = [None] * len(items)
+        pending: list[tuple[int, Model]] = []
+
+        for index, item in enumerate(items):
+            try:
+                pending.append((index, build(self.item_schema.model_validate(item))))
+            except (ValidationError, DefaultHTTPException) as exc:
+                results[index] = self.error_result(index, exc)
+
+        with transaction.atomic():
+            for start in range(0, len(pending), self.chunk_size):
+                chunk = pending[start:start + self.chunk_size]
+                inserted = self.insert_chunk(chunk)
+                for index, obj in inserted:
+                    # all keys are set, ninja resolves missing dict keys with slow template lookups
+                    results[index] = {"index": index, "status": status.HTTP_201_CREATED, "data": obj, "error": None}
+
+                if inserted:
+                    post_bulk_create.send(sender=type(inserted[0][1]), objs=[obj for _, obj in inserted])
+
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = self.error_result(index, BulkItemConflictException())
+
+        return results
+
+    @staticmethod
+    def insert_chunk(chunk: list[tuple[int, Model]]) -> list[tuple[int, Model]]:
+        """Insert chunk and return inserted items, falls back to single inserts on conflicts."""
+        objs = [obj for _, obj in chunk]
+        model = type(objs[0])
+
+        try:
+            with transaction.atomic():
+                model._default_manager.bulk_create(objs)
+            return chunk
+        except IntegrityError:
+            pass
+
+        inserted = []
+        for index, obj in chunk:
+            try:
+                with transaction.atomic():
+                    obj.save(force_insert=True)
+                inserted.append((index, obj))
+            except IntegrityError:
+                obj.pk = None
+
+        return inserted
+
+
+def bulk_view(view_func: t.Callable, creator: BulkCreator, max_items: int) -> t.Callable:
+    """
+    Turn per-item view into bulk view that accepts a JSON array of up to `max_items` items.
+
+    Items are validated one by one, so invalid items don't fail the whole request,
+    body that is not an array or is too long fails with the standard 422 response.
+    Skipped validation keeps the item schema in the OpenAPI request body.
+    """
+    items_type = t.List[SkipValidation[creator.item_schema]]
+
+    def wrapper(self, request: HttpRequest, items: items_type = Body(..., max_length=max_items)) -> list[dict]:
+        return creator.create(items, lambda item: view_func(self, request, item))
+
+    # copy attributes without __wrapped__, ninja must see the bulk signature
+    wrapper.__name__ = view_func.__name__
+    wrapper.__qualname__ = view_func.__qualname__
+    wrapper.__module__ = view_func.__module__
+    wrapper.__doc__ = view_func.__doc__
+    return wrapper
@@ -0,0 +1,49 @@
+"""
+System checks of api utils.
+"""
+import typing as t
+from importlib import import_module
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# aliases of caches that hold versions, locks and counters used by all workers
+shared_cache_aliases: set[str] = set()
+
+# backends that keep values in memory of a single process
+LOCAL_CACHE_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",)
+
+# backends that are shared by processes, but their add and incr aren't atomic across them
+NON_ATOMIC_CACHE_BACKENDS = ("django.core.cache.backends.filebased.FileBasedCache",)
+
+
+def require_shared_cache(alias: str) -> None:
+    """Check that the cache is shared by all workers, e.g. for invalidation versions."""
+    shared_cache_aliases.add(alias)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_caches(app_configs: t.Any, **kwargs: t.Any) -> list[Warning]:
+    """Warn about caches that can't serve several workers, local memory is fine for a single process."""
+    # routes create their caches when urls are imported
+    import_module(settings.ROOT_URLCONF)
+
+    warnings = []
+    for alias in sorted(shared_cache_aliases):
+        backend = settings.CACHES.get(alias, {}).get("BACKEND")
+        if backend is None or backend in LOCAL_CACHE_BACKENDS:
+            reason = "isn't shared by workers, invalidation in one worker isn't seen by others"
+        elif backend in NON_ATOMIC_CACHE_BACKENDS:
+            reason = "isn't atomic across workers, response cache locks and throttle counters race"
+        else:
+            continue
+
+        warnings.append(
+            Warning(
+                f"Cache {alias!r} of api response caches, model versions or throttles {reason}.",
+                hint="Configure RedisCache or PyMemcacheCache in CACHES setting when running several workers.",
+                id="utils.W001",
+            )
+        )
+
+    return warnings
@@ -0,0 +1,338 @@
+"""
+Response compression tuned for JSON api payloads.
+"""
+import abc
+import re
+import threading
+import typing as t
+import zlib
+
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from django.utils.cache import patch_vary_headers
+from ninja.operation import Operation
+from ninja.signature import is_async
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Accept-Encoding item with optional quality, e.g. "br;q=0.9"
+ENCODING_RE = re.compile(r"\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*")
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/problem+json", "text/")
+
+
+class StreamCompressor(t.Protocol):
+    """Incremental compressor of streamed response chunks."""
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress chunk and flush it, so clients can decode it without waiting for the end."""
+        ...
+
+    def finish(self) -> bytes:
+        """Return end of the compressed stream."""
+        ...
+
+
+class Codec(abc.ABC):
+    """
+    Base class for compression codecs.
+
+    Levels out of the codec range are clamped, so one route level works for all codecs.
+    """
+
+    name: str
+    default_level: int
+    min_level: int
+    max_level: int
+
+    def get_level(self, level: int | None) -> int:
+        """Return codec level for requested level."""
+        if level is None:
+            return self.default_level
+        return min(max(level, self.min_level), self.max_level)
+
+    @abc.abstractmethod
+    def compress(self, data: bytes, level: int) -> bytes:
+        """Compress whole body."""
+        ...
+
+    @abc.abstractmethod
+    def stream(self, level: int) -> StreamCompressor:
+        """Return incremental compressor for streamed responses."""
+        ...
+
+
+class GzipStream:
+    """Incremental gzip compressor."""
+
+    def __init__(self, level: int) -> None:
+        """Initialize compressor with gzip header."""
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress chunk and flush it."""
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """Return gzip trailer."""
+        return self.compressor.flush(zlib.Z_FINISH)
+
+
+class GzipCodec(Codec):
+    """Gzip codec, repetitive JSON bodies are as small at level 2 as at level 6 and compressed 2-4x faster."""
+
+    name = "gzip"
+    default_level = 2
+    min_level = 1
+    max_level = 9
+
+    def compress(self, data: bytes, level: int) -> bytes:
+        """Compress whole body."""
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self, level: int) -> StreamCompressor:
+        """Return incremental compressor."""
+        return GzipStream(level)
+
+
+class BrotliStream:
+    """Incremental brotli compressor."""
+
+    def __init__(self, level: int) -> None:
+        """Initialize compressor."""
+        self.compressor = brotli.Compressor(quality=level, mode=brotli.MODE_TEXT)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress chunk and flush it."""
+        return self.compressor.process(data) + self.compressor.flush()
+
+    def finish(self) -> bytes:
+        """Return end of the stream."""
+        return self.compressor.finish()
+
+
+class BrotliCodec(Codec):
+    """Brotli codec, levels above 5 are too slow for dynamic responses."""
+
+    name = "br"
+    default_level = 4
+    min_level = 0
+    max_level = 11
+
+    def compress(self, data: bytes, level: int) -> bytes:
+        """Compress whole body."""
+        return brotli.compress(data, quality=level, mode=brotli.MODE_TEXT)
+
+    def stream(self, level: int) -> StreamCompressor:
+        """Return incremental compressor."""
+        return BrotliStream(level)
+
+
+class ZstdStream:
+    """Incremental zstd compressor."""
+
+    def __init__(self, level: int) -> None:
+        """Initialize compressor."""
+        self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress chunk and flush it."""
+        return self.compressor.compress(data) + self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        """Return end of the frame."""
+        return self.compressor.flush()
+
+
+class ZstdCodec(Codec):
+    """Zstandard codec, compressors are not thread safe and are cached per thread and level."""
+
+    name = "zstd"
+    default_level = 3
+    min_level = 1
+    max_level = 19
+
+    def __init__(self) -> None:
+        """Initialize compressors cache."""
+        self.local = threading.local()
+
+    def compress(self, data: bytes, level: int) -> bytes:
+        """Compress whole body."""
+        compressors = self.local.__dict__.setdefault("compressors", {})
+        compressor = compressors.get(level)
+        if compressor is None:
+            compressor = compressors[level] = zstandard.ZstdCompressor(level=level)
+        return compressor.compress(data)
+
+    def stream(self, level: int) -> StreamCompressor:
+        """Return incremental compressor."""
+        return ZstdStream(level)
+
+
+def get_codecs(encodings: t.Iterable[str]) -> dict[str, Codec]:
+    """Return codecs of encodings in preference order, codecs without installed library are skipped."""
+    available: dict[str, t.Callable[[], Codec]] = {GzipCodec.name: GzipCodec}
+    if brotli is not None:
+        available[BrotliCodec.name] = BrotliCodec
+    if zstandard is not None:
+        available[ZstdCodec.name] = ZstdCodec
+
+    codecs = {}
+    for encoding in encodings:
+        if encoding not in (GzipCodec.name, BrotliCodec.name, ZstdCodec.name):
+            raise ValueError(f"Unknown compression encoding: {encoding}")
+        if encoding in available:
+            codecs[encoding] = available[encoding]()
+    return codecs
+
+
+class ResponseCompressor:
+    """
+    Compress api responses with the best encoding accepted by the client.
+
+    Encodings are tried in the server preference order, brotli and zstd are used
+    only when their libraries are installed. Bodies shorter than `min_size` bytes are
+    sent as is, compressed small bodies are often larger and always slower.
+    Streamed responses are compressed chunk by chunk, each chunk is flushed.
+    """
+
+    def __init__(self, encodings: t.Iterable[str] = ("zstd", "br", "gzip"), min_size: int = 1024) -> None:
+        """Initialize compressor."""
+        self.codecs = get_codecs(encodings)
+        self.min_size = min_size
+        self.accepted: dict[str, Codec | None] = {}
+
+    def negotiate(self, accept_encoding: str) -> Codec | None:
+        """Return preferred codec accepted by the header, results are cached per header value."""
+        codec = self.accepted.get(accept_encoding, False)
+        if codec is not False:
+            return codec
+
+        qualities = {}
+        for item in accept_encoding.lower().split(","):
+            match = ENCODING_RE.fullmatch(item)
+            if match:
+                try:
+                    qualities[match[1]] = float(match[2]) if match[2] else 1.0
+                except ValueError:
+                    continue
+
+        wildcard = qualities.get("*", 0.0)
+        accepted = [
+            (quality, -position, codec)
+            for position, (name, codec) in enumerate(self.codecs.items())
+            if (quality := qualities.get(name, wildcard)) > 0
+        ]
+        codec = max(accepted, key=lambda item: item[:2])[2] if accepted else None
+
+        # clients send a handful of distinct values
+        if len(self.accepted) < 256:
+            self.accepted[accept_encoding] = codec
+        return codec
+
+    def compressible(self, response: HttpResponseBase) -> bool:
+        """Check whether response can be compressed."""
+        if response.has_header("Content-Encoding") or response.status_code in (204, 206, 304):
+            return False
+        if "no-transform" in response.get("Cache-Control", ""):
+            return False
+        return response.get("Content-Type", "").startswith(COMPRESSIBLE_TYPES)
+
+    def compress(self, request: HttpRequest, response: HttpResponseBase, level: int | None = None) -> HttpResponseBase:
+        """Compress response in place when the client accepts one of encodings."""
+        if not self.codecs or not self.compressible(response):
+            return response
+
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        # response depends on the header even when it is not compressed for this client
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        codec = self.negotiate(request.headers.get("Accept-Encoding", ""))
+        if codec is None:
+            return response
+
+        level = codec.get_level(level)
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self.acompress_stream(response.streaming_content, codec.stream(level))
+            else:
+                response.streaming_content = self.compress_stream(response.streaming_content, codec.stream(level))
+            del response.headers["Content-Length"]
+        else:
+            response.content = codec.compress(response.content, level)
+            response.headers["Content-Length"] = str(len(response.content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            # compressed body is not byte-equal to the uncompressed one
+            response.headers["ETag"] = "W/" + etag
+
+        response.headers["Content-Encoding"] = codec.name
+        return response
+
+    @staticmethod
+    def compress_stream(chunks: t.Iterable[bytes], stream: StreamCompressor) -> t.Iterator[bytes]:
+        """Compress chunks of streamed response."""
+        for chunk in chunks:
+            data = stream.compress(chunk)
+            if data:
+                yield data
+        yield stream.finish()
+
+    @staticmethod
+    async def acompress_stream(chunks: t.AsyncIterable[bytes], stream: StreamCompressor) -> t.AsyncIterator[bytes]:
+        """Compress chunks of asynchronous streamed response."""
+        async for chunk in chunks:
+            data = stream.compress(chunk)
+            if data:
+                yield data
+        yield stream.finish()
+
+
+class CompressedOperation:
+    """
+    Operation callback that compresses route responses with the api renderer compressor.
+
+    Level is applied to every negotiated codec, clamped to the codec range,
+    None uses codec default levels.
+    """
+
+    def __init__(self, level: int | None = None) -> None:
+        """Initialize route compression level."""
+        self.level = level
+
+    def __call__(self, operation: Operation) -> None:
+        """Wrap operation `run` to compress responses."""
+        run = operation.run
+        level = self.level
+
+        def get_compressor() -> ResponseCompressor | None:
+            # api is bound to the operation after it is created
+            return getattr(operation.api.renderer, "compression", None)
+
+        if is_async(operation.view_func):
+            async def async_run(request: HttpRequest, **kw: t.Any) -> HttpResponseBase:
+                response = await run(request, **kw)
+                compressor = get_compressor()
+                return response if compressor is None else compressor.compress(request, response, level)
+
+            operation.run = async_run
+            return
+
+        def sync_run(request: HttpRequest, **kw: t.Any) -> HttpResponseBase:
+            response = run(request, **kw)
+            compressor = get_compressor()
+            return response if compressor is None else compressor.compress(request, response, level)
+
+        operation.run = sync_run
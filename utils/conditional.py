@@ -0,0 +1,238 @@
+"""
+Conditional GET support with ETag and Last-Modified.
+"""
+import hashlib
+import typing as t
+import uuid
+from datetime import datetime
+from functools import wraps
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response, set_response_etag
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
+from ninja.operation import Operation as NinjaOperation
+from ninja.signature import is_async
+
+from utils.checks import require_shared_cache
+from utils.db_routing import is_sticky
+from utils.signals import post_bulk_create
+
+
+class ModelVersion:
+    """
+    Version tokens of model instances kept in Django cache.
+
+    Token changes when the instance is saved or bulk created and is dropped when it is deleted,
+    so it can be used as ETag source without loading the instance. Tokens are created only
+    after the view returned the instance, so missing rows don't get them, and expire after
+    `timeout` seconds. The cache must be shared by all workers.
+
+    Example:
+        ConditionalGet(etag=ModelVersion(User, kwarg="user_id"))
+    """
+
+    def __init__(
+        self,
+        model: type[Model],
+        kwarg: str = "pk",
+        cache_alias: str = "default",
+        timeout: int = 86400,
+    ) -> None:
+        """Initialize versions of model, kwarg is the view argument with primary key."""
+        self.model = model
+        self.kwarg = kwarg
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self.prefix = f"model-version:{model._meta.label_lower}"
+
+        require_shared_cache(cache_alias)
+
+        post_save.connect(self.bump, sender=model, weak=False)
+        post_delete.connect(self.forget, sender=model, weak=False)
+        post_bulk_create.connect(self.bump_many, sender=model, weak=False)
+
+    @property
+    def cache(self):
+        """Django cache backend."""
+        return caches[self.cache_alias]
+
+    def bump(self, sender: type[Model], instance: Model, **kwargs: t.Any) -> None:
+        """Change version of the instance when the transaction commits."""
+        key = f"{self.prefix}:{instance.pk}"
+        transaction.on_commit(lambda: self.cache.set(key, uuid.uuid4().hex, self.timeout))
+
+    def bump_many(self, sender: type[Model], objs: list[Model], **kwargs: t.Any) -> None:
+        """Change versions of bulk created instances when the transaction commits."""
+        keys = [f"{self.prefix}:{obj.pk}" for obj in objs]
+        transaction.on_commit(lambda: self.cache.set_many({key: uuid.uuid4().hex for key in keys}, self.timeout))
+
+    def forget(self, sender: type[Model], instance: Model, **kwargs: t.Any) -> None:
+        """Drop version of deleted instance when the transaction commits."""
+        key = f"{self.prefix}:{instance.pk}"
+        transaction.on_commit(lambda: self.cache.delete(key))
+
+    def get(self, pk: t.Any) -> str | None:
+        """Return version of the instance, None if it has no version yet."""
+        return self.cache.get(f"{self.prefix}:{pk}")
+
+    def add(self, pk: t.Any) -> str | None:
+        """Create version of loaded instance, None if other request or save created it meanwhile."""
+        version = uuid.uuid4().hex
+        if self.cache.add(f"{self.prefix}:{pk}", version, self.timeout):
+            return version
+        # the other version may belong to data changed after this request read it
+        return None
+
+    def __call__(self, request: HttpRequest, **kwargs: t.Any) -> str | None:
+        """ETag source function."""
+        return self.get(kwargs[self.kwarg])
+
+    def create(self, request: HttpRequest, **kwargs: t.Any) -> str | None:
+        """ETag source of successful response without version, see `ConditionalGet`."""
+        return self.add(kwargs[self.kwarg])
+
+
+class ConditionalGet:
+    """
+    Answer `If-None-Match` and `If-Modified-Since` with 304 Not Modified.
+
+    With `etag` or `last_modified` functions the check runs before the view, so unchanged
+    resources are not loaded at all. Functions are called with the request and view kwargs.
+    When `etag` returns None and has `create` method, it is called with the same arguments
+    after a successful response to create the ETag source, e.g. version of loaded instance.
+    Without them ETag is computed from the serialized response body. Clients that read
+    from primary after their write get full responses, validators may come from a lagging replica.
+    """
+
+    def __init__(
+        self,
+        etag: t.Callable[..., str | None] | None = None,
+        last_modified: t.Callable[..., datetime | None] | None = None,
+    ) -> None:
+        """Initialize conditional GET."""
+        self.etag = etag
+        self.last_modified = last_modified
+        self.operation: NinjaOperation | None = None
+        self.prefix = ""
+
+    def __call__(self, operation: NinjaOperation) -> None:
+        """Operation callback that binds conditional GET to the route."""
+        self.operation = operation
+
+    def make_etag(self, source: str | None) -> str | None:
+        """Return quoted ETag of the source."""
+        if source is None:
+            return None
+        # the same resource has different representations per route and language
+        digest = hashlib.sha256(f"{self.prefix}:{get_language()}:{source}".encode()).hexdigest()
+        return quote_etag(digest[:32])
+
+    @staticmethod
+    def get_view_kwargs(kwargs: dict) -> dict:
+        """Return view kwargs passed to validator functions."""
+        return {key: value for key, value in kwargs.items() if key != "request"}
+
+    def get_validators(self, request: HttpRequest, kwargs: dict) -> tuple[str | None, int | None]:
+        """Return ETag and Last-Modified timestamp from validator functions."""
+        etag = None
+        if self.etag is not None:
+            etag = self.make_etag(self.etag(request, **kwargs))
+
+        last_modified = None
+        if self.last_modified is not None:
+            modified = self.last_modified(request, **kwargs)
+            if modified is not None:
+                last_modified = int(modified.timestamp())
+
+        return etag, last_modified
+
+    def precondition(self, controller: t.Any, kwargs: dict) -> tuple[HttpResponseBase | None, str | None, int | None]:
+        """Check validators before the view, return 304 response when resource is not modified."""
+        if self.etag is None and self.last_modified is None:
+            return None, None, None
+
+        request = controller.context.request
+        etag, last_modified = self.get_validators(request, self.get_view_kwargs(kwargs))
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            self.set_validators(response, etag, last_modified)
+        return response, etag, last_modified
+
+    @staticmethod
+    def set_validators(response: HttpResponseBase, etag: str | None, last_modified: int | None) -> None:
+        """Set ETag and Last-Modified headers."""
+        if etag is not None:
+            response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+
+    def finalize(
+        self,
+        controller: t.Any,
+        result: t.Any,
+        etag: str | None,
+        last_modified: int | None,
+        kwargs: dict,
+    ) -> HttpResponseBase:
+        """Serialize view result, set validators and answer conditional request."""
+        request = controller.context.request
+        response = NinjaOperation._result_to_response(self.operation, request, result, controller.context.response)
+
+        if response.streaming or not 200 <= response.status_code < 300:
+            return response
+
+        create = getattr(self.etag, "create", None)
+        if etag is None and create is not None:
+            etag = self.make_etag(create(request, **self.get_view_kwargs(kwargs)))
+
+        if etag is None and last_modified is None:
+            response = set_response_etag(response)
+        else:
+            self.set_validators(response, etag, last_modified)
+
+        return get_conditional_response(
+            request,
+            etag=response.get("ETag"),
+            last_modified=last_modified,
+            response=response,
+        )
+
+    def wrap_view(self, view_func: t.Callable) -> t.Callable:
+        """Wrap controller view to answer conditional requests."""
+        self.prefix = f"{view_func.__module__}.{view_func.__qualname__}"
+
+        if is_async(view_func):
+            @wraps(view_func)
+            async def async_wrapper(controller, *args, **kwargs):
+                if is_sticky(controller.context.request):
+                    return await view_func(controller, *args, **kwargs)
+
+                response, etag, last_modified = self.precondition(controller, kwargs)
+                if response is not None:
+                    return response
+
+                result = await view_func(controller, *args, **kwargs)
+                return self.finalize(controller, result, etag, last_modified, kwargs)
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(controller, *args, **kwargs):
+            if is_sticky(controller.context.request):
+                return view_func(controller, *args, **kwargs)
+
+            response, etag, last_modified = self.precondition(controller, kwargs)
+            if response is not None:
+                return response
+
+            result = view_func(controller, *args, **kwargs)
+            return self.finalize(controller, result, etag, last_modified, kwargs)
+
+        return wrapper
@@ -0,0 +1,210 @@
+"""
+Per-worker database connection pools with health checks and wait time metrics.
+"""
+import logging
+import os
+import threading
+import typing as t
+from collections import deque
+from time import monotonic
+
+from utils.metrics import DB_POOL_WAIT_SECONDS, MetricsSink
+
+logger = logging.getLogger(__name__)
+
+# sink of pool wait times, set by api configuration
+metrics: MetricsSink | None = None
+
+
+class PoolTimeout(Exception):
+    """No connection of the pool was released within the pool timeout."""
+
+
+class ConnectionPool:
+    """
+    Bounded pool of DB-API connections of a single worker process.
+
+    Up to `max_size` connections are opened, when all of them are in use `acquire` waits
+    up to `timeout` seconds for a released one and raises `PoolTimeout`. Connections are
+    closed after `max_lifetime` seconds since they were opened or `max_idle` seconds
+    in the pool, with `health_checks` every connection is checked before it is handed out.
+    """
+
+    def __init__(
+        self,
+        connect: t.Callable[[], t.Any],
+        name: str = "default",
+        max_size: int = 10,
+        timeout: float = 5.0,
+        max_lifetime: float = 1800.0,
+        max_idle: float = 300.0,
+        health_checks: bool = True,
+    ) -> None:
+        """Initialize empty pool, connections are opened on demand."""
+        if max_size < 1:
+            raise ValueError("Pool max_size must be a positive number")
+
+        self.connect = connect
+        self.name = name
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.health_checks = health_checks
+        self.condition = threading.Condition()
+        # released connections with time they were released, the last released one is reused first
+        self.idle: deque[tuple[t.Any, float]] = deque()
+        # id of connection -> time it was opened, for idle and acquired connections
+        self.opened_at: dict[int, float] = {}
+        # number of connections being opened outside of the lock
+        self.opening = 0
+
+    @property
+    def size(self) -> int:
+        """Return number of open connections, including ones being opened."""
+        return len(self.opened_at) + self.opening
+
+    def acquire(self) -> t.Any:
+        """Return idle or new connection, wait for released one when the pool is full."""
+        start = monotonic()
+        deadline = start + self.timeout
+
+        while True:
+            connection = self.checkout(start, deadline)
+            if connection is None:
+                connection = self.open()
+                break
+
+            if not self.health_checks or self.check(connection):
+                break
+
+            with self.condition:
+                self.discard(connection)
+
+        self.record_wait(start)
+        return connection
+
+    def checkout(self, start: float, deadline: float) -> t.Any:
+        """Return idle connection, or None after reserving a slot for new one."""
+        with self.condition:
+            while True:
+                now = monotonic()
+                while self.idle:
+                    connection, released_at = self.idle.pop()
+                    if not self.expired(connection, released_at, now):
+                        return connection
+                    self.discard(connection)
+
+                if self.size < self.max_size:
+                    self.opening += 1
+                    return None
+
+                if now >= deadline:
+                    self.record_wait(start)
+                    raise PoolTimeout(
+                        f"No connection of {self.name!r} pool was released in {self.timeout}s, "
+                        f"all {self.max_size} connections are in use"
+                    )
+
+                self.condition.wait(deadline - now)
+
+    def open(self) -> t.Any:
+        """Open connection in the reserved slot, outside of the lock."""
+        try:
+            connection = self.connect()
+        except BaseException:
+            with self.condition:
+                self.opening -= 1
+                self.condition.notify()
+            raise
+
+        with self.condition:
+            self.opening -= 1
+            self.opened_at[id(connection)] = monotonic()
+        return connection
+
+    def release(self, connection: t.Any) -> None:
+        """Return connection to the pool, expired ones are closed."""
+        with self.condition:
+            if id(connection) not in self.opened_at:
+                # opened by a previous pool, e.g. before fork
+                self.close(connection)
+                return
+
+            now = monotonic()
+            if self.expired(connection, now, now):
+                self.discard(connection)
+            else:
+                self.idle.append((connection, now))
+            self.condition.notify()
+
+    def expired(self, connection: t.Any, released_at: float, now: float) -> bool:
+        """Check whether connection is over its lifetime or idle time."""
+        return (
+            now - self.opened_at[id(connection)] >= self.max_lifetime
+            or now - released_at >= self.max_idle
+        )
+
+    def discard(self, connection: t.Any) -> None:
+        """Close connection and free its slot, must be called with the lock held."""
+        self.opened_at.pop(id(connection), None)
+        self.close(connection)
+        self.condition.notify()
+
+    @staticmethod
+    def check(connection: t.Any) -> bool:
+        """Check that connection is usable."""
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            logger.warning("Closing broken pooled connection", exc_info=True)
+            return False
+
+    @staticmethod
+    def close(connection: t.Any) -> None:
+        """Close connection ignoring errors, it is dropped anyway."""
+        try:
+            connection.close()
+        except Exception:
+            logger.debug("Failed to close pooled connection", exc_info=True)
+
+    def record_wait(self, start: float) -> None:
+        """Record time spent waiting for connection."""
+        if metrics is not None:
+            metrics.observe(DB_POOL_WAIT_SECONDS, (("database", self.name),), monotonic() - start)
+
+    def close_all(self) -> None:
+        """Close idle connections, acquired ones are closed when released."""
+        with self.condition:
+            while self.idle:
+                self.discard(self.idle.pop()[0])
+
+
+# (alias, database name, options) -> pool of the current process
+pools: dict[tuple, ConnectionPool] = {}
+pools_lock = threading.Lock()
+
+
+def get_pool(alias: str, database: str, options: dict, connect: t.Callable[[], t.Any]) -> ConnectionPool:
+    """Return pool of the database, settings changes (e.g. test database) get a new pool."""
+    key = (alias, database, tuple(sorted(options.items())))
+    pool = pools.get(key)
+    if pool is None:
+        with pools_lock:
+            pool = pools.get(key)
+            if pool is None:
+                pool = pools[key] = ConnectionPool(connect, name=alias, **options)
+    return pool
+
+
+def forget_pools() -> None:
+    """Drop pools inherited from the parent process, every worker opens its own connections."""
+    pools.clear()
+
+
+os.register_at_fork(after_in_child=forget_pools)
@@ -0,0 +1,237 @@
+"""
+Read replica routing of safe api routes.
+"""
+import logging
+import time
+import typing as t
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+from django.db.backends.signals import connection_created
+from django.db.models import Model
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from django.utils.deprecation import MiddlewareMixin
+from ninja.operation import Operation
+from ninja.signature import is_async
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+# cookie of clients that wrote recently, their reads go to primary until it expires
+STICKY_COOKIE = "api_read_primary"
+
+# alias -> monotonic time until which reads of the replica go to primary after its error
+unavailable_until: dict[str, float] = {}
+
+
+class ReadState:
+    """Replica alias used for reads of the current request."""
+
+    __slots__ = ("alias", "error")
+
+    def __init__(self, alias: str) -> None:
+        """Initialize state of replica reads."""
+        self.alias = alias
+        self.error: DatabaseError | None = None
+
+    @property
+    def failed(self) -> bool:
+        """Check whether replica read failed."""
+        return self.error is not None
+
+
+# replica reads of the current request, copied into sync_to_async threads
+current_read: ContextVar[ReadState | None] = ContextVar("current_read", default=None)
+
+
+def mark_failed(exc: BaseException) -> None:
+    """Mark replica reads of the current request as failed on database error."""
+    state = current_read.get()
+    if state is not None and not state.failed and isinstance(exc, DatabaseError):
+        state.error = exc
+
+
+def detect_replica_error(execute: t.Callable, sql: str, params: t.Any, many: bool, context: dict) -> t.Any:
+    """Database execute wrapper that marks replica reads as failed, e.g. on lagging schema."""
+    try:
+        return execute(sql, params, many, context)
+    except DatabaseError as exc:
+        state = current_read.get()
+        if state is not None and context["connection"].alias == state.alias:
+            mark_failed(exc)
+        raise
+
+
+def is_sticky(request: HttpRequest) -> bool:
+    """Check whether reads of the client go to primary after its recent write."""
+    return STICKY_COOKIE in request.COOKIES
+
+
+def install_error_detector(sender: t.Any, connection: t.Any, **kwargs: t.Any) -> None:
+    """Add replica error detector to every new database connection."""
+    if detect_replica_error not in connection.execute_wrappers:
+        connection.execute_wrappers.append(detect_replica_error)
+
+
+class ReplicaRouter:
+    """
+    Database router that sends reads of replica routes to their replica.
+
+    Reads outside of replica routes and all writes go to the default database,
+    including saves of instances loaded from the replica.
+    """
+
+    def db_for_read(self, model: type[Model], **hints: t.Any) -> str | None:
+        """Return replica alias inside replica routes that didn't fail."""
+        state = current_read.get()
+        if state is None or state.failed:
+            return DEFAULT_DB_ALIAS
+        return state.alias
+
+    def db_for_write(self, model: type[Model], **hints: t.Any) -> str | None:
+        """Return primary alias."""
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: t.Any) -> bool | None:
+        """Allow relations between primary and replica instances, they have the same data."""
+        return True
+
+
+class ReadReplica:
+    """
+    Operation callback that reads data of safe routes from replica.
+
+    Clients with the cookie of `StickyWritesMiddleware` read from primary, so they see
+    their writes despite replication lag. When a replica read fails, the request is run
+    again on primary and the replica is skipped for `cooldown` seconds.
+    Rows of streamed responses are read after the route returns, from primary.
+    """
+
+    def __init__(self, alias: str, cooldown: float = 30.0) -> None:
+        """Initialize replica routing and connect error detector."""
+        self.alias = alias
+        self.cooldown = cooldown
+
+        connection_created.connect(install_error_detector, dispatch_uid="utils.db_routing")
+
+    def use_replica(self, request: HttpRequest) -> bool:
+        """Check whether reads of the request can go to replica."""
+        if is_sticky(request):
+            return False
+        return time.monotonic() >= unavailable_until.get(self.alias, 0.0)
+
+    def fail(self, operation: Operation, request: HttpRequest, state: ReadState) -> None:
+        """Skip replica for cooldown after its error."""
+        unavailable_until[self.alias] = time.monotonic() + self.cooldown
+        logger.warning(
+            "Replica %s failed in %s %s, reading from primary for %ss",
+            self.alias,
+            request.method,
+            request.path,
+            self.cooldown,
+            exc_info=state.error,
+            extra={"route": operation.view_func.__qualname__, "database": self.alias},
+        )
+
+    def wrap_view(self, view_func: t.Callable) -> t.Callable:
+        """Wrap view function to detect replica connection errors that don't reach query execution."""
+        if is_async(view_func):
+            @wraps(view_func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await view_func(*args, **kwargs)
+                except DatabaseError as exc:
+                    mark_failed(exc)
+                    raise
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            try:
+                return view_func(*args, **kwargs)
+            except DatabaseError as exc:
+                mark_failed(exc)
+                raise
+
+        return wrapper
+
+    def __call__(self, operation: Operation) -> None:
+        """Operation callback that wraps `run` of safe route to read from replica."""
+        if not SAFE_METHODS.issuperset(operation.methods):
+            raise ValueError("ReadReplica is supported only for safe routes")
+
+        run = operation.run
+
+        if is_async(operation.view_func):
+            async def async_run(request: HttpRequest, **kw: t.Any) -> HttpResponseBase:
+                if not self.use_replica(request):
+                    return await run(request, **kw)
+
+                state = ReadState(self.alias)
+                token = current_read.set(state)
+                try:
+                    response = await run(request, **kw)
+                except Exception:
+                    if not state.failed:
+                        raise
+                finally:
+                    current_read.reset(token)
+
+                if state.failed:
+                    self.fail(operation, request, state)
+                    response = await run(request, **kw)
+                return response
+
+            operation.run = async_run
+            return
+
+        def sync_run(request: HttpRequest, **kw: t.Any) -> HttpResponseBase:
+            if not self.use_replica(request):
+                return run(request, **kw)
+
+            state = ReadState(self.alias)
+            token = current_read.set(state)
+            try:
+                response = run(request, **kw)
+            except Exception:
+                if not state.failed:
+                    raise
+            finally:
+                current_read.reset(token)
+
+            if state.failed:
+                self.fail(operation, request, state)
+                response = run(request, **kw)
+            return response
+
+        operation.run = sync_run
+
+
+class StickyWritesMiddleware(MiddlewareMixin):
+    """
+    Send reads of a client to primary for a few seconds after its write.
+
+    Successful responses of unsafe requests set a cookie that `ReadReplica` routes check,
+    it expires after `API_READ_REPLICA_STICKY_SECONDS`. The middleware is not used
+    when `API_READ_REPLICA` setting is not set.
+    """
+
+    def __init__(self, get_response: t.Callable) -> None:
+        """Initialize middleware, it is skipped without read replica."""
+        if getattr(settings, "API_READ_REPLICA", None) is None:
+            raise MiddlewareNotUsed
+
+        super().__init__(get_response)
+        self.sticky_seconds = getattr(settings, "API_READ_REPLICA_STICKY_SECONDS", 5)
+
+    def process_response(self, request: HttpRequest, response: HttpResponseBase) -> HttpResponseBase:
+        """Set the cookie on successful response of unsafe request."""
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(STICKY_COOKIE, "1", max_age=self.sticky_seconds, httponly=True, samesite="Lax")
+        return response
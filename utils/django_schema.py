@@ -2,11 +2,64 @@
 Base django schema.
 """
 
-import json
-from typing import Any
+import sys
+from functools import cache
+from typing import Any, Iterable
 
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Manager, Model, QuerySet
 from humps.main import camelize
 from ninja import Schema
+from pydantic import TypeAdapter
+
+from utils.examples_generator import freeze
+from utils.query_projection import QueryProjection, get_projection
+
+# ref prefixes of pydantic v1 and v2 definitions
+DEFINITIONS_REFS = ("#/definitions/", "#/$defs/")
+COMPONENTS_REF = "#/components/schemas/"
+
+
+@cache
+def camelize_alias(name: str) -> str:
+    """Return interned camelCase alias, shared by all schema classes."""
+    return sys.intern(camelize(name))
+
+
+def rewrite_refs(value: Any) -> Any:
+    """Recursively copy json schema with definition refs pointing to OpenAPI components."""
+    if isinstance(value, dict):
+        result = {key: rewrite_refs(item) for key, item in value.items()}
+        ref = result.get("$ref")
+        if isinstance(ref, str) and ref.startswith(DEFINITIONS_REFS):
+            result["$ref"] = COMPONENTS_REF + ref.split("/", 2)[2]
+        return result
+
+    if isinstance(value, list):
+        return [rewrite_refs(item) for item in value]
+
+    return value
+
+
+@cache
+def get_async_schema(schema_class: type[Schema]) -> dict:
+    """Return cached json schema of schema class without definitions."""
+    schema = schema_class.model_json_schema()
+    schema.pop("definitions", None)
+    schema.pop("$defs", None)
+    return freeze(rewrite_refs(schema))
+
+
+@cache
+def get_list_adapter(schema_class: type[Schema]) -> TypeAdapter:
+    """Return cached type adapter for list of schema objects."""
+    return TypeAdapter(list[schema_class])
+
+
+@cache
+def get_values_fields(schema_class: type["DjangoSchema"], model: type[Model]) -> list[str] | None:
+    """Cached `DjangoSchema.values_fields` result per schema and model."""
+    return schema_class.values_fields(model)
 
 
 class DjangoSchema(Schema):
@@ -20,7 +73,7 @@ class DjangoSchema(Schema):
         """
 
         from_attributes = True
-        alias_generator = camelize
+        alias_generator = camelize_alias
         populate_by_name = True
         str_strip_whitespace = True  # remove whitespaces from strings
 
@@ -98,13 +151,102 @@ class DjangoSchema(Schema):
         [obj.adjust(**kwargs) for obj in objs]
         return objs
 
+    @classmethod
+    def compute_batch(cls, objs: list["DjangoSchema"]) -> None:
+        """
+        Compute fields for the whole batch.
+
+        Override to compute derived fields with a single query or vectorized call.
+        """
+        if cls.compute is DjangoSchema.compute:
+            return
+
+        for obj in objs:
+            obj.compute()
+
+    @classmethod
+    def adjust_batch(cls, objs: list["DjangoSchema"], **kwargs) -> None:
+        """Adjust fields for the whole batch."""
+        for obj in objs:
+            obj.adjust(**kwargs)
+
+    @classmethod
+    def values_fields(cls, model: type[Model]) -> list[str] | None:
+        """
+        Return model columns to build schema from `.values()` rows.
+
+        None is returned when schema can't be built from plain column values:
+        it has resolvers, relations, explicit aliases or fields that are not model columns.
+        """
+        if cls._ninja_resolvers:
+            return None
+
+        fields: list[str] = []
+        for name, field in cls.model_fields.items():
+            # aliases from alias generator have priority 1, explicit ones are greater
+            if (field.alias_priority or 0) > 1:
+                return None
+
+            try:
+                model_field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                model_field = None
+
+            if model_field is None or not model_field.concrete or model_field.is_relation:
+                if field.is_required():
+                    return None
+                continue
+
+            fields.append(name)
+
+        return fields
+
+    @classmethod
+    def from_batch(cls, objs: QuerySet | Iterable[Any], chunk_size: int = 2000) -> list:
+        """
+        Create schemas from queryset or list of objects in a single validation pass.
+
+        Querysets are read with `.values()` when the schema allows it, otherwise
+        model instances are used, in both cases rows are fetched with `.iterator()`.
+        """
+        if isinstance(objs, QuerySet):
+            fields = get_values_fields(cls, objs.model)
+            if fields is not None:
+                objs = objs.values(*fields)
+            objs = objs.iterator(chunk_size=chunk_size)
+
+        objs = get_list_adapter(cls).validate_python(list(objs), from_attributes=True)
+        cls.compute_batch(objs)
+        return objs
+
+    @classmethod
+    def from_batch_adjusted(cls, objs: QuerySet | Iterable[Any], chunk_size: int = 2000, **kwargs) -> list:
+        """Create schemas in a single validation pass and adjust them."""
+        objs = cls.from_batch(objs, chunk_size=chunk_size)
+        cls.adjust_batch(objs, **kwargs)
+        return objs
+
+    @classmethod
+    def get_projection(cls, model: type[Model]) -> QueryProjection:
+        """Return model columns and relations read by the schema, including nested schemas."""
+        return get_projection(cls, model)
+
+    @classmethod
+    def project(cls, queryset: QuerySet | Manager) -> QuerySet:
+        """
+        Load only columns read by the schema, with select_related/prefetch_related for nested schemas.
+
+        Example:
+            user = UserResponseBaseSchema.project(User.objects).get(id=user_id)
+        """
+        model = queryset.model
+        return get_projection(cls, model).apply(queryset)
+
     @classmethod
     def async_schema(cls, **kwargs):
         """
         Return async schema.
+
+        The schema is cached per class and shared, copy it before changing.
         """
-        schema = cls.schema()
-        schema.pop("definitions", None)
-        schema_str = json.dumps(schema)
-        schema_str = schema_str.replace("#/definitions/", "#/components/schemas/")
-        return json.loads(schema_str)
+        return get_async_schema(cls)
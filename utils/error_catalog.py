@@ -0,0 +1,131 @@
+"""
+Catalog of api error codes compiled at startup.
+"""
+import json
+import typing as t
+from types import MappingProxyType
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import Promise
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from utils.base_exceptions import DefaultHTTPException
+
+
+class ErrorEntry(t.NamedTuple):
+    """Catalog entry with precomputed OpenAPI example and response envelope of the default raise."""
+
+    exception: type["DefaultHTTPException"]
+    code: str
+    status_code: int
+    example: dict
+    data: dict
+
+
+class ErrorCatalog:
+    """
+    Registry of `DefaultHTTPException` subclasses by error code.
+
+    Classes that define `error` are registered when they are created, subclasses that
+    inherit the code are variants of the registered class. Duplicate codes fail at import.
+    The catalog is frozen when apps are ready, `api_errors` modules of installed apps
+    are imported before it, classes created later are rejected.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty catalog."""
+        self._classes: dict[str, type["DefaultHTTPException"]] = {}
+        self._entries: t.Mapping[str, ErrorEntry] = {}
+        self._by_class: t.Mapping[type, ErrorEntry] = {}
+        self.frozen = False
+
+    def register(self, exception: type["DefaultHTTPException"]) -> None:
+        """Add exception class to the catalog."""
+        code = exception.error
+        name = f"{exception.__module__}.{exception.__qualname__}"
+
+        if self.frozen:
+            raise ImproperlyConfigured(
+                f"{name} is created after the error catalog was frozen, define it in an api_errors module"
+            )
+
+        registered = self._classes.get(code)
+        if registered is not None:
+            raise ImproperlyConfigured(
+                f"Error code {code} of {name} is already used by "
+                f"{registered.__module__}.{registered.__qualname__}"
+            )
+
+        self._classes[code] = exception
+
+    def freeze(self) -> None:
+        """Precompute examples and envelopes and make the catalog read-only."""
+        from utils.error_responses import build_error_data
+        from utils.examples_generator import freeze
+
+        entries = {}
+        for code, exception in self._classes.items():
+            instance = exception()
+            entries[code] = ErrorEntry(
+                exception=exception,
+                code=code,
+                status_code=exception.status_code,
+                example=freeze(instance.example()),
+                data=freeze(build_error_data(instance)),
+            )
+
+        self._entries = MappingProxyType(entries)
+        self._by_class = MappingProxyType({entry.exception: entry for entry in entries.values()})
+        self.frozen = True
+
+    def __getitem__(self, code: str) -> ErrorEntry:
+        """Return entry of the error code."""
+        return self._entries[code]
+
+    def __contains__(self, code: object) -> bool:
+        """Check whether error code is in the catalog."""
+        return code in self._entries
+
+    def __iter__(self) -> t.Iterator[ErrorEntry]:
+        """Iterate over entries ordered by error code."""
+        return iter(sorted(self._entries.values(), key=lambda entry: entry.code))
+
+    def __len__(self) -> int:
+        """Return number of error codes."""
+        return len(self._entries)
+
+    def get(self, code: str) -> ErrorEntry | None:
+        """Return entry of the error code, None for unknown codes."""
+        return self._entries.get(code)
+
+    def get_entry(self, exception: type) -> ErrorEntry | None:
+        """Return entry of the exception class, None before the catalog is frozen or for variants."""
+        return self._by_class.get(exception)
+
+    def export(self) -> dict:
+        """Return catalog for client SDKs, messages are translated to the active language."""
+        return {
+            "errors": [
+                {
+                    "code": entry.code,
+                    "status": entry.status_code,
+                    "message": entry.data["error"]["details"]["message"],
+                    "field": entry.data["error"]["details"].get("field"),
+                    "example": entry.example["value"],
+                }
+                for entry in self
+            ]
+        }
+
+    def dumps(self) -> str:
+        """Serialize exported catalog to JSON."""
+        return json.dumps(
+            self.export(),
+            default=lambda value: str(value) if isinstance(value, Promise) else repr(value),
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+# catalog of all api errors, frozen by UtilsConfig.ready
+error_catalog = ErrorCatalog()
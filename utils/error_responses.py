@@ -0,0 +1,74 @@
+"""
+Pre-serialized error response bodies.
+"""
+from django.utils import translation
+from django.utils.functional import Promise
+
+from utils.base_exceptions import DefaultHTTPException
+from utils.error_catalog import error_catalog
+from utils.json_encoders import JSONEncoderBackend, get_encoder
+
+
+def build_error_data(exc: DefaultHTTPException) -> dict:
+    """Build the response envelope for the given exception."""
+    # prepare default details
+    details: dict = {
+        "message": exc.message
+    }
+
+    if exc.field:
+        details["field"] = exc.field
+
+    return {
+        "status": exc.status_code,
+        "error": {
+            "code": exc.error,
+            "details": details
+        }
+    }
+
+
+class ErrorResponseRegistry:
+    """
+    Registry with serialized bodies of DefaultHTTPException subclasses.
+
+    The default body of each exception class is serialized once, or once per active language
+    for translatable messages, from the envelope precomputed in the error catalog.
+    Exceptions raised with custom message or field are serialized on every call.
+    """
+
+    def __init__(self, encoder: JSONEncoderBackend | None = None) -> None:
+        """Initialize empty registry."""
+        self.encoder = encoder or get_encoder()
+        self._bodies: dict[tuple[type, str | None], bytes] = {}
+
+    def serialize(self, exc: DefaultHTTPException) -> bytes:
+        """Serialize exception response envelope to bytes."""
+        return self.encoder.dumps(build_error_data(exc))
+
+    @staticmethod
+    def is_default(exc: DefaultHTTPException) -> bool:
+        """Check whether exception was raised without custom message and field."""
+        exc_class = type(exc)
+        return exc.message is exc_class.message and exc.field is exc_class.field
+
+    def get_body(self, exc: DefaultHTTPException) -> bytes:
+        """Return serialized body for the exception."""
+        if not self.is_default(exc):
+            return self.serialize(exc)
+
+        # only lazy messages depend on the language, looking it up is not free
+        language = translation.get_language() if isinstance(exc.message, Promise) else None
+        key = (type(exc), language)
+        body = self._bodies.get(key)
+
+        if body is None:
+            entry = error_catalog.get_entry(key[0])
+            data = entry.data if entry is not None else build_error_data(exc)
+            body = self._bodies[key] = self.encoder.dumps(data)
+
+        return body
+
+    def clear(self) -> None:
+        """Drop all cached bodies."""
+        self._bodies.clear()
@@ -1,18 +1,83 @@
 """Examples exception generator."""
-from typing import Type
+from copy import deepcopy
+from typing import Any, Type
 from ninja_extra import status
 
-from utils.base_exceptions import UnauthorizedException, InvalidCredentialsException, DefaultHTTPException
+from utils.base_exceptions import (
+    DefaultHTTPException,
+    InvalidCredentialsException,
+    NotAuthenticatedException,
+    UnauthorizedException,
+)
+from utils.error_catalog import error_catalog
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict for examples shared between endpoints.
+
+    Copies are regular mutable dicts.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Shared OpenAPI examples are read-only, copy them before changing.")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        from copy import deepcopy
+
+        return {key: deepcopy(value, memo) for key, value in self.items()}
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDict."""
+    if isinstance(value, dict) and not isinstance(value, FrozenDict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    return value
 
 
 class ExamplesGenerator:
-    """Class to generate the examples for the OpenAPI docs."""
+    """
+    Class to generate the examples for the OpenAPI docs.
+
+    Responses are memoized by the set of exception classes and the auth flag,
+    so endpoints with the same errors share the same read-only example structures.
+    """
 
     auth_error = (
         UnauthorizedException,
         InvalidCredentialsException,
+        NotAuthenticatedException,
     )
 
+    validation_422_example = freeze(
+        {
+            "summary": "VALIDATION_ERROR",
+            "value": {
+                "status": 422,
+                "error": {
+                    "code": "VALIDATION_ERROR",
+                    "details": [
+                        {
+                            "location": "string",
+                            "field": "string",
+                            "field_full": "string",
+                            "message": "string",
+                        }
+                    ],
+                },
+            },
+        }
+    )
+
+    _examples: dict[Type[DefaultHTTPException], dict] = {}
+    _responses: dict[tuple[frozenset, bool], FrozenDict] = {}
+
     @staticmethod
     def generate_nested_schema_for_code(responses, error_code):
         """Generate the nested schema for the given error code."""
@@ -27,6 +92,21 @@ class ExamplesGenerator:
         auth: bool = False,
     ) -> dict:
         """Generate the error responses for the OpenAPI docs."""
+        key = (frozenset(args), auth)
+        responses = cls._responses.get(key)
+
+        if responses is None:
+            responses = cls._responses[key] = freeze(cls.build_responses(*args, auth=auth))
+
+        return {"responses": dict(responses)}
+
+    @classmethod
+    def build_responses(
+        cls,
+        *args: Type[DefaultHTTPException],
+        auth: bool = False,
+    ) -> dict:
+        """Build the error responses without memoization."""
         responses: dict = {}
 
         if auth:
@@ -36,18 +116,52 @@ class ExamplesGenerator:
 
         for error_code in error_codes:
             examples = {}
+            headers = {}
 
             for error in args:
-                instance = error()  # noqa
-                if instance.status_code == error_code:
-                    examples[instance.error] = instance.example()
+                if error.status_code == error_code:
+                    examples[error.error] = cls.get_example(error)
+                    headers.update(error.openapi_headers or {})
 
             cls.generate_nested_schema_for_code(responses, error_code)
             responses[error_code]["content"]["application/json"]["examples"] = examples
+            if headers:
+                responses[error_code]["headers"] = headers
 
         cls.validation_error_schema(responses)
 
-        return {"responses": responses}
+        return responses
+
+    @classmethod
+    def extend_examples(cls, openapi_extra: dict | None, *args: Type[DefaultHTTPException]) -> dict:
+        """Return copy of openapi_extra with examples of the exceptions added to its responses."""
+        openapi_extra = dict(openapi_extra or {})
+        responses = deepcopy(openapi_extra.get("responses", {}))
+
+        for error in args:
+            response = responses.setdefault(error.status_code, {})
+            examples = response.setdefault("content", {}).setdefault("application/json", {}).setdefault("examples", {})
+            examples[error.error] = cls.get_example(error)
+            if error.openapi_headers:
+                response.setdefault("headers", {}).update(error.openapi_headers)
+
+        openapi_extra["responses"] = responses
+        return openapi_extra
+
+    @classmethod
+    def get_example(cls, error: Type[DefaultHTTPException]) -> dict:
+        """Return the example precomputed in the error catalog or memoized one."""
+        entry = error_catalog.get_entry(error)
+        if entry is not None:
+            return entry.example
+
+        example = cls._examples.get(error)
+
+        if example is None:
+            instance = error()  # noqa
+            example = cls._examples[error] = freeze(instance.example())
+
+        return example
 
     @classmethod
     def validation_error_schema(cls, responses):
@@ -56,26 +170,15 @@ class ExamplesGenerator:
         if not responses.get(status.HTTP_422_UNPROCESSABLE_ENTITY):
             cls.generate_nested_schema_for_code(responses, status.HTTP_422_UNPROCESSABLE_ENTITY)
 
-        validation_422_example = {
-            "summary": "VALIDATION_ERROR",
-            "value": {
-                "status": 422,
-                "error": {
-                    "code": "VALIDATION_ERROR",
-                    "details": [
-                        {
-                            "location": "string",
-                            "field": "string",
-                            "field_full": "string",
-                            "message": "string",
-                        }
-                    ],
-                },
-            },
-        }
         responses[status.HTTP_422_UNPROCESSABLE_ENTITY]["content"]["application/json"].setdefault("examples", {})[
             "VALIDATION_ERROR"
-        ] = validation_422_example
+        ] = cls.validation_422_example
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """Clear memoized examples and responses."""
+        cls._examples.clear()
+        cls._responses.clear()
 
 
 generate_examples = ExamplesGenerator.generate_examples
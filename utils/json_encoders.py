@@ -0,0 +1,136 @@
+"""
+Pluggable JSON encoder backends.
+"""
+import abc
+import json
+import logging
+from typing import Any
+
+from django.conf import settings
+from django.utils.functional import Promise
+from ninja.responses import NinjaJSONEncoder
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+
+def default(obj: Any) -> Any:
+    """
+    Convert objects that are not natively supported by the encoder.
+
+    Lazy translation strings are resolved in the active language, everything else
+    is converted the same way as ninja does it for stdlib json.
+    """
+    if isinstance(obj, Promise):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    return NinjaJSONEncoder().default(obj)
+
+
+class JSONEncoderBackend(abc.ABC):
+    """
+    Base class for JSON encoder backends.
+    """
+
+    name: str
+
+    @abc.abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        """Serialize data to JSON bytes."""
+        ...
+
+
+class StdlibJSONEncoder(JSONEncoderBackend):
+    """
+    Encoder based on stdlib json with ninja JSON encoder.
+    """
+
+    name = "json"
+
+    def dumps(self, data: Any) -> bytes:
+        """Serialize data to JSON bytes."""
+        return json.dumps(data, cls=NinjaJSONEncoder).encode()
+
+
+class OrjsonEncoder(JSONEncoderBackend):
+    """
+    Encoder based on orjson.
+
+    Datetimes are passed through to the default hook to keep the same format as stdlib json.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        """Initialize encoder options."""
+        self.option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, data: Any) -> bytes:
+        """Serialize data to JSON bytes."""
+        return orjson.dumps(data, default=default, option=self.option)
+
+
+class MsgspecEncoder(JSONEncoderBackend):
+    """
+    Encoder based on msgspec.
+
+    msgspec encodes dates and times natively and has no way to pass them to the hook, so
+    the output differs from stdlib json: datetimes and times keep microseconds instead of
+    milliseconds (e.g. "2024-01-02T03:04:05.123456Z", not "2024-01-02T03:04:05.123Z") and
+    timedeltas are ISO 8601 durations without zero parts ("P1DT5S", not "P1DT00H00M05S").
+    Other values, including lazy strings, decimals and UUIDs, are encoded the same way.
+    """
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        """Initialize msgspec encoder."""
+        self.encoder = msgspec.json.Encoder(enc_hook=default)
+
+    def dumps(self, data: Any) -> bytes:
+        """Serialize data to JSON bytes."""
+        return self.encoder.encode(data)
+
+
+# available backends in order of preference
+ENCODER_BACKENDS: dict[str, tuple[type[JSONEncoderBackend], Any]] = {
+    OrjsonEncoder.name: (OrjsonEncoder, orjson),
+    MsgspecEncoder.name: (MsgspecEncoder, msgspec),
+    StdlibJSONEncoder.name: (StdlibJSONEncoder, json),
+}
+
+
+def get_encoder(name: str | None = None) -> JSONEncoderBackend:
+    """
+    Return encoder backend by name.
+
+    If name is not provided, `API_JSON_ENCODER` setting is used. With "auto" the fastest
+    installed backend is selected, unavailable backends fall back to stdlib json.
+    """
+    name = name or getattr(settings, "API_JSON_ENCODER", "auto")
+
+    if name == "auto":
+        for encoder_class, module in ENCODER_BACKENDS.values():
+            if module is not None:
+                return encoder_class()
+
+    if name not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown JSON encoder backend: {name}")
+
+    encoder_class, module = ENCODER_BACKENDS[name]
+    if module is None:
+        logger.warning("JSON encoder backend %s is not installed, using stdlib json", name)
+        return StdlibJSONEncoder()
+
+    return encoder_class()
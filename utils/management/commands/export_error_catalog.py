@@ -0,0 +1,30 @@
+"""
+Export api error catalog as JSON for client SDKs.
+"""
+from django.core.management.base import BaseCommand
+from django.utils import translation
+
+from utils.error_catalog import error_catalog
+
+
+class Command(BaseCommand):
+    """Write error codes, statuses, messages and example responses to a JSON file."""
+
+    help = "Export api error catalog as JSON for client SDKs."
+
+    def add_arguments(self, parser) -> None:
+        """Add output file and language arguments."""
+        parser.add_argument("output", nargs="?", help="Output file, stdout by default.")
+        parser.add_argument("--language", default=None, help="Language of messages, LANGUAGE_CODE by default.")
+
+    def handle(self, *args, **options) -> None:
+        """Export catalog."""
+        with translation.override(options["language"] or translation.get_language()):
+            content = error_catalog.dumps()
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(content + "\n")
+            self.stdout.write(f"Exported {len(error_catalog)} error codes to {options['output']}")
+        else:
+            self.stdout.write(content)
@@ -0,0 +1,381 @@
+"""
+Api metrics: counters and histograms with pluggable sinks.
+"""
+import abc
+import logging
+import os
+import socket
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+# labels are tuples of (name, value) pairs, e.g. (("code", "NOT_FOUND"), ("status", "404"))
+Labels = tuple[tuple[str, str], ...]
+
+ERRORS_TOTAL = "api_errors_total"
+ERROR_HANDLER_SECONDS = "api_error_handler_seconds"
+VALIDATION_ERROR_BYTES = "api_validation_error_bytes"
+VALIDATION_ERROR_SECONDS = "api_validation_error_seconds"
+QUERY_BUDGET_EXCEEDED_TOTAL = "api_query_budget_exceeded_total"
+DB_POOL_WAIT_SECONDS = "api_db_pool_wait_seconds"
+
+TIME_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+SIZE_BUCKETS = (128, 256, 512, 1024, 4096, 16384, 65536, 262144)
+
+HISTOGRAM_BUCKETS = {
+    ERROR_HANDLER_SECONDS: TIME_BUCKETS,
+    VALIDATION_ERROR_BYTES: SIZE_BUCKETS,
+    VALIDATION_ERROR_SECONDS: TIME_BUCKETS,
+    DB_POOL_WAIT_SECONDS: POOL_WAIT_BUCKETS,
+}
+
+
+def get_route(request: HttpRequest) -> str:
+    """Return url pattern of the request, so label values don't depend on path params."""
+    resolver_match = request.resolver_match
+    return resolver_match.route if resolver_match is not None else ""
+
+
+class MetricsSink(abc.ABC):
+    """
+    Base metrics sink.
+
+    Recording methods are called on the request hot path, so they must not block.
+    """
+
+    @abc.abstractmethod
+    def increment(self, name: str, labels: Labels, value: int = 1) -> None:
+        """Increment counter."""
+        ...
+
+    @abc.abstractmethod
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        """Record value in histogram."""
+        ...
+
+
+class ThreadShard:
+    """Metrics recorded by a single thread."""
+
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self) -> None:
+        """Initialize empty shard."""
+        self.counters: dict[tuple[str, Labels], int] = {}
+        # histogram is a list of bucket counts, +Inf bucket count and sum of values
+        self.histograms: dict[tuple[str, Labels], list] = {}
+
+
+class InProcessMetrics(MetricsSink):
+    """
+    In-process metrics exposed in Prometheus text format.
+
+    Every thread records into its own shard without locks, shards are merged
+    only when metrics are exported. Shards of finished threads are merged into
+    totals and dropped when a new thread starts recording or metrics are exported.
+    """
+
+    def __init__(self, buckets: dict[str, tuple[float, ...]] | None = None) -> None:
+        """Initialize sink with histogram buckets per metric name."""
+        self.buckets = HISTOGRAM_BUCKETS if buckets is None else buckets
+        self._local = threading.local()
+        # recording thread -> its shard
+        self._shards: dict[threading.Thread, ThreadShard] = {}
+        # metrics of finished threads
+        self._totals = ThreadShard()
+        self._lock = threading.Lock()
+
+    def _shard(self) -> ThreadShard:
+        """Return shard of the current thread."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = ThreadShard()
+            with self._lock:
+                self._retire_finished()
+                self._shards[threading.current_thread()] = shard
+            return shard
+
+    @staticmethod
+    def _merge(counters: dict, histograms: dict, shard: ThreadShard) -> None:
+        """Add values of the shard to counters and histograms."""
+        # copying items is atomic, recording threads are never blocked
+        for key, value in list(shard.counters.items()):
+            counters[key] = counters.get(key, 0) + value
+
+        for key, histogram in list(shard.histograms.items()):
+            merged = histograms.get(key)
+            if merged is None:
+                histograms[key] = list(histogram)
+            else:
+                histograms[key] = [total + value for total, value in zip(merged, histogram)]
+
+    def _retire_finished(self) -> None:
+        """Merge shards of finished threads into totals and drop them, must be called with the lock held."""
+        for thread in [thread for thread in self._shards if not thread.is_alive()]:
+            self._merge(self._totals.counters, self._totals.histograms, self._shards.pop(thread))
+
+    def increment(self, name: str, labels: Labels, value: int = 1) -> None:
+        """Increment counter."""
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        """Record value in histogram."""
+        histograms = self._shard().histograms
+        key = (name, labels)
+        buckets = self.buckets.get(name, TIME_BUCKETS)
+
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+
+        histogram[bisect_left(buckets, value)] += 1
+        histogram[-1] += value
+
+    def collect(self) -> tuple[dict, dict]:
+        """Merge totals of finished threads and shards of running ones into counters and histograms."""
+        counters: dict[tuple[str, Labels], int] = {}
+        histograms: dict[tuple[str, Labels], list] = {}
+
+        with self._lock:
+            self._retire_finished()
+            self._merge(counters, histograms, self._totals)
+            shards = list(self._shards.values())
+
+        for shard in shards:
+            self._merge(counters, histograms, shard)
+
+        return counters, histograms
+
+    @staticmethod
+    def format_labels(labels: Labels) -> str:
+        """Format labels in Prometheus text format."""
+        if not labels:
+            return ""
+
+        formatted = ",".join(
+            '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for name, value in labels
+        )
+        return f"{{{formatted}}}"
+
+    def export(self) -> str:
+        """Return all metrics in Prometheus text format."""
+        counters, histograms = self.collect()
+        lines: list[str] = []
+        seen: set[str] = set()
+
+        for (name, labels), value in sorted(counters.items()):
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{self.format_labels(labels)} {value}")
+
+        for (name, labels), histogram in sorted(histograms.items()):
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} histogram")
+
+            buckets = self.buckets.get(name, TIME_BUCKETS)
+            cumulative = 0
+            for bound, count in zip((*buckets, "+Inf"), histogram):
+                cumulative += count
+                bucket_labels = self.format_labels((*labels, ("le", str(bound))))
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+
+            lines.append(f"{name}_sum{self.format_labels(labels)} {histogram[-1]}")
+            lines.append(f"{name}_count{self.format_labels(labels)} {cumulative}")
+
+        return "\n".join(lines) + "\n"
+
+    def view(self, request: HttpRequest) -> HttpResponse:
+        """Prometheus scrape endpoint, clients are limited by `API_METRICS_ALLOWED_IPS` setting."""
+        allowed_ips = getattr(settings, "API_METRICS_ALLOWED_IPS", None)
+        if allowed_ips is not None and request.META.get("REMOTE_ADDR") not in allowed_ips:
+            return HttpResponseForbidden()
+
+        return HttpResponse(self.export(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+class StatsDShard:
+    """Metrics aggregated by a single thread since the last send."""
+
+    __slots__ = ("counters", "values", "lock")
+
+    def __init__(self) -> None:
+        """Initialize empty shard."""
+        self.counters: dict[tuple[str, Labels], int] = {}
+        self.values: dict[tuple[str, Labels], list[float]] = {}
+        # taken by the flush thread only to swap aggregates, so it is almost never contended
+        self.lock = threading.Lock()
+
+
+class StatsDMetrics(MetricsSink):
+    """
+    StatsD sink with DogStatsD style tags.
+
+    Every thread aggregates counters and collects histogram values in its own shard,
+    a background thread formats and sends them in UDP packets every `flush_interval`
+    seconds, so metrics of idle threads are not delayed. Shards of finished threads are
+    dropped after they are sent. Forked workers start with empty shards and own flush thread.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8125,
+        prefix: str = "",
+        flush_interval: float = 1.0,
+        max_packet_size: int = 1432,
+    ) -> None:
+        """Initialize sink and UDP socket, flush thread is started on the first record."""
+        self.address = (host, port)
+        self.prefix = prefix
+        self.flush_interval = flush_interval
+        self.max_packet_size = max_packet_size
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._reset()
+
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        """Drop shards and flush thread, e.g. inherited from the parent process."""
+        self._local = threading.local()
+        # recording thread -> its shard
+        self._shards: dict[threading.Thread, StatsDShard] = {}
+        self._lock = threading.Lock()
+        self._flusher: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def _shard(self) -> StatsDShard:
+        """Return shard of the current thread."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = StatsDShard()
+            with self._lock:
+                self._shards[threading.current_thread()] = shard
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._run, name="statsd-flush", daemon=True)
+                    self._flusher.start()
+            return shard
+
+    def _run(self) -> None:
+        """Flush metrics every flush interval until the sink is closed."""
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    @staticmethod
+    def format_tags(labels: Labels) -> str:
+        """Format labels as DogStatsD tags."""
+        if not labels:
+            return ""
+
+        tags = ",".join(f"{name}:{str(value).replace('|', '_').replace(',', '_')}" for name, value in labels)
+        return f"|#{tags}"
+
+    def format_lines(self, counters: dict, values: dict) -> list[str]:
+        """Format aggregated metrics, seconds are sent as milliseconds timers."""
+        lines = [
+            f"{self.prefix}{name}:{value}|c{self.format_tags(labels)}"
+            for (name, labels), value in counters.items()
+        ]
+
+        for (name, labels), recorded in values.items():
+            if name.endswith("_seconds"):
+                packed = ":".join(f"{value * 1000:.4f}" for value in recorded)
+                lines.append(f"{self.prefix}{name[:-8]}:{packed}|ms{self.format_tags(labels)}")
+            else:
+                packed = ":".join(str(value) for value in recorded)
+                lines.append(f"{self.prefix}{name}:{packed}|h{self.format_tags(labels)}")
+
+        return lines
+
+    def send(self, payload: str) -> None:
+        """Send single packet."""
+        try:
+            self._socket.sendto(payload.encode(), self.address)
+        except OSError:
+            # metrics must never break responses
+            logger.debug("Failed to send metrics to %s:%s", *self.address, exc_info=True)
+
+    def flush(self) -> None:
+        """Send metrics aggregated by all threads, shards of finished threads are dropped."""
+        with self._lock:
+            shards = list(self._shards.values())
+            for thread in [thread for thread in self._shards if not thread.is_alive()]:
+                # finished thread doesn't record anymore, its shard is sent below for the last time
+                del self._shards[thread]
+
+        lines: list[str] = []
+        for shard in shards:
+            with shard.lock:
+                counters, values = shard.counters, shard.values
+                shard.counters, shard.values = {}, {}
+            lines.extend(self.format_lines(counters, values))
+
+        packet: list[str] = []
+        size = 0
+        for line in lines:
+            if packet and size + len(line) + 1 > self.max_packet_size:
+                self.send("\n".join(packet))
+                packet, size = [], 0
+            packet.append(line)
+            size += len(line) + 1
+
+        if packet:
+            self.send("\n".join(packet))
+
+    def close(self) -> None:
+        """Stop flush thread and send remaining metrics."""
+        self._stopped.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+
+    def increment(self, name: str, labels: Labels, value: int = 1) -> None:
+        """Increment counter."""
+        shard = self._shard()
+        key = (name, labels)
+        with shard.lock:
+            shard.counters[key] = shard.counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        """Record value in histogram."""
+        shard = self._shard()
+        key = (name, labels)
+        with shard.lock:
+            values = shard.values.get(key)
+            if values is None:
+                values = shard.values[key] = []
+            values.append(value)
+
+
+def get_metrics_sink(name: str | None = None) -> MetricsSink | None:
+    """
+    Return metrics sink by name: "prometheus", "statsd" or None to disable metrics.
+
+    If name is not provided, `API_METRICS_SINK` setting is used, StatsD address
+    is taken from `API_STATSD_ADDRESS` setting.
+    """
+    name = name or getattr(settings, "API_METRICS_SINK", None)
+
+    if name is None:
+        return None
+
+    if name == "prometheus":
+        return InProcessMetrics()
+
+    if name == "statsd":
+        host, port = getattr(settings, "API_STATSD_ADDRESS", ("127.0.0.1", 8125))
+        return StatsDMetrics(host=host, port=port)
+
+    raise ValueError(f"Unknown metrics sink: {name}")
@@ -0,0 +1,243 @@
+"""
+Persisted OpenAPI schema cache.
+"""
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+import threading
+import typing as t
+from functools import partial
+from pathlib import Path
+
+import ninja
+import ninja_extra
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified
+from django.urls import path
+from django.utils.translation import get_language
+from ninja_extra import NinjaExtraAPI
+from pydantic import BaseModel
+
+from utils.json_encoders import get_encoder
+
+# same check as django GZipMiddleware
+GZIP_RE = re.compile(r"\bgzip\b")
+
+
+class CachedSchema(t.NamedTuple):
+    """OpenAPI schema file mapped into memory."""
+
+    fingerprint: str
+    body: mmap.mmap
+    gzip_body: mmap.mmap
+
+
+def stable_repr(value: t.Any) -> str:
+    """Return representation that doesn't depend on object addresses, lazy strings are translated."""
+    return json.dumps(value, default=str)
+
+
+def collect_models(annotation: t.Any, models: dict[str, type[BaseModel]]) -> None:
+    """Collect pydantic models used in annotation, including nested ones."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        name = f"{annotation.__module__}.{annotation.__qualname__}"
+        if name in models:
+            return
+
+        models[name] = annotation
+        for field in annotation.model_fields.values():
+            collect_models(field.annotation, models)
+
+    for arg in t.get_args(annotation):
+        collect_models(arg, models)
+
+
+class OpenAPISchemaCache:
+    """
+    Build OpenAPI schema once and store it on disk.
+
+    The file name contains fingerprint of registered controllers, routes and JSON schemas
+    of schema classes, so the schema is regenerated only when one of them changes, files of
+    previous fingerprints of the same path prefix and language are deleted when a new one
+    is written. Workers map stored files into memory and serve them with ETag and gzip.
+
+    Operation ids generated by ninja_extra are random per process, so they are not
+    part of the fingerprint.
+    """
+
+    def __init__(self, api: NinjaExtraAPI, directory: str | Path) -> None:
+        """Initialize cache for api in directory."""
+        self.api = api
+        self.directory = Path(directory)
+        self._schemas: dict[tuple[str, str | None], CachedSchema] = {}
+        self._lock = threading.Lock()
+
+    def fingerprint(self, path_prefix: str) -> str:
+        """Return fingerprint of the api schema for path prefix and active language."""
+        digest = hashlib.sha256()
+        models: dict[str, type[BaseModel]] = {}
+
+        def update(*values: t.Any) -> None:
+            digest.update(repr(values).encode())
+
+        update(ninja.__version__, ninja_extra.__version__, path_prefix, get_language())
+        update(self.api.title, self.api.version, self.api.description, stable_repr(self.api.openapi_extra))
+
+        for prefix, router in self.api._routers:
+            controller_class = getattr(router, "controller_class", None)
+            update(prefix, type(router).__name__, repr(controller_class), router.tags)
+
+            for route_path, path_view in router.path_operations.items():
+                for operation in path_view.operations:
+                    update(
+                        route_path,
+                        operation.methods,
+                        operation.view_func.__module__,
+                        operation.view_func.__qualname__,
+                        operation.summary,
+                        operation.description,
+                        operation.tags,
+                        operation.deprecated,
+                        operation.include_in_schema,
+                        operation.by_alias,
+                        [type(callback).__name__ for callback in operation.auth_callbacks],
+                        stable_repr(operation.openapi_extra),
+                    )
+
+                    for status_code, model in operation.response_models.items():
+                        update(status_code)
+                        collect_models(model, models)
+
+                    for model in operation.models:
+                        collect_models(model, models)
+
+        # JSON schemas, unlike reprs of pydantic fields, are stable across pydantic versions
+        for name, model in sorted(models.items()):
+            schema_extra = getattr(model, "schema_extra", None)
+            update(
+                name,
+                stable_repr(model.model_json_schema(by_alias=True)),
+                stable_repr(schema_extra() if callable(schema_extra) else None),
+            )
+
+        return digest.hexdigest()[:32]
+
+    def get(self, path_prefix: str) -> CachedSchema:
+        """Return cached schema for path prefix, build it if it doesn't exist yet."""
+        key = (path_prefix, get_language())
+        schema = self._schemas.get(key)
+
+        if schema is None:
+            with self._lock:
+                schema = self._schemas.get(key)
+                if schema is None:
+                    schema = self._schemas[key] = self.load(path_prefix)
+
+        return schema
+
+    @staticmethod
+    def get_name(path_prefix: str) -> str:
+        """Return file name prefix of schemas for path prefix and active language."""
+        return "openapi-" + hashlib.sha256(repr((path_prefix, get_language())).encode()).hexdigest()[:8]
+
+    def load(self, path_prefix: str) -> CachedSchema:
+        """Load schema files from disk, build them when fingerprint changed."""
+        fingerprint = self.fingerprint(path_prefix)
+        name = self.get_name(path_prefix)
+        body_path = self.directory / f"{name}-{fingerprint}.json"
+        gzip_path = self.directory / f"{name}-{fingerprint}.json.gz"
+
+        if not body_path.exists() or not gzip_path.exists():
+            body = self.build(path_prefix)
+            self.write(body_path, body)
+            self.write(gzip_path, gzip.compress(body, compresslevel=9, mtime=0))
+            self.delete_stale(name, fingerprint)
+
+        return CachedSchema(
+            fingerprint=fingerprint,
+            body=self.map_file(body_path),
+            gzip_body=self.map_file(gzip_path),
+        )
+
+    def build(self, path_prefix: str) -> bytes:
+        """Build OpenAPI schema and serialize it."""
+        schema = self.api.get_openapi_schema(path_prefix=path_prefix)
+        encoder = getattr(self.api.renderer, "encoder", None) or get_encoder()
+        return encoder.dumps(schema)
+
+    def write(self, file_path: Path, content: bytes) -> None:
+        """Write file atomically, so other workers never read partial content."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(dir=self.directory, delete=False) as file:
+            file.write(content)
+
+        os.replace(file.name, file_path)
+
+    def delete_stale(self, name: str, fingerprint: str) -> None:
+        """Delete files of previous fingerprints, workers that mapped them keep reading their copy."""
+        for file_path in self.directory.glob(f"{name}-*.json*"):
+            if not file_path.name.startswith(f"{name}-{fingerprint}."):
+                file_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def map_file(file_path: Path) -> mmap.mmap:
+        """Map file into memory in read only mode."""
+        with open(file_path, "rb") as file:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def response(self, request: HttpRequest, **path_params: t.Any) -> HttpResponse:
+        """Return OpenAPI schema response with ETag and gzip support."""
+        schema = self.get(self.api.get_root_path(path_params))
+        etag = f'"{schema.fingerprint}"'
+
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        elif GZIP_RE.search(request.headers.get("Accept-Encoding", "")):
+            response = HttpResponse(memoryview(schema.gzip_body), content_type="application/json")
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(memoryview(schema.body), content_type="application/json")
+
+        response["ETag"] = etag
+        response["Vary"] = "Accept-Encoding"
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+def openapi_json(request: HttpRequest, api: "CachedSchemaAPI", **kwargs: t.Any) -> HttpResponse:
+    """OpenAPI schema view served from the cache."""
+    return api.openapi_cache.response(request, **kwargs)
+
+
+class CachedSchemaAPI(NinjaExtraAPI):
+    """
+    Ninja extra api with opt-in persisted OpenAPI schema.
+
+    Schema cache is enabled when `openapi_cache_dir` is set.
+    """
+
+    def __init__(self, *args: t.Any, openapi_cache_dir: str | Path | None = None, **kwargs: t.Any) -> None:
+        """Initialize api and schema cache."""
+        super().__init__(*args, **kwargs)
+
+        self.openapi_cache = OpenAPISchemaCache(self, openapi_cache_dir) if openapi_cache_dir else None
+
+    def _get_urls(self) -> list:
+        """Replace default OpenAPI schema view with the cached one."""
+        urls = super()._get_urls()
+
+        if self.openapi_cache is None:
+            return urls
+
+        for index, pattern in enumerate(urls):
+            if getattr(pattern, "name", None) == "openapi-json":
+                view = partial(openapi_json, api=self)
+                if self.docs_decorator:
+                    view = self.docs_decorator(view)
+                urls[index] = path(self.openapi_url.lstrip("/"), view, name="openapi-json")
+
+        return urls
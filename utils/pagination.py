@@ -0,0 +1,174 @@
+"""
+Keyset pagination with signed cursors.
+"""
+import datetime
+import json
+import typing as t
+
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q, QuerySet
+from ninja import Field, Query, Schema
+from ninja.pagination import PaginationBase
+
+from utils.base_exceptions import InvalidCursorException, PageSizeTooLargeException
+from utils.django_schema import DjangoSchema, get_values_fields
+
+T = t.TypeVar("T")
+
+# count modes, None skips counting
+EXACT = "exact"
+ESTIMATE = "estimate"
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """JSON encoder that keeps microseconds, rows after the cursor are compared exactly."""
+
+    def default(self, o: t.Any) -> t.Any:
+        """Encode dates and times in full precision."""
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class CursorSerializer:
+    """Signing serializer that keeps dates, decimals and UUIDs of ordering values."""
+
+    def dumps(self, obj: t.Any) -> bytes:
+        """Serialize cursor payload."""
+        return CursorEncoder(separators=(",", ":")).encode(obj).encode("latin-1")
+
+    def loads(self, data: bytes) -> t.Any:
+        """Deserialize cursor payload, values are parsed back by model fields when filtering."""
+        return signing.JSONSerializer().loads(data)
+
+
+class KeysetPage(DjangoSchema, t.Generic[T]):
+    """Page of keyset paginated route, next_cursor is None on the last page."""
+
+    items: t.List[T]
+    next_cursor: t.Optional[str] = None
+    count: t.Optional[int] = None
+
+
+class KeysetPagination(PaginationBase):
+    """
+    Paginate querysets by the last seen ordering values instead of offset.
+
+    Every page is a single indexed range query, so deep pages are as fast as the first one.
+    Ordering fields must be non-null, primary key is appended to make ordering unique.
+    Cursors are signed with SECRET_KEY, so clients can't forge or change them.
+
+    `count` is None by default, so no COUNT query runs. "estimate" returns planner
+    estimate on PostgreSQL (None on other databases), "exact" runs COUNT(*).
+    """
+
+    class Input(Schema):
+        """Pagination query parameters."""
+
+        cursor: t.Optional[str] = None
+        page_size: t.Optional[int] = Field(None, ge=1)
+
+    InputSource = Query(...)
+    Output = KeysetPage
+    exceptions = (InvalidCursorException, PageSizeTooLargeException)
+
+    def __init__(
+        self,
+        ordering: t.Union[str, t.Sequence[str]] = "pk",
+        page_size: int = 50,
+        max_page_size: int = 200,
+        count: t.Optional[str] = None,
+        salt: str = "utils.pagination",
+        **kwargs: t.Any,
+    ) -> None:
+        """Initialize paginator, ordering uses order_by syntax, e.g. ("-date_joined",)."""
+        super().__init__(**kwargs)
+        if count not in (None, EXACT, ESTIMATE):
+            raise ValueError(f"Unknown count mode: {count}")
+
+        ordering = [ordering] if isinstance(ordering, str) else list(ordering)
+        if not any(field.lstrip("-") == "pk" for field in ordering):
+            ordering.append("-pk" if ordering and ordering[-1].startswith("-") else "pk")
+
+        self.ordering = tuple(ordering)
+        self.fields = tuple((field.lstrip("-"), field.startswith("-")) for field in ordering)
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.count = count
+        self.salt = salt
+        self.schema_class: type[Schema] | None = None
+
+    def encode_cursor(self, values: list) -> str:
+        """Sign ordering values of the last row."""
+        return signing.dumps([self.ordering, values], salt=self.salt, serializer=CursorSerializer, compress=True)
+
+    def decode_cursor(self, cursor: str) -> list:
+        """Return ordering values of the cursor, cursors of other ordering are rejected."""
+        try:
+            ordering, values = signing.loads(cursor, salt=self.salt, serializer=CursorSerializer)
+        except (signing.BadSignature, ValueError, TypeError):
+            raise InvalidCursorException
+
+        if tuple(ordering) != self.ordering or not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursorException
+        return values
+
+    def after(self, values: list) -> Q:
+        """Build filter of rows after the cursor: (a > x) | (a = x & b > y) | ..."""
+        condition = Q()
+        for index, (name, descending) in enumerate(self.fields):
+            lookup = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[index]})
+            for previous, (previous_name, _) in enumerate(self.fields[:index]):
+                lookup &= Q(**{previous_name: values[previous]})
+            condition |= lookup
+        return condition
+
+    def get_count(self, queryset: QuerySet) -> int | None:
+        """Return exact or estimated number of rows, None when counting is disabled."""
+        if self.count == EXACT:
+            return queryset.count()
+
+        if self.count == ESTIMATE and connections[queryset.db].vendor == "postgresql":
+            plan = queryset.order_by().explain(format="json")
+            return int(json.loads(plan)[0]["Plan"]["Plan Rows"])
+
+        return None
+
+    def get_page_size(self, pagination: Input) -> int:
+        """Return requested page size or default one."""
+        page_size = pagination.page_size or self.page_size
+        if page_size > self.max_page_size:
+            raise PageSizeTooLargeException
+        return page_size
+
+    def paginate_queryset(self, queryset: QuerySet, pagination: Input, **params: t.Any) -> dict:
+        """Return page after the cursor with schemas built in a single validation pass."""
+        page_size = self.get_page_size(pagination)
+        values = self.decode_cursor(pagination.cursor) if pagination.cursor else None
+        count = self.get_count(queryset)
+
+        queryset = queryset.order_by(*self.ordering)
+        if values is not None:
+            queryset = queryset.filter(self.after(values))
+
+        # columns-only schemas are built from dict rows, ordering fields are read along
+        batched = isinstance(self.schema_class, type) and issubclass(self.schema_class, DjangoSchema)
+        fields = get_values_fields(self.schema_class, queryset.model) if batched else None
+        if fields is not None:
+            queryset = queryset.values(*dict.fromkeys([*fields, *(name for name, _ in self.fields)]))
+
+        # one extra row tells whether there is the next page
+        rows = list(queryset[:page_size + 1])
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            get = last.__getitem__ if fields is not None else last.__getattribute__
+            next_cursor = self.encode_cursor([get(name) for name, _ in self.fields])
+
+        if batched:
+            rows = self.schema_class.from_batch(rows)
+
+        return {"items": rows, "next_cursor": next_cursor, "count": count}
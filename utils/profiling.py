@@ -0,0 +1,269 @@
+"""
+Sampled per-route profiling.
+"""
+import cProfile
+import itertools
+import logging
+import threading
+import typing as t
+import weakref
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from time import perf_counter
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from ninja.operation import Operation
+from ninja.signature import is_async
+
+logger = logging.getLogger(__name__)
+
+# profile of the request that is being sampled, copied into sync_to_async threads
+current_profile: ContextVar["RequestProfile | None"] = ContextVar("current_profile", default=None)
+
+# apis with timed exception handling
+profiled_apis: "weakref.WeakSet" = weakref.WeakSet()
+
+# only one cProfile can be enabled in the process since Python 3.12, so one request at a time is profiled
+profile_lock = threading.Lock()
+
+
+class RequestProfile:
+    """Split timing of a single request, in seconds."""
+
+    __slots__ = ("start", "handler_start", "handler", "exception", "queries", "query_time")
+
+    def __init__(self) -> None:
+        """Start request timing."""
+        self.start = perf_counter()
+        self.handler_start: float | None = None
+        self.handler = 0.0
+        self.exception = 0.0
+        self.queries = 0
+        self.query_time = 0.0
+
+    def phases(self, total: float) -> dict[str, float]:
+        """Split total request time into phases."""
+        if self.handler_start is None:
+            validation = total - self.exception
+            serialization = 0.0
+        else:
+            validation = self.handler_start - self.start
+            serialization = max(total - validation - self.handler - self.exception, 0.0)
+
+        return {
+            "validation": validation,
+            "handler": self.handler,
+            "queries": self.query_time,
+            "serialization": serialization,
+            "exception": self.exception,
+        }
+
+
+def record_query(execute: t.Callable, sql: str, params: t.Any, many: bool, context: dict) -> t.Any:
+    """Database execute wrapper that adds query time to the sampled request profile."""
+    profile = current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += 1
+        profile.query_time += perf_counter() - start
+
+
+def install_query_wrapper(sender: t.Any, connection: t.Any, **kwargs: t.Any) -> None:
+    """Add query wrapper to every new database connection."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_exception_timing(api: t.Any) -> None:
+    """Time exception handlers of api for sampled requests."""
+    if api in profiled_apis:
+        return
+
+    on_exception = api.on_exception
+
+    def timed_on_exception(request: HttpRequest, exc: Exception) -> HttpResponseBase:
+        profile = current_profile.get()
+        if profile is None:
+            return on_exception(request, exc)
+
+        start = perf_counter()
+        try:
+            return on_exception(request, exc)
+        finally:
+            profile.exception += perf_counter() - start
+
+    api.on_exception = timed_on_exception
+    profiled_apis.add(api)
+
+
+class RouteProfiler:
+    """
+    Profile 1 in `sample_rate` requests of a route.
+
+    Split timing of sampled requests is logged, when `output_dir` is set cProfile
+    stats of sampled requests are accumulated in `<output_dir>/<view>.pstats`.
+    Only one request of the process is added to cProfile stats at a time and none while
+    another profiling tool is active, other sampled requests are timed only.
+    For async routes cProfile also includes other tasks running in the event loop.
+    """
+
+    def __init__(self, sample_rate: int = 100, output_dir: str | Path | None = None) -> None:
+        """Initialize profiler and connect query wrapper."""
+        if sample_rate < 1:
+            raise ValueError("Profile sample rate must be a positive number")
+
+        self.sample_rate = sample_rate
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.counter = itertools.count()
+        self.profile = cProfile.Profile() if self.output_dir else None
+
+        connection_created.connect(install_query_wrapper, dispatch_uid="utils.profiling")
+
+    def sampled(self) -> bool:
+        """Check whether current request is sampled."""
+        return next(self.counter) % self.sample_rate == 0
+
+    def wrap_view(self, view_func: t.Callable) -> t.Callable:
+        """Wrap view function to time the handler body."""
+        if is_async(view_func):
+            @wraps(view_func)
+            async def async_wrapper(*args, **kwargs):
+                profile = current_profile.get()
+                if profile is None:
+                    return await view_func(*args, **kwargs)
+
+                profile.handler_start = perf_counter()
+                try:
+                    return await view_func(*args, **kwargs)
+                finally:
+                    profile.handler = perf_counter() - profile.handler_start
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            profile = current_profile.get()
+            if profile is None:
+                return view_func(*args, **kwargs)
+
+            profile.handler_start = perf_counter()
+            try:
+                return view_func(*args, **kwargs)
+            finally:
+                profile.handler = perf_counter() - profile.handler_start
+
+        return wrapper
+
+    def enable(self) -> bool:
+        """Enable cProfile unless another request or profiling tool uses it."""
+        if self.profile is None or not profile_lock.acquire(blocking=False):
+            return False
+
+        try:
+            self.profile.enable()
+        except ValueError:
+            # e.g. "Another profiling tool is already active"
+            profile_lock.release()
+            logger.debug("cProfile is not available, sampled request is timed only", exc_info=True)
+            return False
+
+        return True
+
+    def disable(self, name: str) -> None:
+        """Disable cProfile and dump accumulated stats of the route."""
+        try:
+            self.profile.disable()
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self.profile.dump_stats(self.output_dir / f"{name}.pstats")
+        except OSError:
+            logger.warning("Failed to dump profile stats of %s", name, exc_info=True)
+        finally:
+            profile_lock.release()
+
+    def start(self, operation: Operation) -> tuple[RequestProfile, t.Any, bool]:
+        """Start profiling of sampled request."""
+        install_exception_timing(operation.api)
+
+        # connections opened before the profiler was created
+        for connection in connections.all(initialized_only=True):
+            install_query_wrapper(None, connection)
+
+        profiling = self.enable()
+        profile = RequestProfile()
+        return profile, current_profile.set(profile), profiling
+
+    def finish(
+        self,
+        operation: Operation,
+        request: HttpRequest,
+        response: HttpResponseBase | None,
+        started: tuple[RequestProfile, t.Any, bool],
+    ) -> None:
+        """Log split timing and dump cProfile stats of sampled request."""
+        profile, token, profiling = started
+        total = perf_counter() - profile.start
+        current_profile.reset(token)
+        name = operation.view_func.__qualname__
+
+        if profiling:
+            self.disable(name)
+
+        phases = profile.phases(total)
+        logger.info(
+            "%s %s %s total=%.3fms validation=%.3fms handler=%.3fms queries=%d/%.3fms "
+            "serialization=%.3fms exception=%.3fms",
+            request.method,
+            request.path,
+            response.status_code if response is not None else "-",
+            total * 1000,
+            phases["validation"] * 1000,
+            phases["handler"] * 1000,
+            profile.queries,
+            phases["queries"] * 1000,
+            phases["serialization"] * 1000,
+            phases["exception"] * 1000,
+            extra={"route": name, "profile": phases, "queries": profile.queries},
+        )
+
+    def __call__(self, operation: Operation) -> None:
+        """Operation callback that wraps `run` to profile sampled requests."""
+        run = operation.run
+
+        if is_async(operation.view_func):
+            async def async_run(request: HttpRequest, **kw: t.Any) -> HttpResponseBase:
+                if not self.sampled():
+                    return await run(request, **kw)
+
+                started = self.start(operation)
+                response = None
+                try:
+                    response = await run(request, **kw)
+                    return response
+                finally:
+                    self.finish(operation, request, response, started)
+
+            operation.run = async_run
+            return
+
+        def sync_run(request: HttpRequest, **kw: t.Any) -> HttpResponseBase:
+            if not self.sampled():
+                return run(request, **kw)
+
+            started = self.start(operation)
+            response = None
+            try:
+                response = run(request, **kw)
+                return response
+            finally:
+                self.finish(operation, request, response, started)
+
+        operation.run = sync_run
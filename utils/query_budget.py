@@ -0,0 +1,159 @@
+"""
+Per-route budget of database queries and query time.
+"""
+import logging
+import typing as t
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from ninja.operation import Operation
+from ninja.signature import is_async
+
+from utils.base_exceptions import QueryBudgetExceededException
+from utils.metrics import QUERY_BUDGET_EXCEEDED_TOTAL, get_route
+
+logger = logging.getLogger(__name__)
+
+
+class QueryUsage:
+    """Database queries of a single request, time is in seconds."""
+
+    __slots__ = ("queries", "time")
+
+    def __init__(self) -> None:
+        """Initialize empty usage."""
+        self.queries = 0
+        self.time = 0.0
+
+
+# usage of the request with query budget, copied into sync_to_async threads
+current_usage: ContextVar[QueryUsage | None] = ContextVar("current_usage", default=None)
+
+
+def count_query(execute: t.Callable, sql: str, params: t.Any, many: bool, context: dict) -> t.Any:
+    """Database execute wrapper that adds query to the usage of the current request."""
+    usage = current_usage.get()
+    if usage is None:
+        return execute(sql, params, many, context)
+
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        usage.queries += 1
+        usage.time += perf_counter() - start
+
+
+def install_query_counter(sender: t.Any, connection: t.Any, **kwargs: t.Any) -> None:
+    """Add query counter to every new database connection."""
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+class QueryBudget:
+    """
+    Limit of database queries and query time (in seconds) of a route request.
+
+    Queries are counted from request validation to the serialized response, so lazy
+    querysets evaluated by the response schema are included, rows of streamed
+    responses are not. Over budget requests return `QueryBudgetExceededException`
+    response when `API_QUERY_BUDGET_RAISE` setting is enabled (defaults to DEBUG),
+    otherwise they are logged and counted in api metrics sink.
+    """
+
+    def __init__(self, max_queries: int | None = None, max_db_time: float | None = None) -> None:
+        """Initialize budget and connect query counter."""
+        if max_queries is None and max_db_time is None:
+            raise ValueError("Query budget requires max_queries or max_db_time")
+
+        self.max_queries = max_queries
+        self.max_db_time = max_db_time
+
+        connection_created.connect(install_query_counter, dispatch_uid="utils.query_budget")
+
+    def __str__(self) -> str:
+        """Return budget limits, e.g. "5 queries and 50ms of query time"."""
+        limits = []
+        if self.max_queries is not None:
+            limits.append(f"{self.max_queries} {'query' if self.max_queries == 1 else 'queries'}")
+        if self.max_db_time is not None:
+            limits.append(f"{self.max_db_time * 1000:g}ms of query time")
+        return " and ".join(limits)
+
+    def exceeded(self, usage: QueryUsage) -> bool:
+        """Check whether request usage is over budget."""
+        return (
+            (self.max_queries is not None and usage.queries > self.max_queries)
+            or (self.max_db_time is not None and usage.time > self.max_db_time)
+        )
+
+    def start(self) -> tuple[QueryUsage, t.Any]:
+        """Start counting queries of the request."""
+        # connections opened before the budget was created
+        for connection in connections.all(initialized_only=True):
+            install_query_counter(None, connection)
+
+        usage = QueryUsage()
+        return usage, current_usage.set(usage)
+
+    def finish(
+        self,
+        operation: Operation,
+        request: HttpRequest,
+        response: HttpResponseBase,
+        started: tuple[QueryUsage, t.Any],
+    ) -> HttpResponseBase:
+        """Return error response or record over budget request."""
+        usage, token = started
+        current_usage.reset(token)
+
+        if not self.exceeded(usage):
+            return response
+
+        name = operation.view_func.__qualname__
+        message = (
+            f"{name} ran {usage.queries} queries in {usage.time * 1000:.1f}ms, "
+            f"budget is {self}"
+        )
+
+        if getattr(settings, "API_QUERY_BUDGET_RAISE", settings.DEBUG):
+            return operation.api.on_exception(request, QueryBudgetExceededException(message))
+
+        logger.warning(message, extra={"route": name, "queries": usage.queries, "query_time": usage.time})
+        metrics = getattr(operation.api, "metrics", None)
+        if metrics is not None:
+            metrics.increment(QUERY_BUDGET_EXCEEDED_TOTAL, (("route", get_route(request)),))
+        return response
+
+    def __call__(self, operation: Operation) -> None:
+        """Operation callback that wraps `run` to count queries of every request."""
+        run = operation.run
+
+        if is_async(operation.view_func):
+            async def async_run(request: HttpRequest, **kw: t.Any) -> HttpResponseBase:
+                started = self.start()
+                try:
+                    response = await run(request, **kw)
+                except BaseException:
+                    current_usage.reset(started[1])
+                    raise
+                return self.finish(operation, request, response, started)
+
+            operation.run = async_run
+            return
+
+        def sync_run(request: HttpRequest, **kw: t.Any) -> HttpResponseBase:
+            started = self.start()
+            try:
+                response = run(request, **kw)
+            except BaseException:
+                current_usage.reset(started[1])
+                raise
+            return self.finish(operation, request, response, started)
+
+        operation.run = sync_run
@@ -0,0 +1,162 @@
+"""
+Queryset field projection from schema declarations.
+"""
+import typing as t
+from functools import cache, wraps
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Manager, Model, Prefetch, QuerySet
+from ninja import Schema
+from ninja.signature import is_async
+
+
+class QueryProjection(t.NamedTuple):
+    """
+    Columns and relations read by a schema.
+
+    `only` is None when some schema field can't be mapped to model columns,
+    e.g. it's a property or has a resolver, in this case all columns are loaded.
+    """
+
+    only: tuple[str, ...] | None
+    select_related: tuple[str, ...]
+    prefetch_related: tuple[str | Prefetch, ...]
+
+    def apply(self, queryset: QuerySet | Manager) -> QuerySet:
+        """Apply projection to queryset."""
+        if isinstance(queryset, Manager):
+            queryset = queryset.all()
+
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only is not None:
+            queryset = queryset.only(*self.only)
+
+        return queryset
+
+
+def get_schema_class(annotation: t.Any) -> type[Schema] | None:
+    """Return schema class from annotation, e.g. `Schema`, `list[Schema]` or `Optional[Schema]`."""
+    if isinstance(annotation, type) and issubclass(annotation, Schema):
+        return annotation
+
+    for arg in t.get_args(annotation):
+        schema_class = get_schema_class(arg)
+        if schema_class is not None:
+            return schema_class
+
+    return None
+
+
+def get_model_field(model: type[Model], name: str):
+    """Return model field by name or by accessor name of reverse relation."""
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        for related_object in model._meta.related_objects:
+            if related_object.get_accessor_name() == name:
+                return related_object
+        raise
+
+
+def collect_projection(
+    schema_class: type[Schema],
+    model: type[Model],
+    prefix: str,
+    only: list[str],
+    select_related: list[str],
+    prefetch_related: list[str | Prefetch],
+) -> bool:
+    """
+    Collect columns and relations read by schema into lists.
+
+    Returns False when some field can't be mapped to model columns.
+    """
+    complete = True
+
+    for name, field in schema_class.model_fields.items():
+        # aliases from alias generator have priority 1, explicit ones point to source attribute
+        source = field.validation_alias if (field.alias_priority or 0) > 1 else name
+
+        if name in schema_class._ninja_resolvers or not isinstance(source, str) or "." in source:
+            complete = False
+            continue
+
+        try:
+            model_field = get_model_field(model, source)
+        except FieldDoesNotExist:
+            # attribute is not a column, e.g. property or schema field with default
+            complete = complete and not field.is_required()
+            continue
+
+        lookup = f"{prefix}{source}"
+        nested_schema = get_schema_class(field.annotation)
+
+        if not model_field.is_relation:
+            only.append(lookup)
+        elif model_field.concrete and (model_field.many_to_one or model_field.one_to_one):
+            only.append(lookup)
+            if nested_schema is not None:
+                select_related.append(lookup)
+                complete = collect_projection(
+                    nested_schema,
+                    model_field.related_model,
+                    f"{lookup}__",
+                    only,
+                    select_related,
+                    prefetch_related,
+                ) and complete
+        elif nested_schema is not None:
+            projection = get_projection(nested_schema, model_field.related_model)
+            queryset = projection.apply(model_field.related_model._default_manager)
+
+            # reverse foreign key needs the column that points back to the parent
+            if projection.only is not None and model_field.one_to_many:
+                queryset = queryset.only(*projection.only, model_field.field.attname)
+
+            prefetch_related.append(Prefetch(lookup, queryset=queryset))
+        else:
+            complete = False
+
+    return complete
+
+
+@cache
+def get_projection(schema_class: type[Schema], model: type[Model]) -> QueryProjection:
+    """Return cached projection of schema onto model."""
+    only: list[str] = []
+    select_related: list[str] = []
+    prefetch_related: list[str | Prefetch] = []
+
+    complete = collect_projection(schema_class, model, "", only, select_related, prefetch_related)
+
+    return QueryProjection(
+        only=tuple(only) if complete else None,
+        select_related=tuple(select_related),
+        prefetch_related=tuple(prefetch_related),
+    )
+
+
+def project_result(result: t.Any, schema_class: type[Schema]) -> t.Any:
+    """Apply schema projection to the view result if it's a queryset."""
+    if isinstance(result, QuerySet):
+        return get_projection(schema_class, result.model).apply(result)
+    return result
+
+
+def projected_view(view_func: t.Callable, schema_class: type[Schema]) -> t.Callable:
+    """Wrap view function to apply schema projection to returned querysets."""
+    if is_async(view_func):
+        @wraps(view_func)
+        async def async_wrapper(*args, **kwargs):
+            return project_result(await view_func(*args, **kwargs), schema_class)
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        return project_result(view_func(*args, **kwargs), schema_class)
+
+    return wrapper
@@ -0,0 +1,41 @@
+"""
+Django ninja renderers.
+"""
+from typing import Any
+
+from django.http import HttpRequest
+from ninja.renderers import BaseRenderer
+
+from utils.compression import ResponseCompressor
+from utils.json_encoders import JSONEncoderBackend, get_encoder
+
+
+class FastJSONRenderer(BaseRenderer):
+    """
+    JSON renderer with pluggable encoder backend.
+
+    Compressor is applied to responses of AutoAliasRoute routes, routes can change
+    the level or disable compression with the `compress` option.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        encoder: str | JSONEncoderBackend | None = None,
+        compression: ResponseCompressor | None = None,
+    ) -> None:
+        """Initialize renderer with encoder backend or backend name and response compressor."""
+        self._encoder = encoder
+        self.compression = compression
+
+    @property
+    def encoder(self) -> JSONEncoderBackend:
+        """Return encoder backend, resolved on first access."""
+        if not isinstance(self._encoder, JSONEncoderBackend):
+            self._encoder = get_encoder(self._encoder)
+        return self._encoder
+
+    def render(self, request: HttpRequest, data: Any, *, response_status: int) -> bytes:
+        """Render data to JSON bytes."""
+        return self.encoder.dumps(data)
@@ -0,0 +1,279 @@
+"""
+Serialized response cache for GET routes.
+"""
+import asyncio
+import hashlib
+import time
+import typing as t
+import uuid
+from functools import wraps
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.translation import get_language
+from ninja.operation import Operation as NinjaOperation
+from ninja.signature import is_async
+from ninja_extra import status
+
+from utils.base_exceptions import DefaultHTTPException
+from utils.checks import require_shared_cache
+from utils.db_routing import is_sticky
+from utils.signals import post_bulk_create
+
+
+class CachedResponse(t.NamedTuple):
+    """Cached response content, version is the route version at the time of caching."""
+
+    version: str | None
+    status_code: int
+    content: bytes
+    content_type: str
+
+    def to_response(self) -> HttpResponse:
+        """Build response from cached content."""
+        return HttpResponse(self.content, status=self.status_code, content_type=self.content_type)
+
+
+class ResponseCache:
+    """
+    Cache serialized responses of a GET route in Django cache.
+
+    Key varies on path (with path params), query string, language and optionally the user.
+    Successful responses are cached for `timeout` seconds, responses of `DefaultHTTPException`
+    with status in `negative_statuses` (404 by default) for `negative_timeout` seconds.
+
+    Saving, deleting or bulk creating (with `BulkCreator`) any of `models` invalidates all
+    cached responses of the route after the transaction commits by changing the route version.
+    Versions are kept in `version_cache_alias` cache (`cache_alias` by default) that must be shared
+    by all workers, so they see the invalidation, responses may be kept in a per-worker cache.
+    On a miss only one request computes the response, others wait up to `lock_timeout` seconds
+    for it to appear in the cache and compute it themselves when it is not cached.
+
+    Cache is checked inside the view, so auth, permissions and params validation
+    always run before the cached response is returned. Clients that read from primary after
+    their write skip the cache, it may hold responses read from a lagging replica. Results are serialized in the
+    calling thread, async views must return fully loaded data (e.g. from aget).
+    """
+
+    def __init__(
+        self,
+        timeout: int = 60,
+        negative_timeout: int = 5,
+        negative_statuses: t.Iterable[int] = (status.HTTP_404_NOT_FOUND,),
+        vary_on_user: bool = False,
+        models: t.Iterable[type[Model]] = (),
+        cache_alias: str = "default",
+        version_cache_alias: str | None = None,
+        lock_timeout: int = 5,
+        poll_interval: float = 0.01,
+    ) -> None:
+        """Initialize cache and connect invalidation signals."""
+        self.timeout = timeout
+        self.negative_timeout = negative_timeout
+        self.negative_statuses = frozenset(negative_statuses)
+        self.vary_on_user = vary_on_user
+        self.cache_alias = cache_alias
+        self.version_cache_alias = version_cache_alias or cache_alias
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.operation: NinjaOperation | None = None
+        self.prefix = ""
+        self.version_key = ""
+
+        require_shared_cache(self.version_cache_alias)
+
+        for model in models:
+            post_save.connect(self.invalidate, sender=model, weak=False)
+            post_delete.connect(self.invalidate, sender=model, weak=False)
+            post_bulk_create.connect(self.invalidate, sender=model, weak=False)
+
+    @property
+    def cache(self):
+        """Django cache backend."""
+        return caches[self.cache_alias]
+
+    @property
+    def version_cache(self):
+        """Django cache backend of route versions."""
+        return caches[self.version_cache_alias]
+
+    def __call__(self, operation: NinjaOperation) -> None:
+        """Operation callback that binds cache to the route."""
+        self.operation = operation
+
+    def invalidate(self, *args: t.Any, **kwargs: t.Any) -> None:
+        """Invalidate all cached responses of the route when the transaction commits."""
+        transaction.on_commit(lambda: self.version_cache.set(self.version_key, uuid.uuid4().hex, None))
+
+    def get_key(self, request: HttpRequest) -> str:
+        """Build cache key of the request."""
+        parts = [request.path, sorted(request.GET.lists()), get_language()]
+
+        if self.vary_on_user:
+            user = getattr(request, "user", None)
+            parts.append(user.pk if user is not None and user.is_authenticated else None)
+
+        digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+        return f"{self.prefix}:{digest}"
+
+    def get_values(self, key: str) -> dict:
+        """Return cached response and route version."""
+        if self.version_cache_alias == self.cache_alias:
+            return self.cache.get_many([key, self.version_key])
+        return {key: self.cache.get(key), self.version_key: self.version_cache.get(self.version_key)}
+
+    async def aget_values(self, key: str) -> dict:
+        """Asynchronous version of `get_values`."""
+        if self.version_cache_alias == self.cache_alias:
+            return await self.cache.aget_many([key, self.version_key])
+        return {key: await self.cache.aget(key), self.version_key: await self.version_cache.aget(self.version_key)}
+
+    @staticmethod
+    def lookup(values: dict, key: str, version_key: str) -> HttpResponse | None:
+        """Return cached response if it was cached with the current route version."""
+        cached = values.get(key)
+        if cached is not None and cached.version == values.get(version_key):
+            return cached.to_response()
+        return None
+
+    def store(self, version: str | None, response: HttpResponseBase) -> tuple[CachedResponse, int] | None:
+        """Return cache entry and timeout for response, None if it is not cacheable."""
+        if response.streaming:
+            return None
+
+        if response.status_code == status.HTTP_200_OK:
+            timeout = self.timeout
+        elif response.status_code in self.negative_statuses:
+            timeout = self.negative_timeout
+        else:
+            return None
+
+        entry = CachedResponse(version, response.status_code, response.content, response["Content-Type"])
+        return entry, timeout
+
+    def build_response(self, request: HttpRequest, context: t.Any, result: t.Any) -> HttpResponseBase:
+        """Serialize view result the same way as ninja does."""
+        return NinjaOperation._result_to_response(self.operation, request, result, context.response)
+
+    def handle_error(self, request: HttpRequest, exc: DefaultHTTPException) -> HttpResponseBase:
+        """Build response of cacheable api exception with api handlers."""
+        if exc.status_code not in self.negative_statuses:
+            raise exc
+        return self.operation.api.on_exception(request, exc)
+
+    def wrap_view(self, view_func: t.Callable) -> t.Callable:
+        """Wrap controller view to return cached responses."""
+        self.prefix = f"api-response:{view_func.__module__}.{view_func.__qualname__}"
+        self.version_key = f"{self.prefix}:version"
+
+        if is_async(view_func):
+            @wraps(view_func)
+            async def async_wrapper(controller, *args, **kwargs):
+                if is_sticky(controller.context.request):
+                    return await view_func(controller, *args, **kwargs)
+                return await self.aget_response(controller, view_func, args, kwargs)
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(controller, *args, **kwargs):
+            if is_sticky(controller.context.request):
+                return view_func(controller, *args, **kwargs)
+            return self.get_response(controller, view_func, args, kwargs)
+
+        return wrapper
+
+    def compute(self, controller: t.Any, view_func: t.Callable, args: tuple, kwargs: dict) -> HttpResponseBase:
+        """Call view and serialize its result."""
+        request = controller.context.request
+        try:
+            result = view_func(controller, *args, **kwargs)
+        except DefaultHTTPException as exc:
+            return self.handle_error(request, exc)
+        return self.build_response(request, controller.context, result)
+
+    def get_response(self, controller: t.Any, view_func: t.Callable, args: tuple, kwargs: dict) -> HttpResponseBase:
+        """Return cached response or compute it, only one request computes the same key at a time."""
+        cache = self.cache
+        key = self.get_key(controller.context.request)
+        lock_key = f"{key}:lock"
+
+        values = self.get_values(key)
+        response = self.lookup(values, key, self.version_key)
+        if response is not None:
+            return response
+
+        locked = cache.add(lock_key, 1, self.lock_timeout)
+        if not locked:
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                values = self.get_values(key)
+                response = self.lookup(values, key, self.version_key)
+                if response is not None:
+                    return response
+                if not cache.has_key(lock_key):
+                    # response was not cacheable or route version changed meanwhile
+                    break
+
+        try:
+            response = self.compute(controller, view_func, args, kwargs)
+            stored = self.store(values.get(self.version_key), response)
+            if stored is not None:
+                cache.set(key, *stored)
+        finally:
+            if locked:
+                cache.delete(lock_key)
+
+        return response
+
+    async def aget_response(
+        self,
+        controller: t.Any,
+        view_func: t.Callable,
+        args: tuple,
+        kwargs: dict,
+    ) -> HttpResponseBase:
+        """Asynchronous version of `get_response`."""
+        cache = self.cache
+        request = controller.context.request
+        key = self.get_key(request)
+        lock_key = f"{key}:lock"
+
+        values = await self.aget_values(key)
+        response = self.lookup(values, key, self.version_key)
+        if response is not None:
+            return response
+
+        locked = await cache.aadd(lock_key, 1, self.lock_timeout)
+        if not locked:
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_interval)
+                values = await self.aget_values(key)
+                response = self.lookup(values, key, self.version_key)
+                if response is not None:
+                    return response
+                if not await cache.ahas_key(lock_key):
+                    # response was not cacheable or route version changed meanwhile
+                    break
+
+        try:
+            try:
+                result = await view_func(controller, *args, **kwargs)
+                response = self.build_response(request, controller.context, result)
+            except DefaultHTTPException as exc:
+                response = self.handle_error(request, exc)
+
+            stored = self.store(values.get(self.version_key), response)
+            if stored is not None:
+                await cache.aset(key, *stored)
+        finally:
+            if locked:
+                await cache.adelete(lock_key)
+
+        return response
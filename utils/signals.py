@@ -0,0 +1,8 @@
+"""
+Api signals.
+"""
+from django.dispatch import Signal
+
+# sent with sender=model and objs=inserted instances after every bulk_create chunk of BulkCreator,
+# bulk_create doesn't send post_save, so caches of the model listen to this signal too
+post_bulk_create = Signal()
@@ -0,0 +1,157 @@
+"""
+Streaming JSON responses for large collections.
+"""
+import logging
+import typing as t
+from functools import wraps
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from ninja import Schema
+from ninja.signature import is_async
+from ninja_extra import status
+
+from utils.base_exceptions import DefaultHTTPException
+from utils.error_responses import build_error_data
+from utils.json_encoders import get_encoder
+
+logger = logging.getLogger(__name__)
+
+JSON = "json"
+NDJSON = "ndjson"
+
+CONTENT_TYPES = {
+    JSON: "application/json",
+    NDJSON: "application/x-ndjson",
+}
+
+# marker for empty iterables
+EMPTY = object()
+
+
+class StreamSerializer:
+    """
+    Serialize rows through schema into JSON array or NDJSON chunks.
+
+    Rows are grouped by `chunk_size` into a single chunk. Errors raised after the response
+    has started are written as the last item in the `{"status", "error"}` envelope shape.
+    """
+
+    def __init__(self, schema_class: type[Schema], stream_format: str = JSON, chunk_size: int = 500) -> None:
+        """Initialize serializer."""
+        if stream_format not in CONTENT_TYPES:
+            raise ValueError(f"Unknown stream format: {stream_format}")
+
+        self.schema_class = schema_class
+        self.stream_format = stream_format
+        self.chunk_size = chunk_size
+        self.content_type = CONTENT_TYPES[stream_format]
+
+        if stream_format == NDJSON:
+            self.start, self.separator, self.end = b"", b"\n", b"\n"
+        else:
+            self.start, self.separator, self.end = b"[", b",", b"]"
+
+    def dump_row(self, row: t.Any) -> bytes:
+        """Serialize single row through schema."""
+        return self.schema_class.model_validate(row, from_attributes=True).model_dump_json(by_alias=True).encode()
+
+    @staticmethod
+    def dump_error(exc: Exception) -> bytes:
+        """Serialize exception into error envelope."""
+        if isinstance(exc, DefaultHTTPException):
+            data = build_error_data(exc)
+        else:
+            logger.exception("Error while streaming response", exc_info=exc)
+            data = {
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "error": {
+                    "code": "INTERNAL_SERVER_ERROR",
+                    "details": {"message": "Response streaming failed."},
+                },
+            }
+
+        return get_encoder().dumps(data)
+
+    def iter_chunks(self, first: t.Any, rows: t.Iterator) -> t.Iterator[bytes]:
+        """Yield response chunks from synchronous rows iterator."""
+        buffer = [self.start]
+
+        try:
+            if first is not EMPTY:
+                buffer.append(self.dump_row(first))
+
+                for row in rows:
+                    if len(buffer) >= self.chunk_size:
+                        yield b"".join(buffer)
+                        buffer = []
+                    buffer.append(self.separator + self.dump_row(row))
+        except Exception as exc:
+            separator = self.separator if first is not EMPTY else b""
+            buffer.append(separator + self.dump_error(exc))
+
+        buffer.append(self.end)
+        yield b"".join(buffer)
+
+    async def aiter_chunks(self, first: t.Any, rows: t.AsyncIterator) -> t.AsyncIterator[bytes]:
+        """Yield response chunks from asynchronous rows iterator."""
+        buffer = [self.start]
+
+        try:
+            if first is not EMPTY:
+                buffer.append(self.dump_row(first))
+
+                async for row in rows:
+                    if len(buffer) >= self.chunk_size:
+                        yield b"".join(buffer)
+                        buffer = []
+                    buffer.append(self.separator + self.dump_row(row))
+        except Exception as exc:
+            separator = self.separator if first is not EMPTY else b""
+            buffer.append(separator + self.dump_error(exc))
+
+        buffer.append(self.end)
+        yield b"".join(buffer)
+
+    def response(self, result: t.Any) -> StreamingHttpResponse:
+        """
+        Create streaming response from queryset or iterable.
+
+        The first row is fetched before the response starts, so errors of the query
+        itself are handled by api exception handlers with a proper status code.
+        """
+        if isinstance(result, QuerySet):
+            rows = result.iterator(chunk_size=self.chunk_size)
+        else:
+            rows = iter(result)
+
+        first = next(rows, EMPTY)
+        return StreamingHttpResponse(self.iter_chunks(first, rows), content_type=self.content_type)
+
+    async def aresponse(self, result: t.Any) -> StreamingHttpResponse:
+        """Create streaming response with asynchronous iterator."""
+        if isinstance(result, QuerySet):
+            rows = result.aiterator(chunk_size=self.chunk_size)
+        elif hasattr(result, "__aiter__"):
+            rows = aiter(result)
+        else:
+            return self.response(result)
+
+        first = await anext(rows, EMPTY)
+        return StreamingHttpResponse(self.aiter_chunks(first, rows), content_type=self.content_type)
+
+
+def streamed_view(view_func: t.Callable, serializer: StreamSerializer) -> t.Callable:
+    """Wrap view function to stream returned rows instead of building the whole response."""
+    if is_async(view_func):
+        @wraps(view_func)
+        async def async_wrapper(*args, **kwargs):
+            return await serializer.aresponse(await view_func(*args, **kwargs))
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        return serializer.response(view_func(*args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,65 @@
+"""
+Tests of async routes that run inline in the event loop.
+"""
+from unittest import mock
+
+from django.core.cache import caches
+from django.db.models.query import QuerySet
+from django.test import TestCase
+
+from users.api_errors import UserInactiveException
+from users.models import User
+
+
+class InlineAsyncRouteTests(TestCase):
+
+    def setUp(self) -> None:
+        for backend in caches.all():
+            backend.clear()
+        self.user = User.objects.create(username="async", first_name="John")
+
+    async def test_get_user(self) -> None:
+        response = await self.async_client.get(f"/api/async/users/{self.user.pk}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"username": "async", "firstName": "John", "id": self.user.pk})
+
+    async def test_missing_user_returns_error_envelope(self) -> None:
+        response = await self.async_client.get(f"/api/async/users/{self.user.pk + 1}/")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            response.json(),
+            {"status": 404, "error": {"code": "USER_NOT_FOUND", "details": {"message": "NOT FOUND"}}},
+        )
+
+    async def test_create_user(self) -> None:
+        response = await self.async_client.post(
+            "/api/async/users/",
+            {"username": "created", "first_name": "Jane"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["username"], "created")
+        self.assertTrue(await User.objects.filter(username="created").aexists())
+
+    async def test_invalid_body_returns_validation_envelope(self) -> None:
+        response = await self.async_client.post(
+            "/api/async/users/",
+            {"username": 1},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["error"]["code"], "VALIDATION_ERROR")
+
+    async def test_exception_raised_in_handler_returns_error_envelope(self) -> None:
+        with mock.patch.object(QuerySet, "aget", side_effect=UserInactiveException("User is inactive")):
+            response = await self.async_client.get(f"/api/async/users/{self.user.pk}/")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["error"],
+            {"code": "USER_INACTIVE", "details": {"message": "User is inactive"}},
+        )
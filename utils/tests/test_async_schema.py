@@ -0,0 +1,61 @@
+"""
+Tests of DjangoSchema aliases and async schemas.
+"""
+import json
+import typing as t
+
+from django.test import SimpleTestCase
+from ninja import NinjaAPI
+
+from utils.django_schema import DjangoSchema, camelize_alias
+
+
+class AddressSchema(DjangoSchema):
+    street_name: str
+    postal_code: t.Optional[str] = None
+
+
+class ContactSchema(DjangoSchema):
+    phone_number: str
+
+
+class ProfileSchema(DjangoSchema):
+    display_name: str
+    home_address: AddressSchema
+    contacts: t.List[ContactSchema]
+
+
+def thaw(schema: t.Any) -> t.Any:
+    """Return plain JSON copy of cached read-only schema."""
+    return json.loads(json.dumps(schema))
+
+
+class AsyncSchemaTests(SimpleTestCase):
+
+    def test_refs_match_openapi_document(self) -> None:
+        api = NinjaAPI(urls_namespace="async_schema_test")
+
+        @api.get("/profile/", response=ProfileSchema, by_alias=True)
+        def profile(request):
+            pass
+
+        components = api.get_openapi_schema(path_prefix="/")["components"]["schemas"]
+        schema = thaw(ProfileSchema.async_schema())
+
+        self.assertEqual(schema, components["ProfileSchema"])
+        self.assertEqual(schema["properties"]["homeAddress"], {"$ref": "#/components/schemas/AddressSchema"})
+
+    def test_schema_matches_string_rewrite_of_json_schema(self) -> None:
+        schema = ProfileSchema.model_json_schema()
+        schema.pop("$defs", None)
+        content = json.dumps(schema).replace("#/$defs/", "#/components/schemas/")
+
+        self.assertEqual(thaw(ProfileSchema.async_schema()), json.loads(content))
+
+    def test_schema_is_cached_per_class(self) -> None:
+        self.assertIs(ProfileSchema.async_schema(), ProfileSchema.async_schema())
+        self.assertIsNot(ProfileSchema.async_schema(), AddressSchema.async_schema())
+
+    def test_aliases_are_shared(self) -> None:
+        self.assertEqual(camelize_alias("postal_code"), "postalCode")
+        self.assertIs(AddressSchema.model_fields["postal_code"].alias, camelize_alias("postal_code"))
@@ -0,0 +1,91 @@
+"""
+Tests of bulk create endpoints.
+"""
+from django.core.cache import caches
+from django.test import TestCase
+
+from config.api import api
+from users.models import User
+from users.schemas import UserBaseSchema
+from utils.bulk import BulkCreator
+from utils.signals import post_bulk_create
+
+
+class BulkCreateTests(TestCase):
+
+    def setUp(self) -> None:
+        for backend in caches.all():
+            backend.clear()
+
+    def post(self, body):
+        return self.client.post("/api/users/bulk/", body, content_type="application/json")
+
+    def test_items_get_own_results(self) -> None:
+        User.objects.create(username="existing", first_name="John")
+
+        response = self.post([
+            {"username": "new", "first_name": "John"},
+            {"username": "new", "first_name": "Jane"},
+            {"username": "existing", "first_name": "John"},
+            {"username": 1},
+        ])
+
+        self.assertEqual(response.status_code, 207)
+        results = response.json()
+        self.assertEqual([result["index"] for result in results], [0, 1, 2, 3])
+        self.assertEqual([result["status"] for result in results], [201, 409, 409, 422])
+        self.assertEqual(results[0]["data"]["username"], "new")
+        self.assertEqual(results[1]["error"]["code"], "CONFLICT")
+        self.assertEqual(results[3]["error"]["code"], "VALIDATION_ERROR")
+        self.assertEqual(User.objects.filter(username="new").count(), 1)
+
+    def test_body_that_is_not_array_is_rejected(self) -> None:
+        response = self.post({"username": "new", "first_name": "John"})
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["error"]["code"], "VALIDATION_ERROR")
+
+    def test_too_many_items_are_rejected(self) -> None:
+        response = self.post([{"username": f"user{index}", "first_name": "John"} for index in range(1001)])
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["error"]["code"], "VALIDATION_ERROR")
+        self.assertFalse(User.objects.exists())
+
+    def test_request_body_documents_item_schema(self) -> None:
+        body = api.get_openapi_schema()["paths"]["/api/users/bulk/"]["post"]["requestBody"]
+
+        schema = body["content"]["application/json"]["schema"]
+        self.assertEqual(schema["type"], "array")
+        self.assertEqual(schema["maxItems"], 1000)
+        self.assertEqual(schema["items"]["title"], "UserBaseSchema")
+
+
+class BulkCreatorTests(TestCase):
+
+    def test_items_are_inserted_in_chunks(self) -> None:
+        chunks = []
+
+        def receiver(sender, objs, **kwargs):
+            chunks.append([obj.username for obj in objs])
+
+        post_bulk_create.connect(receiver)
+        self.addCleanup(post_bulk_create.disconnect, receiver)
+
+        creator = BulkCreator(UserBaseSchema, chunk_size=2)
+        items = [{"username": f"user{index}", "first_name": "John"} for index in range(5)]
+
+        results = creator.create(items, lambda item: User(**item.dict()))
+
+        self.assertEqual([result["status"] for result in results], [201] * 5)
+        self.assertEqual(chunks, [["user0", "user1"], ["user2", "user3"], ["user4"]])
+
+    def test_conflicting_chunk_is_inserted_item_by_item(self) -> None:
+        User.objects.create(username="user1", first_name="John")
+        creator = BulkCreator(UserBaseSchema, chunk_size=2)
+        items = [{"username": f"user{index}", "first_name": "John"} for index in range(4)]
+
+        results = creator.create(items, lambda item: User(**item.dict()))
+
+        self.assertEqual([result["status"] for result in results], [201, 409, 201, 201])
+        self.assertEqual(User.objects.count(), 4)
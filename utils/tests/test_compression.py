@@ -0,0 +1,92 @@
+"""
+Tests of response compression.
+"""
+import gzip
+
+from django.core.cache import caches
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from config.route import route
+from users.models import User
+from utils.compression import CompressedOperation, ResponseCompressor
+
+BODY = b'{"username": "john"}' * 100
+
+
+class ResponseCompressorTests(SimpleTestCase):
+
+    def setUp(self) -> None:
+        self.compressor = ResponseCompressor(encodings=("gzip",), min_size=1024)
+        self.factory = RequestFactory()
+
+    def compress(self, response: HttpResponse, accept_encoding: str = "gzip") -> HttpResponse:
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return self.compressor.compress(request, response)
+
+    def test_large_body_is_compressed(self) -> None:
+        response = self.compress(HttpResponse(BODY, content_type="application/json"))
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response.content), BODY)
+
+    def test_small_body_is_sent_as_is(self) -> None:
+        response = self.compress(HttpResponse(b'{"username": "john"}', content_type="application/json"))
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertFalse(response.has_header("Vary"))
+
+    def test_not_accepted_encoding_is_not_used(self) -> None:
+        response = self.compress(HttpResponse(BODY, content_type="application/json"), "gzip;q=0, identity")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response.content, BODY)
+
+    def test_strong_etag_is_weakened(self) -> None:
+        response = HttpResponse(BODY, content_type="application/json", headers={"ETag": '"v1"'})
+
+        self.assertEqual(self.compress(response)["ETag"], 'W/"v1"')
+
+    def test_streamed_body_is_compressed_by_chunks(self) -> None:
+        response = self.compress(StreamingHttpResponse([BODY, BODY], content_type="application/x-ndjson"))
+
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), BODY * 2)
+
+    def test_not_compressible_type_is_sent_as_is(self) -> None:
+        response = self.compress(HttpResponse(BODY, content_type="image/png"))
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+
+class CompressedRouteTests(TestCase):
+
+    def setUp(self) -> None:
+        for backend in caches.all():
+            backend.clear()
+        User.objects.bulk_create(User(username=f"compressed{index}", first_name="John") for index in range(50))
+
+    def test_large_page_is_compressed(self) -> None:
+        response = self.client.get("/api/users/", {"page_size": 50}, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(len(gzip.decompress(response.content).split(b'"username"')), 51)
+
+    def test_route_compression_can_be_disabled(self) -> None:
+        def compressed():
+            pass
+
+        def uncompressed():
+            pass
+
+        route.get("/compressed/")(compressed)
+        route.get("/uncompressed/", compress=False)(uncompressed)
+
+        def has_compression(view_func) -> bool:
+            callbacks = getattr(view_func, "_ninja_contribute_to_operation", [])
+            return any(isinstance(callback, CompressedOperation) for callback in callbacks)
+
+        self.assertTrue(has_compression(compressed))
+        self.assertFalse(has_compression(uncompressed))
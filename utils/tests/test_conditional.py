@@ -0,0 +1,80 @@
+"""
+Tests of conditional GET.
+"""
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase
+
+from users.models import User
+from utils.conditional import ModelVersion
+
+versions = ModelVersion(User, kwarg="user_id")
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self) -> None:
+        for backend in caches.all():
+            backend.clear()
+        self.user = User.objects.create(username="conditional", first_name="John")
+        self.path = f"/api/users/{self.user.pk}/"
+
+    def test_unchanged_instance_returns_not_modified_without_queries(self) -> None:
+        etag = self.client.get(self.path)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_saved_instance_gets_new_etag(self) -> None:
+        etag = self.client.get(self.path)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        response = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_missing_instance_gets_no_version(self) -> None:
+        missing = self.user.pk + 1
+
+        response = self.client.get(f"/api/users/{missing}/")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response)
+        self.assertIsNone(versions.get(missing))
+
+    def test_deleted_instance_version_is_dropped(self) -> None:
+        self.client.get(self.path)
+        self.assertIsNotNone(versions.get(self.user.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).delete()
+
+        self.assertIsNone(versions.get(self.user.pk))
+
+    def test_version_expires(self) -> None:
+        with mock.patch.object(versions.cache, "add", wraps=versions.cache.add) as add:
+            self.client.get(self.path)
+
+        add.assert_called_once_with(f"{versions.prefix}:{self.user.pk}", mock.ANY, versions.timeout)
+        self.assertIsNotNone(versions.timeout)
+
+    def test_version_created_meanwhile_is_not_used(self) -> None:
+        self.assertIsNotNone(versions.add(self.user.pk))
+        self.assertIsNone(versions.add(self.user.pk))
+
+    def test_bulk_created_instance_gets_version(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/users/bulk/",
+                [{"username": "bulk", "first_name": "Bulk"}],
+                content_type="application/json",
+            )
+
+        self.assertIsNotNone(versions.get(User.objects.get(username="bulk").pk))
+        self.assertEqual(response.json()[0]["status"], 201)
@@ -0,0 +1,89 @@
+"""
+Tests of database connection pools.
+"""
+import json
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from config.api import api
+from utils.db_pool import ConnectionPool, PoolTimeout
+
+
+class Connection:
+    """DB-API connection stub, `broken` ones fail on execute."""
+
+    def __init__(self, broken: bool = False) -> None:
+        self.broken = broken
+        self.closed = False
+
+    def cursor(self) -> mock.Mock:
+        cursor = mock.Mock()
+        if self.broken:
+            cursor.execute.side_effect = Exception("server closed the connection unexpectedly")
+        return cursor
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+
+    def test_released_connection_is_reused(self) -> None:
+        pool = ConnectionPool(Connection, max_size=2)
+
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(), connection)
+        self.assertEqual(pool.size, 1)
+
+    def test_full_pool_raises_timeout(self) -> None:
+        pool = ConnectionPool(Connection, max_size=1, timeout=0.01)
+        pool.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+
+    def test_broken_connection_is_replaced(self) -> None:
+        broken = Connection(broken=True)
+        pool = ConnectionPool(mock.Mock(side_effect=[broken, Connection()]), max_size=1)
+        pool.release(pool.acquire())
+
+        with self.assertLogs("utils.db_pool", "WARNING"):
+            connection = pool.acquire()
+
+        self.assertIsNot(connection, broken)
+        self.assertTrue(broken.closed)
+        self.assertEqual(pool.size, 1)
+
+    def test_expired_connection_is_closed(self) -> None:
+        pool = ConnectionPool(Connection, max_lifetime=60, max_idle=10)
+        connection = pool.acquire()
+        pool.release(connection)
+
+        with mock.patch("utils.db_pool.monotonic", return_value=pool.idle[0][1] + 10):
+            self.assertIsNot(pool.acquire(), connection)
+
+        self.assertTrue(connection.closed)
+
+    def test_connection_of_previous_pool_is_closed_on_release(self) -> None:
+        pool = ConnectionPool(Connection)
+        connection = Connection()
+
+        pool.release(connection)
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.size, 0)
+
+
+class PoolExhaustedResponseTests(SimpleTestCase):
+
+    def test_pool_timeout_returns_service_unavailable(self) -> None:
+        request = RequestFactory().get("/api/users/1/")
+
+        response = api.on_exception(request, PoolTimeout("all 10 connections are in use"))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(json.loads(response.content)["error"]["code"], "POOL_EXHAUSTED")
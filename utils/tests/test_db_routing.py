@@ -0,0 +1,150 @@
+"""
+Tests of read replica routing.
+"""
+from types import SimpleNamespace
+
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from config.route import route
+from users.models import User
+from utils import db_routing
+from utils.db_routing import STICKY_COOKIE, ReadReplica, ReplicaRouter, StickyWritesMiddleware, mark_failed
+
+
+def get_operation(run, method: str = "GET") -> SimpleNamespace:
+    """Return operation stub with the run function."""
+    def view_func():
+        pass
+
+    return SimpleNamespace(run=run, methods=[method], view_func=view_func)
+
+
+class ReadReplicaTests(SimpleTestCase):
+
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+
+    def tearDown(self) -> None:
+        db_routing.unavailable_until.clear()
+
+    def test_reads_of_safe_route_go_to_replica(self) -> None:
+        operation = get_operation(lambda request: HttpResponse(self.router.db_for_read(User)))
+        ReadReplica("replica")(operation)
+
+        response = operation.run(self.factory.get("/"))
+
+        self.assertEqual(response.content, b"replica")
+        self.assertEqual(self.router.db_for_read(User), DEFAULT_DB_ALIAS)
+
+    def test_sticky_client_reads_from_primary(self) -> None:
+        operation = get_operation(lambda request: HttpResponse(self.router.db_for_read(User)))
+        ReadReplica("replica")(operation)
+        request = self.factory.get("/")
+        request.COOKIES[STICKY_COOKIE] = "1"
+
+        self.assertEqual(operation.run(request).content, DEFAULT_DB_ALIAS.encode())
+
+    def test_failed_replica_read_is_retried_on_primary(self) -> None:
+        def run(request):
+            alias = self.router.db_for_read(User)
+            if alias == "replica":
+                error = DatabaseError("no such table: users_user")
+                mark_failed(error)
+                raise error
+            return HttpResponse(alias)
+
+        operation = get_operation(run)
+        ReadReplica("replica", cooldown=30)(operation)
+
+        with self.assertLogs("utils.db_routing", "WARNING"):
+            response = operation.run(self.factory.get("/"))
+
+        self.assertEqual(response.content, DEFAULT_DB_ALIAS.encode())
+        self.assertIn("replica", db_routing.unavailable_until)
+        # replica is skipped during cooldown
+        self.assertEqual(operation.run(self.factory.get("/")).content, DEFAULT_DB_ALIAS.encode())
+
+    def test_unsafe_route_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            ReadReplica("replica")(get_operation(lambda request: HttpResponse(), method="POST"))
+
+    @override_settings(API_READ_REPLICA="replica")
+    def test_replica_setting_applies_only_to_get_routes(self) -> None:
+        def view(self, request):
+            pass
+
+        get_view = route.get("/")(view)
+        post_view = route.post("/")(view)
+
+        self.assertTrue(any(isinstance(c, ReadReplica) for c in get_view._ninja_contribute_to_operation))
+        self.assertFalse(any(isinstance(c, ReadReplica) for c in post_view._ninja_contribute_to_operation))
+
+    def test_replica_option_is_rejected_for_post_routes(self) -> None:
+        with self.assertRaises(ValueError):
+            route.post("/", replica="replica")
+
+
+class StickyWritesMiddlewareTests(SimpleTestCase):
+
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+
+    def test_not_used_without_replica(self) -> None:
+        with self.assertRaises(MiddlewareNotUsed):
+            StickyWritesMiddleware(lambda request: HttpResponse())
+
+    @override_settings(API_READ_REPLICA="replica", API_READ_REPLICA_STICKY_SECONDS=7)
+    def test_successful_write_sets_cookie(self) -> None:
+        middleware = StickyWritesMiddleware(lambda request: HttpResponse(status=201))
+
+        response = middleware(self.factory.post("/"))
+
+        self.assertEqual(response.cookies[STICKY_COOKIE]["max-age"], 7)
+
+    @override_settings(API_READ_REPLICA="replica")
+    def test_reads_and_failed_writes_do_not_set_cookie(self) -> None:
+        self.assertNotIn(
+            STICKY_COOKIE,
+            StickyWritesMiddleware(lambda request: HttpResponse())(self.factory.get("/")).cookies,
+        )
+        self.assertNotIn(
+            STICKY_COOKIE,
+            StickyWritesMiddleware(lambda request: HttpResponse(status=422))(self.factory.post("/")).cookies,
+        )
+
+
+class StickyCacheBypassTests(TestCase):
+
+    def setUp(self) -> None:
+        for backend in caches.all():
+            backend.clear()
+        self.user = User.objects.create(username="sticky", first_name="Before")
+        self.path = f"/api/users/{self.user.pk}/"
+
+    def change_without_signals(self) -> None:
+        """Change the user like a write that the cache of a lagging replica read doesn't see yet."""
+        User.objects.filter(pk=self.user.pk).update(first_name="After")
+
+    def test_sticky_client_skips_response_cache(self) -> None:
+        self.assertEqual(self.client.get(self.path).json()["firstName"], "Before")
+        self.change_without_signals()
+
+        self.assertEqual(self.client.get(self.path).json()["firstName"], "Before")
+
+        self.client.cookies[STICKY_COOKIE] = "1"
+        self.assertEqual(self.client.get(self.path).json()["firstName"], "After")
+
+    def test_sticky_client_skips_conditional_get(self) -> None:
+        etag = self.client.get(self.path)["ETag"]
+        self.assertEqual(self.client.get(self.path, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.cookies[STICKY_COOKIE] = "1"
+        response = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
@@ -0,0 +1,90 @@
+"""
+Tests of DjangoSchema batch helpers.
+"""
+import typing as t
+
+from django.test import TestCase
+
+from users.models import User
+from users.schemas import UserResponseBaseSchema
+from utils.django_schema import DjangoSchema, get_values_fields
+
+
+class ResolvedNameSchema(DjangoSchema):
+    """Schema with resolver, it can't be built from column values."""
+
+    id: int
+    full_name: str
+
+    @staticmethod
+    def resolve_full_name(obj) -> str:
+        return f"{obj.first_name} {obj.last_name}"
+
+
+class AuthenticatedSchema(DjangoSchema):
+    """Schema with required field that is a model property, not a column."""
+
+    username: str
+    is_authenticated: bool
+
+
+class ComputedSchema(DjangoSchema):
+    """Schema with field computed after validation and adjusted by caller."""
+
+    username: str
+    initials: t.Optional[str] = None
+    viewer: t.Optional[str] = None
+
+    def compute(self):
+        self.initials = self.username[:2].upper()
+
+    def adjust(self, **kwargs):
+        self.viewer = kwargs.get("viewer")
+        return self
+
+
+class FromBatchTests(TestCase):
+
+    def setUp(self) -> None:
+        User.objects.bulk_create(
+            User(username=f"user{index}", first_name="John", last_name=f"Doe{index}") for index in range(3)
+        )
+        self.users = list(User.objects.order_by("pk"))
+
+    def assertSameAsFromOrm(self, schema_class: type[DjangoSchema], batch: list) -> None:
+        expected = [schema_class.from_orm(user).model_dump() for user in self.users]
+        self.assertEqual([obj.model_dump() for obj in batch], expected)
+
+    def test_instances(self) -> None:
+        self.assertSameAsFromOrm(UserResponseBaseSchema, UserResponseBaseSchema.from_batch(self.users))
+
+    def test_queryset_is_read_as_values(self) -> None:
+        self.assertEqual(get_values_fields(UserResponseBaseSchema, User), ["username", "first_name", "id"])
+
+        with self.assertNumQueries(1):
+            batch = UserResponseBaseSchema.from_batch(User.objects.order_by("pk"))
+
+        self.assertSameAsFromOrm(UserResponseBaseSchema, batch)
+
+    def test_schema_with_resolver_falls_back_to_instances(self) -> None:
+        self.assertIsNone(get_values_fields(ResolvedNameSchema, User))
+
+        batch = ResolvedNameSchema.from_batch(User.objects.order_by("pk"))
+
+        self.assertSameAsFromOrm(ResolvedNameSchema, batch)
+        self.assertEqual(batch[0].full_name, "John Doe0")
+
+    def test_schema_with_required_non_model_field_falls_back_to_instances(self) -> None:
+        self.assertIsNone(get_values_fields(AuthenticatedSchema, User))
+
+        batch = AuthenticatedSchema.from_batch(User.objects.order_by("pk"))
+
+        self.assertSameAsFromOrm(AuthenticatedSchema, batch)
+        self.assertTrue(batch[0].is_authenticated)
+
+    def test_batch_is_computed_and_adjusted(self) -> None:
+        batch = ComputedSchema.from_batch_adjusted(User.objects.order_by("pk"), viewer="admin")
+
+        self.assertEqual([obj.initials for obj in batch], ["US"] * 3)
+        self.assertEqual([obj.viewer for obj in batch], ["admin"] * 3)
+        self.assertSameAsFromOrm(ComputedSchema, ComputedSchema.from_batch(self.users))
@@ -0,0 +1,68 @@
+"""
+Tests of the api error catalog.
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import SystemCheckError
+from django.test import SimpleTestCase, override_settings
+
+from users.api_errors import NotFoundException
+from utils.base_exceptions import DefaultHTTPException
+from utils.error_catalog import error_catalog
+
+
+class ErrorCatalogTests(SimpleTestCase):
+
+    def test_duplicate_code_fails_at_class_creation(self) -> None:
+        with mock.patch.object(error_catalog, "frozen", False):
+            with self.assertRaisesMessage(ImproperlyConfigured, "USER_NOT_FOUND"):
+                class DuplicateException(DefaultHTTPException):
+                    error = "USER_NOT_FOUND"
+                    message = "Duplicate"
+
+        self.assertIs(error_catalog["USER_NOT_FOUND"].exception, NotFoundException)
+
+    def test_class_created_after_freeze_is_rejected(self) -> None:
+        with self.assertRaisesMessage(ImproperlyConfigured, "frozen"):
+            class LateException(DefaultHTTPException):
+                error = "LATE_ERROR"
+                message = "Late"
+
+        self.assertNotIn("LATE_ERROR", error_catalog)
+
+    def test_variant_inherits_entry_of_registered_class(self) -> None:
+        class MissingUserException(NotFoundException):
+            message = "User was removed"
+
+        self.assertIsNone(error_catalog.get_entry(MissingUserException))
+        self.assertEqual(error_catalog.get_entry(NotFoundException).status_code, 404)
+
+    def test_export_command_writes_codes_and_statuses(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "errors.json")
+            call_command("export_error_catalog", output, stdout=StringIO())
+
+            with open(output, encoding="utf-8") as file:
+                errors = json.load(file)["errors"]
+
+        statuses = {error["code"]: error["status"] for error in errors}
+        self.assertEqual(list(statuses), sorted(entry.code for entry in error_catalog))
+        self.assertEqual(statuses["USER_NOT_FOUND"], 404)
+        self.assertEqual(statuses["NOT_AUTHENTICATED"], 401)
+        self.assertEqual(statuses["RATE_LIMITED"], 429)
+        self.assertEqual(statuses["POOL_EXHAUSTED"], 503)
+
+
+class CheckCommandTests(SimpleTestCase):
+
+    def test_deploy_check_reports_local_memory_version_cache(self) -> None:
+        call_command("check", stdout=StringIO(), stderr=StringIO())
+
+        with self.assertRaisesMessage(SystemCheckError, "utils.W001"):
+            call_command("check", "--deploy", "--fail-level", "WARNING", stdout=StringIO(), stderr=StringIO())
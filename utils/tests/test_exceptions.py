@@ -0,0 +1,114 @@
+"""
+Tests of api exceptions and their error response envelope.
+"""
+import json
+
+from django.core.cache import caches
+from django.test import RequestFactory, TestCase, override_settings
+
+from config.api import api
+from users.api_errors import NotFoundException
+from users.models import User
+from utils.base_exceptions import UnauthorizedException
+from utils.error_responses import ErrorResponseRegistry
+
+
+class ErrorEnvelopeTests(TestCase):
+
+    def setUp(self) -> None:
+        for backend in caches.all():
+            backend.clear()
+        self.request = RequestFactory().get("/api/users/1/")
+
+    def test_not_found_route_returns_error_envelope(self) -> None:
+        response = self.client.get("/api/users/999/")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            response.json(),
+            {"status": 404, "error": {"code": "USER_NOT_FOUND", "details": {"message": "NOT FOUND"}}},
+        )
+
+    def test_failed_authentication_returns_error_envelope(self) -> None:
+        response = self.client.get("/api/users/me/")
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["error"]["code"], "NOT_AUTHENTICATED")
+
+    def test_authenticated_route_returns_current_user(self) -> None:
+        self.client.force_login(User.objects.create(username="current"))
+
+        response = self.client.get("/api/users/me/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["username"], "current")
+
+    def test_custom_message_and_field_are_serialized(self) -> None:
+        response = api.on_exception(self.request, NotFoundException("User was removed", field="user_id"))
+
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "status": 404,
+                "error": {"code": "USER_NOT_FOUND", "details": {"message": "User was removed", "field": "user_id"}},
+            },
+        )
+
+    def test_default_body_is_serialized_once(self) -> None:
+        registry = ErrorResponseRegistry()
+
+        body = registry.get_body(NotFoundException())
+
+        self.assertIs(registry.get_body(NotFoundException()), body)
+        self.assertIsNot(registry.get_body(NotFoundException("User was removed")), body)
+
+    def test_lazy_message_body_is_cached_per_language(self) -> None:
+        registry = ErrorResponseRegistry()
+
+        body = registry.get_body(UnauthorizedException())
+
+        self.assertEqual(json.loads(body)["error"]["details"]["message"], "Credentials were not provided.")
+        self.assertIn((UnauthorizedException, "en-us"), registry._bodies)
+
+    def test_raises_create_new_instances(self) -> None:
+        self.assertIsNot(NotFoundException(), NotFoundException())
+
+    def test_instance_stores_only_overrides(self) -> None:
+        self.assertEqual(vars(NotFoundException()), {})
+        self.assertEqual(vars(NotFoundException(field="user_id")), {"field": "user_id"})
+        self.assertEqual(NotFoundException().status_code, 404)
+
+    def test_lazy_default_message_is_str(self) -> None:
+        self.assertEqual(str(UnauthorizedException()), "Credentials were not provided.")
+        self.assertEqual(str(UnauthorizedException("Token expired")), "Token expired")
+
+    @override_settings(DEBUG=False)
+    def test_handled_exception_drops_traceback_and_context(self) -> None:
+        try:
+            try:
+                raise User.DoesNotExist
+            except User.DoesNotExist:
+                raise NotFoundException
+        except NotFoundException as exc:
+            handled = exc
+            api.on_exception(self.request, exc)
+
+        self.assertIsNone(handled.__traceback__)
+        self.assertIsNone(handled.__context__)
+
+    def test_raised_exception_does_not_share_traceback(self) -> None:
+        raised = []
+        for _ in range(2):
+            try:
+                try:
+                    raise User.DoesNotExist
+                except User.DoesNotExist:
+                    raise NotFoundException
+            except NotFoundException as exc:
+                raised.append(exc)
+
+        first, second = raised
+        self.assertIsNot(first, second)
+        self.assertIsNone(first.__traceback__.tb_next)
+        self.assertIsInstance(second.__context__, User.DoesNotExist)
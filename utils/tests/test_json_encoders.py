@@ -0,0 +1,63 @@
+"""
+Tests of JSON encoder backends.
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import override
+
+from utils.json_encoders import ENCODER_BACKENDS, MsgspecEncoder
+
+UTC_DATETIME = datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc)
+
+VALUES = {
+    "lazy string": _("Invalid credentials."),
+    "decimal": decimal.Decimal("1.10"),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "date": datetime.date(2024, 1, 2),
+    "datetime": UTC_DATETIME,
+    "naive datetime": UTC_DATETIME.replace(tzinfo=None),
+    "time": datetime.time(3, 4, 5, 123456),
+    "timedelta": datetime.timedelta(days=1, seconds=5),
+}
+
+# values msgspec encodes natively in its own format, see MsgspecEncoder
+MSGSPEC_FORMATS = {
+    "datetime": b'"2024-01-02T03:04:05.123456Z"',
+    "naive datetime": b'"2024-01-02T03:04:05.123456"',
+    "time": b'"03:04:05.123456"',
+    "timedelta": b'"P1DT5S"',
+}
+
+
+class JSONEncoderBackendTests(SimpleTestCase):
+
+    def test_backends_match_django_encoder(self) -> None:
+        for backend, (encoder_class, module) in ENCODER_BACKENDS.items():
+            for name, value in VALUES.items():
+                with self.subTest(backend=backend, value=name):
+                    if module is None:
+                        self.skipTest(f"{backend} is not installed")
+
+                    expected = json.dumps({"value": value}, cls=DjangoJSONEncoder).encode()
+                    if encoder_class is MsgspecEncoder and name in MSGSPEC_FORMATS:
+                        expected = b'{"value":' + MSGSPEC_FORMATS[name] + b"}"
+
+                    self.assertEqual(
+                        json.loads(encoder_class().dumps({"value": value})),
+                        json.loads(expected),
+                    )
+
+    def test_lazy_string_is_encoded_in_active_language(self) -> None:
+        for backend, (encoder_class, module) in ENCODER_BACKENDS.items():
+            with self.subTest(backend=backend):
+                if module is None:
+                    self.skipTest(f"{backend} is not installed")
+
+                with override("en"):
+                    self.assertEqual(encoder_class().dumps([_("Invalid credentials.")]), b'["Invalid credentials."]')
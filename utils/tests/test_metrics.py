@@ -0,0 +1,123 @@
+"""
+Tests of api metrics sinks.
+"""
+import socket
+import threading
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from utils.metrics import ERRORS_TOTAL, InProcessMetrics, MetricsSink, StatsDMetrics
+
+LABELS = (("code", "USER_NOT_FOUND"), ("status", "404"))
+
+
+def record_in_thread(sink: MetricsSink) -> threading.Thread:
+    """Record one error and one handler time in a finished thread."""
+    def record():
+        sink.increment(ERRORS_TOTAL, LABELS)
+        sink.observe("api_error_handler_seconds", LABELS, 0.002)
+
+    thread = threading.Thread(target=record)
+    thread.start()
+    thread.join()
+    return thread
+
+
+class MetricsSinkTests(SimpleTestCase):
+
+    def test_sink_must_implement_recording_methods(self) -> None:
+        class CounterSink(MetricsSink):
+            def increment(self, name, labels, value=1):
+                pass
+
+        with self.assertRaises(TypeError):
+            CounterSink()
+
+
+class InProcessMetricsTests(SimpleTestCase):
+
+    def test_finished_thread_values_are_kept_and_shard_dropped(self) -> None:
+        sink = InProcessMetrics()
+
+        thread = record_in_thread(sink)
+        record_in_thread(sink)
+        sink.increment(ERRORS_TOTAL, LABELS)
+
+        counters, histograms = sink.collect()
+        self.assertEqual(counters[(ERRORS_TOTAL, LABELS)], 3)
+        self.assertEqual(sum(histograms[("api_error_handler_seconds", LABELS)][:-1]), 2)
+        self.assertNotIn(thread, sink._shards)
+        self.assertEqual(list(sink._shards), [threading.current_thread()])
+
+    def test_export(self) -> None:
+        sink = InProcessMetrics()
+        sink.increment(ERRORS_TOTAL, LABELS)
+
+        self.assertIn('api_errors_total{code="USER_NOT_FOUND",status="404"} 1\n', sink.export())
+
+
+class MetricsViewTests(SimpleTestCase):
+
+    def setUp(self) -> None:
+        self.sink = InProcessMetrics()
+        self.sink.increment(ERRORS_TOTAL, LABELS)
+        self.factory = RequestFactory()
+
+    def test_endpoint_is_not_served_by_default(self) -> None:
+        self.assertEqual(self.client.get("/metrics/").status_code, 404)
+
+    def test_allowed_client_gets_metrics(self) -> None:
+        response = self.sink.view(self.factory.get("/metrics/", REMOTE_ADDR="127.0.0.1"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"api_errors_total", response.content)
+
+    def test_other_clients_are_forbidden(self) -> None:
+        response = self.sink.view(self.factory.get("/metrics/", REMOTE_ADDR="203.0.113.5"))
+
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(API_METRICS_ALLOWED_IPS=None)
+    def test_allow_list_can_be_disabled(self) -> None:
+        response = self.sink.view(self.factory.get("/metrics/", REMOTE_ADDR="203.0.113.5"))
+
+        self.assertEqual(response.status_code, 200)
+
+
+class StatsDMetricsTests(SimpleTestCase):
+
+    def setUp(self) -> None:
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.settimeout(5)
+        self.sink = StatsDMetrics(*self.server.getsockname(), flush_interval=0.01)
+
+    def tearDown(self) -> None:
+        self.sink.close()
+        self.server.close()
+
+    def test_metrics_of_idle_thread_are_flushed_by_timer(self) -> None:
+        thread = record_in_thread(self.sink)
+
+        # the timer may fire between the two records
+        lines = set()
+        while len(lines) < 2:
+            lines.update(self.server.recv(4096).decode().split("\n"))
+
+        self.assertEqual(
+            lines,
+            {
+                "api_errors_total:1|c|#code:USER_NOT_FOUND,status:404",
+                "api_error_handler:2.0000|ms|#code:USER_NOT_FOUND,status:404",
+            },
+        )
+        self.sink.flush()
+        self.assertNotIn(thread, self.sink._shards)
+
+    def test_close_sends_remaining_metrics(self) -> None:
+        self.sink.flush_interval = 60
+        self.sink.increment(ERRORS_TOTAL, LABELS, 2)
+
+        self.sink.close()
+
+        self.assertEqual(self.server.recv(4096).decode(), "api_errors_total:2|c|#code:USER_NOT_FOUND,status:404")
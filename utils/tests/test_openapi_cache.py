@@ -0,0 +1,86 @@
+"""
+Tests of the persisted OpenAPI schema cache.
+"""
+import gzip
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+from ninja import Router
+
+from config.api import api
+from utils.openapi_cache import CachedSchemaAPI, OpenAPISchemaCache
+
+
+class OpenAPISchemaCacheTests(SimpleTestCase):
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.factory = RequestFactory()
+
+    def get(self, cache: OpenAPISchemaCache, **headers):
+        return cache.response(self.factory.get("/api/openapi.json", headers=headers))
+
+    def test_cold_render_writes_schema_files(self) -> None:
+        response = self.get(OpenAPISchemaCache(api, self.directory))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("/api/users/{user_id}/", json.loads(response.content)["paths"])
+        self.assertEqual(len(list(self.directory.glob("openapi-*.json"))), 1)
+        self.assertEqual(len(list(self.directory.glob("openapi-*.json.gz"))), 1)
+
+    def test_warm_worker_maps_stored_schema(self) -> None:
+        body = self.get(OpenAPISchemaCache(api, self.directory)).content
+
+        cache = OpenAPISchemaCache(api, self.directory)
+        with mock.patch.object(cache, "build") as build:
+            response = self.get(cache)
+
+        build.assert_not_called()
+        self.assertEqual(response.content, body)
+
+    def test_gzip_response(self) -> None:
+        cache = OpenAPISchemaCache(api, self.directory)
+        body = self.get(cache).content
+
+        response = self.get(cache, accept_encoding="gzip, deflate")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), body)
+
+    def test_matching_etag_returns_not_modified(self) -> None:
+        cache = OpenAPISchemaCache(api, self.directory)
+        etag = self.get(cache)["ETag"]
+
+        response = self.get(cache, if_none_match=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_route_change_rebuilds_schema_and_deletes_stale_files(self) -> None:
+        router = Router()
+
+        @router.get("/first/")
+        def first(request):
+            pass
+
+        local_api = CachedSchemaAPI(urls_namespace="openapi_cache_test")
+        local_api.add_router("/items", router)
+
+        before = OpenAPISchemaCache(local_api, self.directory).get("/api/")
+
+        @router.get("/second/")
+        def second(request):
+            pass
+
+        after = OpenAPISchemaCache(local_api, self.directory).get("/api/")
+
+        self.assertNotEqual(after.fingerprint, before.fingerprint)
+        self.assertIn("/api/items/second/", json.loads(after.body[:])["paths"])
+        files = sorted(file_path.name for file_path in self.directory.iterdir())
+        self.assertEqual(len(files), 2)
+        self.assertTrue(all(after.fingerprint in name for name in files))
@@ -0,0 +1,61 @@
+"""
+Tests of keyset pagination.
+"""
+from django.core.cache import caches
+from django.test import TestCase
+
+from users.models import User
+from utils.pagination import KeysetPagination
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self) -> None:
+        for backend in caches.all():
+            backend.clear()
+        User.objects.bulk_create(User(username=f"page{index}", first_name="John") for index in range(5))
+
+    def get_page(self, **params) -> dict:
+        response = self.client.get("/api/users/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursors_walk_all_rows_once(self) -> None:
+        usernames = []
+        page = self.get_page(page_size=2)
+        while True:
+            usernames.extend(item["username"] for item in page["items"])
+            if page["nextCursor"] is None:
+                break
+            page = self.get_page(page_size=2, cursor=page["nextCursor"])
+
+        expected = list(User.objects.order_by("-date_joined", "-pk").values_list("username", flat=True))
+        self.assertEqual(usernames, expected)
+
+    def test_page_is_single_query(self) -> None:
+        cursor = self.get_page(page_size=2)["nextCursor"]
+
+        with self.assertNumQueries(1):
+            self.get_page(page_size=2, cursor=cursor)
+
+    def test_tampered_cursor_is_rejected(self) -> None:
+        cursor = self.get_page(page_size=2)["nextCursor"]
+
+        response = self.client.get("/api/users/", {"cursor": cursor[:-1] + ("A" if cursor[-1] != "A" else "B")})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], "INVALID_CURSOR")
+
+    def test_cursor_of_other_ordering_is_rejected(self) -> None:
+        cursor = KeysetPagination(ordering="username").encode_cursor(["page1", 1])
+
+        response = self.client.get("/api/users/", {"cursor": cursor})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], "INVALID_CURSOR")
+
+    def test_page_size_over_limit_is_rejected(self) -> None:
+        response = self.client.get("/api/users/", {"page_size": 201})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], "PAGE_SIZE_TOO_LARGE")
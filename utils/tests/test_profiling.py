@@ -0,0 +1,70 @@
+"""
+Tests of sampled route profiling.
+"""
+import tempfile
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from utils import profiling
+from utils.profiling import RouteProfiler, current_profile
+
+
+class Operation:
+    """Operation stub with api and view function."""
+
+    def __init__(self) -> None:
+        self.api = mock.Mock()
+
+        def view_func():
+            pass
+
+        self.view_func = view_func
+
+
+class RouteProfilerTests(SimpleTestCase):
+
+    def setUp(self) -> None:
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.output_dir.cleanup)
+        self.operation = Operation()
+        self.request = RequestFactory().get("/")
+
+    def test_one_request_of_the_process_is_profiled_at_a_time(self) -> None:
+        first = RouteProfiler(sample_rate=1, output_dir=self.output_dir.name)
+        second = RouteProfiler(sample_rate=1, output_dir=self.output_dir.name)
+
+        first_started = first.start(self.operation)
+        second_started = second.start(self.operation)
+        second.finish(self.operation, self.request, None, second_started)
+        first.finish(self.operation, self.request, None, first_started)
+
+        self.assertTrue(first_started[2])
+        self.assertFalse(second_started[2])
+        self.assertFalse(profiling.profile_lock.locked())
+        self.assertIsNone(current_profile.get())
+
+    def test_request_is_timed_only_when_other_profiler_is_active(self) -> None:
+        profiler = RouteProfiler(sample_rate=1, output_dir=self.output_dir.name)
+        profiler.profile = mock.Mock()
+        profiler.profile.enable.side_effect = ValueError("Another profiling tool is already active")
+
+        started = profiler.start(self.operation)
+
+        self.assertFalse(started[2])
+        self.assertFalse(profiling.profile_lock.locked())
+        self.assertIs(current_profile.get(), started[0])
+        with self.assertLogs("utils.profiling", "INFO"):
+            profiler.finish(self.operation, self.request, None, started)
+        self.assertIsNone(current_profile.get())
+
+    def test_lock_is_released_when_stats_are_not_dumped(self) -> None:
+        profiler = RouteProfiler(sample_rate=1, output_dir=self.output_dir.name)
+        profiler.profile = mock.Mock()
+        profiler.profile.dump_stats.side_effect = OSError("No space left on device")
+
+        started = profiler.start(self.operation)
+        with self.assertLogs("utils.profiling", "WARNING"):
+            profiler.finish(self.operation, self.request, None, started)
+
+        self.assertFalse(profiling.profile_lock.locked())
@@ -0,0 +1,77 @@
+"""
+Tests of route query budgets.
+"""
+import json
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from config.api import api
+from users.models import User
+from utils.metrics import QUERY_BUDGET_EXCEEDED_TOTAL
+from utils.query_budget import QueryBudget, current_usage
+
+
+class Operation:
+    """Operation stub with api and `run` that runs the given number of queries."""
+
+    def __init__(self, api, queries: int) -> None:
+        self.api = api
+
+        def view_func():
+            pass
+
+        def run(request, **kwargs):
+            for _ in range(queries):
+                User.objects.exists()
+            return HttpResponse("ok")
+
+        self.view_func = view_func
+        self.run = run
+
+
+class QueryBudgetTests(TestCase):
+
+    def setUp(self) -> None:
+        self.request = RequestFactory().get("/api/users/")
+
+    def run_operation(self, operation: Operation, budget: QueryBudget) -> HttpResponse:
+        budget(operation)
+        return operation.run(self.request)
+
+    def test_request_within_budget_is_returned(self) -> None:
+        response = self.run_operation(Operation(api, queries=2), QueryBudget(max_queries=2))
+
+        self.assertEqual(response.content, b"ok")
+        self.assertIsNone(current_usage.get())
+
+    @override_settings(API_QUERY_BUDGET_RAISE=True)
+    def test_over_budget_request_returns_error_in_debug_mode(self) -> None:
+        response = self.run_operation(Operation(api, queries=3), QueryBudget(max_queries=2))
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(json.loads(response.content)["error"]["code"], "QUERY_BUDGET_EXCEEDED")
+
+    @override_settings(API_QUERY_BUDGET_RAISE=False)
+    def test_over_budget_request_is_logged_and_counted(self) -> None:
+        operation = Operation(mock.Mock(), queries=3)
+
+        with self.assertLogs("utils.query_budget", "WARNING") as logs:
+            response = self.run_operation(operation, QueryBudget(max_queries=2))
+
+        self.assertEqual(response.content, b"ok")
+        self.assertIn("ran 3 queries", logs.output[0])
+        operation.api.metrics.increment.assert_called_once_with(QUERY_BUDGET_EXCEEDED_TOTAL, mock.ANY)
+
+    def test_usage_is_reset_when_request_fails(self) -> None:
+        operation = Operation(api, queries=0)
+        operation.run = mock.Mock(side_effect=RuntimeError)
+
+        with self.assertRaises(RuntimeError):
+            self.run_operation(operation, QueryBudget(max_queries=2))
+
+        self.assertIsNone(current_usage.get())
+
+    def test_budget_is_described(self) -> None:
+        self.assertEqual(str(QueryBudget(max_queries=1, max_db_time=0.05)), "1 query and 50ms of query time")
@@ -0,0 +1,102 @@
+"""
+Tests of queryset projection from schemas.
+"""
+import typing as t
+
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from users.models import User
+from users.schemas import UserResponseBaseSchema
+from utils.django_schema import DjangoSchema
+from utils.query_projection import get_projection, projected_view
+
+
+class ContentTypeSchema(DjangoSchema):
+    app_label: str
+    model: str
+
+
+class PermissionSchema(DjangoSchema):
+    codename: str
+    content_type: ContentTypeSchema
+
+
+class GroupSchema(DjangoSchema):
+    name: str
+
+
+class UserGroupsSchema(DjangoSchema):
+    username: str
+    groups: t.List[GroupSchema]
+
+
+class ResolvedSchema(DjangoSchema):
+    username: str
+    display_name: str
+
+    @staticmethod
+    def resolve_display_name(obj) -> str:
+        return obj.get_full_name()
+
+
+class ProjectionTests(TestCase):
+
+    def test_only_schema_columns_are_loaded(self) -> None:
+        projection = get_projection(UserResponseBaseSchema, User)
+
+        self.assertEqual(projection.only, ("username", "first_name", "id"))
+        self.assertEqual(projection.select_related, ())
+
+    def test_foreign_key_schema_is_selected_related(self) -> None:
+        projection = get_projection(PermissionSchema, Permission)
+
+        self.assertEqual(projection.select_related, ("content_type",))
+        self.assertEqual(
+            projection.only,
+            ("codename", "content_type", "content_type__app_label", "content_type__model"),
+        )
+
+        with self.assertNumQueries(1):
+            permissions = [PermissionSchema.from_orm(obj) for obj in PermissionSchema.project(Permission.objects)]
+
+        self.assertTrue(permissions)
+
+    def test_many_to_many_schema_is_prefetched(self) -> None:
+        groups = [Group.objects.create(name=f"group{index}") for index in range(2)]
+        for index in range(3):
+            User.objects.create(username=f"user{index}").groups.set(groups)
+
+        with self.assertNumQueries(2):
+            users = [UserGroupsSchema.from_orm(obj) for obj in UserGroupsSchema.project(User.objects)]
+
+        self.assertEqual([len(user.groups) for user in users], [2, 2, 2])
+        self.assertEqual(get_projection(UserGroupsSchema, User).only, ("username",))
+
+    def test_schema_with_resolver_loads_all_columns(self) -> None:
+        self.assertIsNone(get_projection(ResolvedSchema, User).only)
+
+    def test_view_result_is_projected(self) -> None:
+        view = projected_view(lambda: User.objects.all(), UserResponseBaseSchema)
+
+        self.assertEqual(view().query.deferred_loading, ({"username", "first_name", "id"}, False))
+
+
+class ListUsersQueryTests(TestCase):
+
+    def setUp(self) -> None:
+        for backend in caches.all():
+            backend.clear()
+        User.objects.bulk_create(User(username=f"user{index}", first_name="John") for index in range(20))
+
+    def test_page_is_one_query_of_schema_columns(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/users/", {"page_size": 10})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["items"]), 10)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("password", queries[0]["sql"])
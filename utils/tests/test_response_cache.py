@@ -0,0 +1,99 @@
+"""
+Tests of route response cache.
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from users.models import User
+from utils.checks import check_shared_caches
+from utils.response_cache import ResponseCache
+
+
+class ResponseCacheTests(TestCase):
+
+    def setUp(self) -> None:
+        for backend in caches.all():
+            backend.clear()
+        self.user = User.objects.create(username="cached", first_name="Before")
+        self.path = f"/api/users/{self.user.pk}/"
+
+    def test_cached_response_is_returned_until_model_is_saved(self) -> None:
+        self.client.get(self.path)
+        User.objects.filter(pk=self.user.pk).update(first_name="After")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.path).json()["firstName"], "Before")
+
+        self.user.first_name = "After"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        self.assertEqual(self.client.get(self.path).json()["firstName"], "After")
+
+    def test_not_found_response_is_cached(self) -> None:
+        path = f"/api/users/{self.user.pk + 1}/"
+        self.assertEqual(self.client.get(path).status_code, 404)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(path)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()["error"]["code"], "USER_NOT_FOUND")
+
+    def test_bulk_create_invalidates_cached_responses(self) -> None:
+        path = f"/api/users/{self.user.pk + 1}/"
+        self.assertEqual(self.client.get(path).status_code, 404)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/users/bulk/",
+                [{"username": "bulk", "first_name": "Bulk"}],
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.json()[0]["status"], 201)
+        self.assertEqual(self.client.get(path).json()["username"], "bulk")
+
+
+class ResponseCacheLockTests(SimpleTestCase):
+
+    def test_waiting_request_computes_response_when_lock_is_released_without_it(self) -> None:
+        response_cache = ResponseCache(cache_alias="local", version_cache_alias="default", lock_timeout=5)
+        view = response_cache.wrap_view(lambda controller: HttpResponse("computed"))
+        request = RequestFactory().get("/api/users/1/")
+        controller = SimpleNamespace(context=SimpleNamespace(request=request, response=HttpResponse()))
+
+        # other request computes the response and fails, e.g. with 500
+        lock_key = f"{response_cache.get_key(request)}:lock"
+        response_cache.cache.add(lock_key, 1)
+        timer = threading.Timer(0.05, caches["local"].delete, [lock_key])
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        start = time.monotonic()
+        response = view(controller)
+
+        self.assertEqual(response.content, b"computed")
+        self.assertLess(time.monotonic() - start, 1)
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+
+    def test_local_memory_cache_is_reported(self) -> None:
+        self.assertEqual([warning.id for warning in check_shared_caches(None)], ["utils.W001"])
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache"}})
+    def test_file_based_cache_is_reported(self) -> None:
+        warnings = check_shared_caches(None)
+
+        self.assertEqual([warning.id for warning in warnings], ["utils.W001"])
+        self.assertIn("isn't atomic", warnings[0].msg)
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}})
+    def test_shared_cache_is_accepted(self) -> None:
+        self.assertEqual(check_shared_caches(None), [])
@@ -0,0 +1,136 @@
+"""
+Tests of streamed responses.
+"""
+import json
+
+from django.test import SimpleTestCase, TestCase
+
+from users.api_errors import NotFoundException
+from users.models import User
+from users.schemas import UserBaseSchema
+from utils.streaming import NDJSON, StreamSerializer, streamed_view
+
+ROWS = [{"username": f"user{index}", "first_name": "John"} for index in range(5)]
+
+
+def rows_then(exc: Exception, count: int = 2):
+    """Yield some rows and raise the exception mid-stream."""
+    yield from ROWS[:count]
+    raise exc
+
+
+async def arows(rows):
+    """Yield rows asynchronously."""
+    for row in rows:
+        yield row
+
+
+async def arows_then(exc: Exception, count: int = 2):
+    """Yield some rows asynchronously and raise the exception mid-stream."""
+    for row in ROWS[:count]:
+        yield row
+    raise exc
+
+
+def read(response) -> list[bytes]:
+    return list(response.streaming_content)
+
+
+async def aread(response) -> list[bytes]:
+    return [chunk async for chunk in response.streaming_content]
+
+
+class StreamSerializerTests(SimpleTestCase):
+
+    def test_json_array(self) -> None:
+        response = StreamSerializer(UserBaseSchema).response(ROWS)
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        body = json.loads(b"".join(read(response)))
+        self.assertEqual(body[0], {"username": "user0", "firstName": "John"})
+        self.assertEqual(len(body), 5)
+
+    def test_ndjson(self) -> None:
+        response = StreamSerializer(UserBaseSchema, stream_format=NDJSON).response(ROWS)
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(read(response)).splitlines()
+        self.assertEqual([json.loads(line)["username"] for line in lines], [row["username"] for row in ROWS])
+
+    def test_rows_are_grouped_by_chunk_size(self) -> None:
+        chunks = read(StreamSerializer(UserBaseSchema, chunk_size=2).response(ROWS))
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(len(json.loads(b"".join(chunks))), 5)
+
+    def test_empty_result(self) -> None:
+        for stream_format, body in (("json", b"[]"), (NDJSON, b"\n")):
+            with self.subTest(stream_format):
+                response = StreamSerializer(UserBaseSchema, stream_format=stream_format).response([])
+                self.assertEqual(b"".join(read(response)), body)
+
+    def test_api_exception_mid_stream_is_last_item(self) -> None:
+        response = StreamSerializer(UserBaseSchema).response(rows_then(NotFoundException()))
+
+        body = json.loads(b"".join(read(response)))
+        self.assertEqual(len(body), 3)
+        self.assertEqual(
+            body[-1],
+            {"status": 404, "error": {"code": "USER_NOT_FOUND", "details": {"message": "NOT FOUND"}}},
+        )
+
+    def test_unexpected_exception_mid_stream_is_logged(self) -> None:
+        serializer = StreamSerializer(UserBaseSchema, stream_format=NDJSON)
+
+        with self.assertLogs("utils.streaming", "ERROR"):
+            lines = b"".join(read(serializer.response(rows_then(RuntimeError("connection lost"))))).splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[-1])["error"]["code"], "INTERNAL_SERVER_ERROR")
+
+    def test_error_of_first_row_is_raised_before_response(self) -> None:
+        with self.assertRaises(NotFoundException):
+            StreamSerializer(UserBaseSchema).response(rows_then(NotFoundException(), count=0))
+
+    async def test_async_json_array(self) -> None:
+        response = await StreamSerializer(UserBaseSchema, chunk_size=2).aresponse(arows(ROWS))
+
+        chunks = await aread(response)
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(json.loads(b"".join(chunks))[4]["username"], "user4")
+
+    async def test_async_empty_result(self) -> None:
+        response = await StreamSerializer(UserBaseSchema, stream_format=NDJSON).aresponse(arows([]))
+
+        self.assertEqual(b"".join(await aread(response)), b"\n")
+
+    async def test_async_exception_mid_stream_is_last_item(self) -> None:
+        response = await StreamSerializer(UserBaseSchema).aresponse(arows_then(NotFoundException()))
+
+        body = json.loads(b"".join(await aread(response)))
+        self.assertEqual(len(body), 3)
+        self.assertEqual(body[-1]["error"]["code"], "USER_NOT_FOUND")
+
+
+class StreamedViewTests(TestCase):
+
+    def setUp(self) -> None:
+        User.objects.bulk_create(User(**row) for row in ROWS)
+        self.serializer = StreamSerializer(UserBaseSchema, stream_format=NDJSON, chunk_size=2)
+
+    def test_sync_view_streams_queryset(self) -> None:
+        view = streamed_view(lambda: User.objects.order_by("username"), self.serializer)
+
+        lines = b"".join(read(view())).splitlines()
+
+        self.assertEqual([json.loads(line)["username"] for line in lines], [row["username"] for row in ROWS])
+
+    async def test_async_view_streams_queryset(self) -> None:
+        async def view_func():
+            return User.objects.order_by("username")
+
+        view = streamed_view(view_func, self.serializer)
+
+        lines = b"".join(await aread(await view())).splitlines()
+
+        self.assertEqual([json.loads(line)["username"] for line in lines], [row["username"] for row in ROWS])
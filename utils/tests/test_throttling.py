@@ -0,0 +1,74 @@
+"""
+Tests of rate limiting.
+"""
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from ninja.conf import settings as ninja_settings
+from ninja.testing import TestClient
+from ninja_extra import NinjaExtraAPI
+
+from config.exception_handlers import register_exception_handlers
+
+from utils.base_exceptions import RateLimitedException
+from utils.throttling import RateThrottle
+
+
+class RateThrottleTests(SimpleTestCase):
+
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+
+    def test_forwarded_for_does_not_bypass_limit_without_trusted_proxies(self) -> None:
+        throttle = RateThrottle("2/min")
+
+        for index in range(2):
+            request = self.factory.get("/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=f"192.0.2.{index}")
+            self.assertTrue(throttle.allow_request(request))
+
+        request = self.factory.get("/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="192.0.2.99")
+        with self.assertRaises(RateLimitedException) as raised:
+            throttle.allow_request(request)
+
+        self.assertEqual(throttle.get_key(request), "ip:10.0.0.1")
+        self.assertEqual(raised.exception.headers, {"Retry-After": "30"})
+
+    def test_client_address_of_trusted_proxy_is_used(self) -> None:
+        throttle = RateThrottle("2/min")
+        request = self.factory.get("/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="203.0.113.5, 192.0.2.1")
+
+        with mock.patch.object(ninja_settings, "NUM_PROXIES", 1):
+            self.assertEqual(throttle.get_key(request), "ip:192.0.2.1")
+
+    def test_key_function_can_skip_limiting(self) -> None:
+        throttle = RateThrottle("1/min", key=lambda request: None)
+
+        for _ in range(3):
+            self.assertTrue(throttle.allow_request(self.factory.get("/")))
+
+
+class RateLimitedResponseTests(TestCase):
+
+    def test_rate_limited_envelope(self) -> None:
+        # ninja_extra operations turn throttle exceptions into responses, as in the users api
+        api = NinjaExtraAPI(urls_namespace="throttling_test")
+        register_exception_handlers(api)
+
+        @api.get("/limited/", throttle=RateThrottle("1/min"))
+        def limited(request):
+            return {}
+
+        client = TestClient(api)
+        self.assertEqual(client.get("/limited/", REMOTE_ADDR="198.51.100.7").status_code, 200)
+
+        response = client.get("/limited/", REMOTE_ADDR="198.51.100.7")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()["error"]["code"], "RATE_LIMITED")
+        self.assertIn("Retry-After", response.headers)
+
+    def test_create_user_is_not_limited_by_default(self) -> None:
+        for _ in range(61):
+            response = self.client.post("/api/users/", {}, content_type="application/json")
+
+        self.assertEqual(response.status_code, 422)
@@ -0,0 +1,59 @@
+"""
+Tests of validation error translation.
+"""
+from django.test import SimpleTestCase, TestCase
+
+from users.models import User
+from users.schemas import UserBaseSchema
+from utils.bulk import BulkCreator
+from utils.validation_errors import ValidationErrorTranslator
+
+
+def get_errors(count: int) -> list[dict]:
+    """Return pydantic-like validation errors of count fields."""
+    return [{"loc": ("body", "items", index), "msg": "Field required"} for index in range(count)]
+
+
+class ValidationErrorTranslatorTests(SimpleTestCase):
+
+    def test_error_details(self) -> None:
+        error = ValidationErrorTranslator().build_error(get_errors(1))
+
+        self.assertEqual(
+            error,
+            {
+                "code": "VALIDATION_ERROR",
+                "details": [{"location": "query", "field": "body", "field_full": "items.0", "message": "Field required"}],
+            },
+        )
+
+    def test_truncated_details_report_omitted_errors(self) -> None:
+        error = ValidationErrorTranslator(max_errors=2).build_error(get_errors(5))
+
+        self.assertEqual(len(error["details"]), 2)
+        self.assertEqual(error["omitted"], 3)
+
+    def test_errors_within_limit_have_no_omitted(self) -> None:
+        self.assertNotIn("omitted", ValidationErrorTranslator(max_errors=2).build_error(get_errors(2)))
+
+
+class ValidationErrorResponseTests(TestCase):
+
+    def test_validation_error_envelope(self) -> None:
+        response = self.client.post("/api/users/", {"username": 1}, content_type="application/json")
+
+        self.assertEqual(response.status_code, 422)
+        data = response.json()
+        self.assertEqual(data["status"], 422)
+        self.assertEqual(data["error"]["code"], "VALIDATION_ERROR")
+        self.assertEqual(len(data["error"]["details"]), 2)
+        self.assertNotIn("omitted", data["error"])
+
+    def test_bulk_item_reports_omitted_errors(self) -> None:
+        creator = BulkCreator(UserBaseSchema, validation_translator=ValidationErrorTranslator(max_errors=1))
+
+        result, = creator.create([{}], lambda item: User(**item.dict()))
+
+        self.assertEqual(result["status"], 422)
+        self.assertEqual(len(result["error"]["details"]), 1)
+        self.assertEqual(result["error"]["omitted"], 1)
@@ -0,0 +1,241 @@
+"""
+Rate limiting with in-process token buckets and shared cache counters.
+"""
+import threading
+import time
+import typing as t
+
+from django.core.cache import caches
+from django.http import HttpRequest
+from ninja.conf import settings as ninja_settings
+from ninja.throttling import BaseThrottle
+
+from utils.base_exceptions import RateLimitedException
+from utils.checks import require_shared_cache
+
+PERIODS = {
+    "s": 1,
+    "sec": 1,
+    "m": 60,
+    "min": 60,
+    "h": 60 * 60,
+    "hour": 60 * 60,
+    "d": 60 * 60 * 24,
+    "day": 60 * 60 * 24,
+}
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """Return number of requests and period in seconds of rate, e.g. "100/min"."""
+    try:
+        requests, period = rate.split("/")
+        return int(requests), PERIODS[period]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate {rate!r}, expected e.g. \"100/min\"")
+
+
+class Limiter(t.Protocol):
+    """Rate limiter backend."""
+
+    def consume(self, key: str, now: float) -> float:
+        """Take one request of the key, return 0 when allowed or seconds to wait."""
+        ...
+
+
+class TokenBucket:
+    """
+    In-process token buckets split into shards with their own locks.
+
+    Bucket holds up to `capacity` tokens refilled at `refill_rate` tokens per second,
+    so short bursts are allowed and the long-term rate is limited. Concurrent requests
+    of different keys rarely wait for the same lock. Limits are per worker process.
+    """
+
+    def __init__(self, capacity: int, refill_rate: float, shards: int = 16, max_keys: int = 100_000) -> None:
+        """Initialize empty buckets."""
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.max_shard_keys = max(max_keys // shards, 1)
+        self.shards: list[tuple[dict[str, tuple[float, float]], threading.Lock]] = [
+            ({}, threading.Lock()) for _ in range(shards)
+        ]
+
+    def consume(self, key: str, now: float) -> float:
+        """Take one token of the key, return 0 when allowed or seconds to the next token."""
+        buckets, lock = self.shards[hash(key) % len(self.shards)]
+
+        with lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                if len(buckets) >= self.max_shard_keys:
+                    self.prune(buckets, now)
+                tokens = self.capacity
+            else:
+                tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_rate)
+
+            if tokens >= 1:
+                buckets[key] = (tokens - 1, now)
+                return 0.0
+
+            buckets[key] = (tokens, now)
+            return (1 - tokens) / self.refill_rate
+
+    def prune(self, buckets: dict[str, tuple[float, float]], now: float) -> None:
+        """Drop full buckets, they are the same as missing ones, or the oldest key if all are in use."""
+        full = [
+            key
+            for key, (tokens, updated_at) in buckets.items()
+            if tokens + (now - updated_at) * self.refill_rate >= self.capacity
+        ]
+        for key in full or [next(iter(buckets))]:
+            del buckets[key]
+
+
+class CacheCounter:
+    """
+    Fixed window counters shared by all workers through Django cache.
+
+    Workers count requests locally and add them to the shared counter once per
+    `batch_size` requests or `sync_interval` seconds, so most requests don't touch
+    the cache. Workers can go over the limit by up to `batch_size` requests each.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        period: int,
+        prefix: str,
+        cache_alias: str = "default",
+        batch_size: int = 10,
+        sync_interval: float = 1.0,
+        max_keys: int = 100_000,
+    ) -> None:
+        """Initialize local counters."""
+        self.limit = limit
+        self.period = period
+        self.prefix = prefix
+        self.cache_alias = cache_alias
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+        # key -> [window, shared count at last sync, unsynced count, synced at]
+        self.counters: dict[str, list] = {}
+        require_shared_cache(cache_alias)
+
+    @property
+    def cache(self):
+        """Django cache backend."""
+        return caches[self.cache_alias]
+
+    def consume(self, key: str, now: float) -> float:
+        """Count request of the key, return 0 when allowed or seconds to the next window."""
+        window = int(now // self.period)
+
+        with self.lock:
+            counter = self.counters.get(key)
+            if counter is None or counter[0] != window:
+                if counter is None and len(self.counters) >= self.max_keys:
+                    self.prune(window)
+                # synced at 0 makes the first request of the window read the shared count
+                counter = self.counters[key] = [window, 0, 0, 0.0]
+
+            if counter[1] + counter[2] >= self.limit and now - counter[3] < self.sync_interval:
+                return (window + 1) * self.period - now
+
+            counter[2] += 1
+            pending = 0
+            if counter[2] >= self.batch_size or now - counter[3] >= self.sync_interval:
+                pending, counter[2], counter[3] = counter[2], 0, now
+
+        if pending:
+            total = self.sync(f"{self.prefix}:{key}:{window}", pending)
+            with self.lock:
+                if counter[0] == window:
+                    counter[1] = max(counter[1], total)
+            if total > self.limit:
+                return (window + 1) * self.period - now
+
+        return 0.0
+
+    def sync(self, cache_key: str, pending: int) -> int:
+        """Add local count to the shared counter and return the shared count."""
+        cache = self.cache
+        try:
+            return cache.incr(cache_key, pending)
+        except ValueError:
+            # counters expire with their window
+            cache.add(cache_key, 0, self.period + int(self.sync_interval) + 1)
+            return cache.incr(cache_key, pending)
+
+    def prune(self, window: int) -> None:
+        """Drop counters of past windows."""
+        for key in [key for key, counter in self.counters.items() if counter[0] != window]:
+            del self.counters[key]
+
+
+class RateThrottle(BaseThrottle):
+    """
+    Throttle that rejects requests over `rate` with `RateLimitedException`.
+
+    Requests are limited per authenticated user, or per client address for anonymous ones,
+    X-Forwarded-For is used only when `NINJA_NUM_PROXIES` setting is the number of trusted proxies.
+    `key` function can return other key or None to skip limiting. By default limits are
+    kept per worker in token buckets, `shared=True` counts requests of all workers in
+    Django cache with batched sync, the cache must be shared by workers (not locmem).
+
+    Example:
+        @route.get("/path", response_schema=MySchema, throttle=RateThrottle("100/min"))
+    """
+
+    def __init__(
+        self,
+        rate: str,
+        scope: str | None = None,
+        shared: bool = False,
+        key: t.Callable[[HttpRequest], str | None] | None = None,
+        **options: t.Any,
+    ) -> None:
+        """Initialize throttle, options are passed to the limiter backend."""
+        requests, period = parse_rate(rate)
+        self.rate = rate
+        self.key = key
+        self.limiter: Limiter
+        if shared:
+            if not scope:
+                raise ValueError("Shared throttle requires scope, it names counters in the cache")
+            self.limiter = CacheCounter(requests, period, prefix=f"api-throttle:{scope}", **options)
+        else:
+            self.limiter = TokenBucket(requests, requests / period, **options)
+
+    def __deepcopy__(self, memo: dict) -> "RateThrottle":
+        """Return self, ninja_extra deep copies route parameters and copies would not share limits."""
+        return self
+
+    def get_ident(self, request: HttpRequest) -> str | None:
+        """Return client address, X-Forwarded-For is trusted only with `NINJA_NUM_PROXIES` setting."""
+        # ninja uses the whole client controlled header without the setting
+        if ninja_settings.NUM_PROXIES is None:
+            return request.META.get("REMOTE_ADDR")
+        return super().get_ident(request)
+
+    def get_key(self, request: HttpRequest) -> str | None:
+        """Return user or client key of the request."""
+        if self.key is not None:
+            return self.key(request)
+
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"user:{user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def allow_request(self, request: HttpRequest) -> bool:
+        """Allow request or raise `RateLimitedException` with seconds to wait."""
+        key = self.get_key(request)
+        if key is None:
+            return True
+
+        wait = self.limiter.consume(key, time.time())
+        if wait:
+            raise RateLimitedException(retry_after=wait)
+        return True
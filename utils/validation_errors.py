@@ -0,0 +1,73 @@
+"""
+Validation errors translator.
+"""
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable
+
+from django.utils.translation import get_language, gettext
+
+
+class ValidationErrorTranslator:
+    """
+    Translate pydantic validation errors into API error details.
+
+    Location paths and translated messages are cached per language with LRU eviction,
+    optional `max_errors` limits the number of errors in a single response, the number
+    of errors left out is returned in `omitted` of the error.
+    """
+
+    # location of all validation errors in response
+    location: str = "query"
+
+    def __init__(self, max_errors: int | None = None, cache_size: int = 1024) -> None:
+        """Initialize translator caches."""
+        self.max_errors = max_errors
+        self._split_location = lru_cache(maxsize=cache_size)(self.split_location)
+        self._translate_message = lru_cache(maxsize=cache_size)(self.translate_message)
+
+    @staticmethod
+    def split_location(loc: tuple) -> tuple[str, str | None]:
+        """Split error location to field and full field path."""
+        field = loc[0]
+        field_full = ".".join(map(str, loc[1:])) if len(loc) > 1 else None
+        return field, field_full
+
+    @staticmethod
+    def translate_message(language: str | None, message: str) -> str:
+        """Translate error message, language is part of the cache key."""
+        return gettext(message)
+
+    def translate(self, errors: Iterable[dict]) -> list[dict]:
+        """Build error details list from validation errors."""
+        language = get_language()
+        error_list: list = []
+
+        for error in islice(errors, self.max_errors):
+            field, field_full = self._split_location(tuple(error["loc"]))
+
+            error_list.append(
+                {
+                    "location": self.location,
+                    "field": field,
+                    "field_full": field_full,
+                    "message": self._translate_message(language, error["msg"]),
+                }
+            )
+
+        return error_list
+
+    def build_error(self, errors: list[dict]) -> dict:
+        """Build error of validation error response, `omitted` is set only when details are truncated."""
+        error = {"code": "VALIDATION_ERROR", "details": self.translate(errors)}
+
+        omitted = len(errors) - len(error["details"])
+        if omitted:
+            error["omitted"] = omitted
+
+        return error
+
+    def cache_clear(self) -> None:
+        """Clear location and message caches."""
+        self._split_location.cache_clear()
+        self._translate_message.cache_clear()